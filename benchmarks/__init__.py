@@ -0,0 +1,6 @@
+"""
+TopStack SDK 性能基准
+
+在本地启动模拟的 TopStack HTTP 服务与 NATS 替身，测量 SDK 端到端的吞吐与延迟，
+结果写入 JSON 文件，便于在版本之间比较。运行方式见 benchmarks/run.py。
+"""
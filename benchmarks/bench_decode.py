@@ -0,0 +1,260 @@
+"""
+模型解码微基准与内存回归检查
+
+逐个测量热点解码路径的单个对象耗时，并用 tracemalloc 统计每个对象的内存分配：
+
+- ns_per_object: 每个对象的解码耗时（多轮取最小值）
+- allocs_per_object: 解码结果保留的内存块数 / 对象数
+- bytes_per_object: 解码结果保留的字节数 / 对象数
+- peak_bytes_per_object: 解码过程中的内存峰值 / 对象数，包括中间对象
+
+结果与 baselines/decode.json 比较，超过阈值时视为退化：
+
+    python -m benchmarks.bench_decode                         # 检查内存指标，退化时返回非零退出码
+    python -m benchmarks.bench_decode --time-threshold 0.3    # 同时检查耗时
+    python -m benchmarks.bench_decode --update                # 更新基线
+
+内存指标只与 Python 和依赖版本有关，与机器无关，默认检查；耗时受机器和负载影响，
+只在指定 --time-threshold 时检查，基线应在同一台机器上生成。基线的 Python 或 pydantic
+版本与当前不同时只输出结果，不做比较。
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pydantic
+
+from topstack_sdk import decode
+from topstack_sdk.codec import get_codec
+from topstack_sdk.iot.device.catalog import _dump_rows
+from topstack_sdk.iot.device.models import DeviceItem, QueryResponse
+from topstack_sdk.iot.models import HistoryResponse
+from topstack_sdk.nats import AlertInfo, PointData
+
+from . import payloads
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "decode.json")
+
+# 默认阈值：内存增加 10% 视为退化
+MEMORY_THRESHOLD = 0.1
+
+# 内存指标的绝对容差，避免小数值的舍入抖动
+_MEMORY_SLACK = {"allocs_per_object": 0.05, "bytes_per_object": 8.0, "peak_bytes_per_object": 16.0}
+
+# 解码场景：名称 -> (生成输入, 解码函数, 对象数)
+Case = Tuple[Callable[[], Any], Callable[[Any], Any], int]
+
+
+def _messages(build: Callable[[int], Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """经过 JSON 编解码的消息字典，与实际收到的消息一致"""
+    codec = get_codec()
+    return [codec.loads(codec.dumps(build(i))) for i in range(count)]
+
+
+def _response(data: Any) -> Any:
+    codec = get_codec()
+    return codec.loads(codec.dumps(data))
+
+
+def _history_page() -> Any:
+    return _response(payloads.history_page([{"deviceID": "dev1", "pointID": "p1"}], 5000))
+
+
+def _device_page() -> Any:
+    return _response(payloads.device_page(500, 1, 500))
+
+
+def _device_rows() -> Any:
+    """设备目录快照中按列保存的设备表"""
+    items = decode.validate(_device_page()["items"], DeviceItem)
+    return _response(_dump_rows(items, DeviceItem))
+
+
+CASES: Dict[str, Case] = {
+    "PointData.from_dict": (
+        lambda: _messages(lambda i: payloads.point_message(i % 1000, i % 10, 0), 1000),
+        lambda items: [PointData.from_dict(item) for item in items],
+        1000,
+    ),
+    "AlertInfo.from_dict": (
+        lambda: _messages(lambda i: payloads.alert_message(i % 1000, 32), 1000),
+        lambda items: [AlertInfo.from_dict(item) for item in items],
+        1000,
+    ),
+    "HistoryResponse.validate[5000]": (
+        _history_page,
+        lambda data: decode.validate(data, HistoryResponse),
+        5000,
+    ),
+    "QueryResponse.validate[500]": (
+        _device_page,
+        lambda data: decode.validate(data, QueryResponse),
+        500,
+    ),
+    "DeviceItem.construct_rows[500]": (
+        _device_rows,
+        lambda table: decode.construct_rows(DeviceItem, table["fields"], table["rows"]),
+        500,
+    ),
+}
+
+
+def measure_time(data: Any, operation: Callable[[Any], Any], objects: int, repeat: int = 5) -> float:
+    """每个对象的解码耗时（纳秒），多轮取最小值"""
+    timer = timeit.Timer(lambda: operation(data))
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat, loops)) / loops / objects * 1e9
+
+
+def measure_memory(data: Any, operation: Callable[[Any], Any], objects: int) -> Dict[str, float]:
+    """统计一次解码的内存分配，解码结果在统计期间保持存活"""
+    operation(data)
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        before = tracemalloc.take_snapshot().filter_traces(ignore)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = operation(data)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        del result
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    return {
+        "allocs_per_object": sum(stat.count_diff for stat in stats) / objects,
+        "bytes_per_object": sum(stat.size_diff for stat in stats) / objects,
+        "peak_bytes_per_object": (peak - base) / objects,
+    }
+
+
+def run(names: Optional[List[str]] = None, with_time: bool = True) -> Dict[str, Dict[str, float]]:
+    """
+    运行解码基准
+
+    Args:
+        names: 只运行指定的场景
+        with_time: 是否测量耗时，为 False 时只统计内存
+
+    Returns:
+        场景名称 -> 指标
+    """
+    results = {}
+    for name, (make, operation, objects) in CASES.items():
+        if names and name not in names:
+            continue
+        data = make()
+        metrics = measure_memory(data, operation, objects)
+        if with_time:
+            metrics["ns_per_object"] = measure_time(data, operation, objects)
+        results[name] = metrics
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """影响内存指标的版本信息"""
+    return {
+        "python": ".".join(platform.python_version_tuple()[:2]),
+        "pydantic": pydantic.VERSION,
+        "codec": type(get_codec()).__name__,
+    }
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = BASELINE_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rounded = {name: {key: round(value, 2) for key, value in metrics.items()} for name, metrics in results.items()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": rounded}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def check(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    time_threshold: Optional[float] = None,
+    memory_threshold: float = MEMORY_THRESHOLD
+) -> List[str]:
+    """
+    与基线比较
+
+    Args:
+        time_threshold: 耗时退化阈值，为空时不检查耗时
+        memory_threshold: 内存退化阈值
+
+    Returns:
+        退化描述列表，为空表示没有退化
+    """
+    failures = []
+    for name, metrics in results.items():
+        expected = baseline["results"].get(name)
+        if expected is None:
+            continue
+        for key, value in metrics.items():
+            if key not in expected:
+                continue
+            if key == "ns_per_object":
+                if time_threshold is None:
+                    continue
+                limit = expected[key] * (1 + time_threshold)
+            else:
+                limit = expected[key] * (1 + memory_threshold) + _MEMORY_SLACK[key]
+            if value > limit:
+                failures.append(f"{name} {key}: {value:.2f} > {limit:.2f}（基线 {expected[key]:.2f}）")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="模型解码微基准与内存回归检查")
+    parser.add_argument("--update", action="store_true", help="用本次结果更新基线")
+    parser.add_argument("--memory-only", action="store_true", help="只统计内存，不测量耗时")
+    parser.add_argument("--case", action="append", default=None, help="只运行指定的场景，可重复")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="基线文件")
+    parser.add_argument("--time-threshold", type=float, default=None, help="耗时退化阈值，默认不检查耗时")
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD, help="内存退化阈值")
+    args = parser.parse_args(argv)
+
+    results = run(args.case, with_time=not args.memory_only)
+    for name, metrics in results.items():
+        print(f"{name:<34} " + "  ".join(f"{key} {value:>10.2f}" for key, value in metrics.items()))
+
+    if args.update:
+        save_baseline(results, args.baseline)
+        print(f"基线已更新: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"没有基线文件: {args.baseline}")
+        return 0
+    current = environment()
+    for key in ("python", "pydantic"):
+        if baseline["environment"].get(key) != current[key]:
+            print(f"基线的 {key} 版本为 {baseline['environment'].get(key)}，当前为 {current[key]}，跳过比较")
+            return 0
+    failures = check(results, baseline, args.time_threshold, args.memory_threshold)
+    for failure in failures:
+        print(f"退化: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
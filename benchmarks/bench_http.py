@@ -0,0 +1,83 @@
+"""
+REST 接口基准
+
+通过 TopStackClient 请求本地模拟服务，测量从调用 API 方法到返回模型对象的端到端耗时，
+包括请求编码、HTTP 往返、JSON 解析和模型校验。
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from topstack_sdk import DeviceApi, IotApi, TopStackClient
+
+from .harness import measure
+from .mock_server import MockTopStackServer
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+# 设备分页遍历的每页数量
+DEVICE_PAGE_SIZE = 500
+
+
+def scaled_iterations(iterations: int, size: int, unit: int = 100) -> int:
+    """数据规模越大，重复次数越少，单个场景的运行时间大致相同"""
+    return max(5, iterations * unit // max(unit, size))
+
+
+def run(
+    sizes: Sequence[int],
+    iterations: int = 200,
+    codec: Optional[str] = None,
+    max_workers: int = 4
+) -> List[Dict[str, Any]]:
+    """
+    运行 REST 接口基准
+
+    Args:
+        sizes: 数据规模：批量实时值的测点数、历史数据的行数、设备遍历的设备总数
+        iterations: 基础重复次数，随数据规模递减
+        codec: JSON 编解码器名称
+        max_workers: 批量实时值与设备遍历的并发请求数
+
+    Returns:
+        每个场景的结果
+    """
+    results = []
+    with MockTopStackServer() as server:
+        client = TopStackClient(server.url, "bench", "bench", codec=codec)
+        iot = IotApi(client)
+        devices = DeviceApi(client)
+        common = {"codec": type(client.codec).__name__}
+
+        results.append(measure("find_last", dict(common), lambda: iot.find_last("dev1", "p1"), iterations))
+
+        for size in sizes:
+            points = [{"device_id": f"dev{i // 10}", "point_id": f"p{i % 10}"} for i in range(size)]
+            results.append(measure(
+                "find_last_batch", dict(common, points=size, max_workers=max_workers),
+                lambda: iot.find_last_batch(points, max_workers=max_workers),
+                scaled_iterations(iterations, size), items=size
+            ))
+
+        for size in sizes:
+            rows = min(size, 5000)
+            point = [{"device_id": "dev1", "point_id": "p1"}]
+            results.append(measure(
+                "query_history", dict(common, rows=rows),
+                lambda: iot.query_history(point, START, END, limit=rows),
+                scaled_iterations(iterations, rows), items=rows
+            ))
+
+        for size in sizes:
+            server.devices = size
+            results.append(measure(
+                "device_iter", dict(common, devices=size, page_size=DEVICE_PAGE_SIZE, max_workers=max_workers),
+                lambda: sum(1 for _ in devices.iter_devices(
+                    page_size=DEVICE_PAGE_SIZE, max_workers=max_workers, ordered=True
+                )),
+                scaled_iterations(iterations, size), items=size
+            ))
+
+        client.session.close()
+    return results
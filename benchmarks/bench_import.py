@@ -0,0 +1,90 @@
+"""
+导入耗时基准
+
+每次测量启动一个新的解释器进程，记录从导入 SDK 到完成场景代码的耗时，不包括解释器
+自身的启动时间。短生命周期的任务（定时脚本、函数计算）每次运行都要付出这部分开销：
+
+- import: 只导入包
+- import_rest: 导入 REST 客户端与 IotApi
+- first_find_last: 导入、创建客户端并完成一次 find_last（包括获取令牌），请求本地模拟服务
+- import_nats: 导入 NATS 消息总线
+
+结果同时记录进程中已加载的模块数，以及是否加载了 nats 客户端。
+"""
+
+import json
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Sequence
+
+from .harness import summarize
+from .mock_server import MockTopStackServer
+
+# 场景名称 -> 计时的代码，{url} 替换为模拟服务地址
+SCENARIOS: Dict[str, str] = {
+    "import": "import topstack_sdk",
+    "import_rest": "from topstack_sdk import IotApi, TopStackClient",
+    "first_find_last": (
+        "from topstack_sdk import IotApi, TopStackClient\n"
+        "IotApi(TopStackClient({url!r}, 'bench', 'bench')).find_last('dev1', 'p1')"
+    ),
+    "import_nats": "from topstack_sdk import NatsBus",
+}
+
+_TEMPLATE = """\
+import sys, time
+_started = time.perf_counter()
+{code}
+_elapsed = time.perf_counter() - _started
+import json
+print(json.dumps({{"seconds": _elapsed, "modules": len(sys.modules), "nats": "nats" in sys.modules}}))
+"""
+
+
+def _environ() -> Dict[str, str]:
+    """子进程的环境变量，保证导入的是当前进程使用的 topstack_sdk"""
+    env = dict(os.environ)
+    spec = find_spec("topstack_sdk")
+    root = os.path.dirname(os.path.dirname(spec.origin))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    return env
+
+
+def measure_once(code: str, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """在新的解释器进程中执行一次场景代码"""
+    output = subprocess.run(
+        [sys.executable, "-c", _TEMPLATE.format(code=code)],
+        env=env or _environ(), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(runs: int = 10, only: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    运行导入耗时基准
+
+    Args:
+        runs: 每个场景启动的进程数
+        only: 只运行指定名称的场景
+
+    Returns:
+        每个场景的结果，附带已加载的模块数和是否加载了 nats 客户端
+    """
+    env = _environ()
+    results = []
+    with MockTopStackServer() as server:
+        for name, code in SCENARIOS.items():
+            if only and name not in only:
+                continue
+            if name == "import_nats" and find_spec("nats") is None:
+                continue
+            samples = [measure_once(code.format(url=server.url), env) for _ in range(runs)]
+            latencies = [sample["seconds"] for sample in samples]
+            result = summarize(name, {"runs": runs}, latencies, sum(latencies))
+            result["min_ms"] = min(latencies) * 1e3
+            result["modules"] = samples[-1]["modules"]
+            result["nats_loaded"] = samples[-1]["nats"]
+            results.append(result)
+    return results
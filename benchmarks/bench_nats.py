@@ -0,0 +1,165 @@
+"""
+NATS 订阅基准
+
+对 NatsBus 的每种订阅方法发布一组消息，测量从发布到回调收到消息的延迟和每秒处理的消息数。
+默认使用进程内 NATS 替身；指定 nats_url 时连接真实的 nats-server，延迟包含网络往返。
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from topstack_sdk.nats import NatsBus, NatsConfig, create_nats_bus
+
+from . import payloads
+from .fake_nats import InProcessNats
+from .harness import summarize
+
+PROJECT = payloads.PROJECT_ID
+POINT_SUBJECT = "iot.platform.device.datas.{project}.type1.dev{device}.p{point}"
+
+# 订阅场景：(名称, 订阅函数, 第 i 条消息的 (主题, 消息体))
+Subscribe = Callable[[NatsBus, Callable[[Any], None]], Awaitable[Any]]
+Scenario = Tuple[str, Subscribe, Callable[[int, int], Tuple[str, Dict[str, Any]]]]
+
+
+def _point(device: Callable[[int], int], point: Callable[[int], int]):
+    def build(i: int, value_bytes: int) -> Tuple[str, Dict[str, Any]]:
+        d, p = device(i), point(i)
+        return POINT_SUBJECT.format(project=PROJECT, device=d, point=p), payloads.point_message(d, p, value_bytes)
+    return build
+
+
+def _batch(columnar: bool) -> Subscribe:
+    async def subscribe(bus: NatsBus, callback: Callable[[Any], None]) -> Any:
+        def on_batch(batch: Any) -> None:
+            for _ in range(len(batch)):
+                callback(None)
+        return await bus.subscribe_point_data_batch(PROJECT, on_batch, max_batch=500, max_delay=0.01,
+                                                    max_buffer=100000, columnar=columnar)
+    return subscribe
+
+
+SCENARIOS: List[Scenario] = [
+    ("subscribe_point_data",
+     lambda bus, cb: bus.subscribe_point_data(PROJECT, "dev1", "p1", cb),
+     _point(lambda i: 1, lambda i: 1)),
+    ("subscribe_device_type_data",
+     lambda bus, cb: bus.subscribe_device_type_data(PROJECT, "type1", "p1", cb),
+     _point(lambda i: i % 1000, lambda i: 1)),
+    ("subscribe_project_point_data",
+     lambda bus, cb: bus.subscribe_project_point_data(PROJECT, cb),
+     _point(lambda i: i % 1000, lambda i: i % 10)),
+    ("subscribe_point_data_batch", _batch(False), _point(lambda i: i % 1000, lambda i: i % 10)),
+    ("subscribe_point_data_batch_columnar", _batch(True), _point(lambda i: i % 1000, lambda i: i % 10)),
+    ("subscribe_device_state",
+     lambda bus, cb: bus.subscribe_device_state(PROJECT, "*", cb),
+     lambda i, n: (f"iot.platform.device.state.{PROJECT}.dev{i % 1000}", payloads.device_state_message(i % 1000, n))),
+    ("subscribe_gateway_state",
+     lambda bus, cb: bus.subscribe_gateway_state(PROJECT, cb),
+     lambda i, n: (f"iot.platform.gateway.state.{PROJECT}.gw{i % 20}", payloads.gateway_state_message(i % 20, n))),
+    ("subscribe_channel_state",
+     lambda bus, cb: bus.subscribe_channel_state(PROJECT, cb),
+     lambda i, n: (f"iot.platform.channel.state.{PROJECT}.ch{i % 40}", payloads.channel_state_message(i % 40, n))),
+    ("subscribe_alert_info",
+     lambda bus, cb: bus.subscribe_alert_info(PROJECT, cb),
+     lambda i, n: (f"iot.platform.alert.{PROJECT}.dev{i % 1000}", payloads.alert_message(i % 1000, n))),
+    ("subscribe_device_alert_info",
+     lambda bus, cb: bus.subscribe_device_alert_info(PROJECT, "dev1", cb),
+     lambda i, n: (f"iot.platform.alert.{PROJECT}.dev1", payloads.alert_message(1, n))),
+]
+
+
+async def _run_scenario(bus: NatsBus, scenario: Scenario, messages: int, value_bytes: int,
+                        timeout: float) -> Dict[str, Any]:
+    name, subscribe, build = scenario
+    encoded = []
+    for i in range(messages):
+        subject, body = build(i, value_bytes)
+        encoded.append((subject, json.dumps(body, ensure_ascii=False).encode()))
+    size = sum(len(data) for _, data in encoded) // max(1, messages)
+
+    clock = time.perf_counter
+    sent: List[float] = []
+    received: List[float] = []
+    done = asyncio.Event()
+
+    def callback(message: Any) -> None:
+        received.append(clock())
+        if len(received) >= messages:
+            done.set()
+
+    handle = await subscribe(bus, callback)
+    bus.stats()
+    publish = bus.conn.publish
+    for subject, data in encoded:
+        sent.append(clock())
+        await publish(subject, data)
+        # 让出事件循环，与网络收发一样交替执行发布和投递
+        await asyncio.sleep(0)
+    await bus.conn.flush()
+    try:
+        await asyncio.wait_for(done.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    stats = next((item for item in bus.stats()["subscriptions"] if item["messages"]), {})
+    await handle.unsubscribe()
+
+    count = min(len(sent), len(received))
+    latencies = [received[i] - sent[i] for i in range(count)]
+    elapsed = received[count - 1] - sent[0] if count else 0.0
+    result = summarize(name, {"messages": messages, "value_bytes": value_bytes, "message_bytes": size},
+                       latencies, elapsed)
+    result.update({
+        "received": len(received),
+        "parse_us": stats.get("parse_us"),
+        "callback_us": stats.get("callback_us"),
+        "dropped": stats.get("dropped", 0),
+    })
+    return result
+
+
+async def run_async(
+    value_sizes: Sequence[int],
+    messages: int = 20000,
+    nats_url: Optional[str] = None,
+    codec: Optional[str] = None,
+    timeout: float = 30.0,
+    only: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    运行 NATS 订阅基准
+
+    Args:
+        value_sizes: 消息中值字段的字节数，0 表示数值
+        messages: 每个场景发布的消息数
+        nats_url: nats-server 地址，为空时使用进程内替身
+        codec: JSON 编解码器名称
+        timeout: 等待消息全部到达的最长时间（秒）
+        only: 只运行指定名称的场景
+
+    Returns:
+        每个场景的结果
+    """
+    if nats_url:
+        bus = await create_nats_bus(NatsConfig(nats_url), codec=codec)
+    else:
+        bus = NatsBus(InProcessNats(), codec=codec)
+    results = []
+    try:
+        for scenario in SCENARIOS:
+            if only and scenario[0] not in only:
+                continue
+            for value_bytes in value_sizes:
+                results.append(await _run_scenario(bus, scenario, messages, value_bytes, timeout))
+    finally:
+        await bus.close()
+    return results
+
+
+def run(value_sizes: Sequence[int], messages: int = 20000, nats_url: Optional[str] = None,
+        codec: Optional[str] = None, timeout: float = 30.0,
+        only: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """同步入口，参数见 run_async"""
+    return asyncio.run(run_async(value_sizes, messages, nats_url, codec, timeout, only))
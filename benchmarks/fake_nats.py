@@ -0,0 +1,110 @@
+"""
+进程内 NATS 替身
+
+模拟 nats-py 客户端的订阅模型：每个订阅有一个有界的待处理队列，由单独的任务按顺序调用
+回调，队列满时丢弃消息（slow consumer）。只实现 NatsBus 用到的 subscribe、publish、
+flush 和 close，不经过网络，测量结果只包含 SDK 的解析与分发开销。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from topstack_sdk.dispatch import SubjectTrie
+
+# 与 nats-py 的默认值一致
+DEFAULT_PENDING_MSGS_LIMIT = 512 * 1024
+DEFAULT_PENDING_BYTES_LIMIT = 128 * 1024 * 1024
+
+
+class Msg:
+    __slots__ = ("subject", "data", "reply")
+
+    def __init__(self, subject: str, data: bytes):
+        self.subject = subject
+        self.data = data
+        self.reply = ""
+
+
+class Subscription:
+    """待处理队列与投递任务，属性名与 nats-py 的 Subscription 一致"""
+
+    def __init__(self, conn: "InProcessNats", subject: str, cb: Callable[[Msg], Awaitable[None]],
+                 pending_msgs_limit: int, pending_bytes_limit: int):
+        self._conn = conn
+        self.subject = subject
+        self._cb = cb
+        self._pending_msgs_limit = pending_msgs_limit
+        self._pending_bytes_limit = pending_bytes_limit
+        self._pending_queue: "asyncio.Queue[Msg]" = asyncio.Queue(maxsize=pending_msgs_limit)
+        self._pending_size = 0
+        self.dropped = 0
+        self._task = asyncio.ensure_future(self._run())
+
+    @property
+    def pending_msgs(self) -> int:
+        return self._pending_queue.qsize()
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._pending_size
+
+    def _deliver(self, msg: Msg) -> None:
+        if self._pending_size + len(msg.data) > self._pending_bytes_limit or self._pending_queue.full():
+            self.dropped += 1
+            return
+        self._pending_size += len(msg.data)
+        self._pending_queue.put_nowait(msg)
+
+    async def _run(self) -> None:
+        queue = self._pending_queue
+        while True:
+            msg = await queue.get()
+            self._pending_size -= len(msg.data)
+            try:
+                await self._cb(msg)
+            finally:
+                queue.task_done()
+
+    async def drain(self) -> None:
+        """等待待处理队列中的消息全部处理完"""
+        await self._pending_queue.join()
+
+    async def unsubscribe(self) -> None:
+        self._conn._remove(self)
+        self._task.cancel()
+
+
+class InProcessNats:
+    """进程内 NATS 连接"""
+
+    def __init__(self, pending_msgs_limit: int = DEFAULT_PENDING_MSGS_LIMIT,
+                 pending_bytes_limit: int = DEFAULT_PENDING_BYTES_LIMIT):
+        self.pending_msgs_limit = pending_msgs_limit
+        self.pending_bytes_limit = pending_bytes_limit
+        self._trie = SubjectTrie()
+        self._subscriptions: List[Subscription] = []
+
+    async def subscribe(self, subject: str, cb: Optional[Callable[[Msg], Awaitable[None]]] = None,
+                        **kwargs: Any) -> Subscription:
+        subscription = Subscription(self, subject, cb, self.pending_msgs_limit, self.pending_bytes_limit)
+        self._trie.insert(subject.split('.'), subscription)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def _remove(self, subscription: Subscription) -> None:
+        self._trie.remove(subscription.subject.split('.'), subscription)
+        self._subscriptions.remove(subscription)
+
+    async def publish(self, subject: str, payload: bytes = b"") -> None:
+        msg = Msg(subject, payload)
+        for subscription in self._trie.match(subject.split('.')):
+            subscription._deliver(msg)
+
+    async def flush(self) -> None:
+        """等待全部订阅处理完已发布的消息"""
+        for subscription in list(self._subscriptions):
+            await subscription.drain()
+
+    async def close(self) -> None:
+        for subscription in list(self._subscriptions):
+            await subscription.unsubscribe()
@@ -0,0 +1,136 @@
+"""
+计时与结果文件
+
+每个基准场景的结果是一个字典：名称、参数、次数、吞吐和延迟分位数（毫秒）。
+结果文件附带运行环境信息，compare 按名称和参数对齐两次运行的结果。
+"""
+
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import topstack_sdk
+from topstack_sdk.codec import get_codec
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """已排序序列的分位数（线性插值）"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def summarize(
+    name: str,
+    params: Dict[str, Any],
+    latencies: List[float],
+    elapsed: float,
+    items: int = 1
+) -> Dict[str, Any]:
+    """
+    汇总一个场景的测量结果
+
+    Args:
+        name: 场景名称
+        params: 场景参数，例如数据规模
+        latencies: 每次操作的耗时（秒）
+        elapsed: 全部操作的总耗时（秒）
+        items: 每次操作处理的记录数，用于计算每秒记录数
+    """
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "name": name,
+        "params": params,
+        "iterations": count,
+        "ops_per_sec": count / elapsed if elapsed > 0 else 0.0,
+        "items_per_sec": count * items / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(latencies) / count * 1e3 if count else 0.0,
+        "p50_ms": percentile(latencies, 0.5) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "max_ms": latencies[-1] * 1e3 if count else 0.0,
+    }
+
+
+def measure(
+    name: str,
+    params: Dict[str, Any],
+    operation: Callable[[], Any],
+    iterations: int,
+    warmup: int = 3,
+    items: int = 1
+) -> Dict[str, Any]:
+    """重复执行同步操作并汇总耗时"""
+    for _ in range(warmup):
+        operation()
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(iterations):
+        begin = clock()
+        operation()
+        latencies.append(clock() - begin)
+    return summarize(name, params, latencies, clock() - started, items)
+
+
+def environment() -> Dict[str, Any]:
+    """运行环境信息"""
+    return {
+        "sdk_version": getattr(topstack_sdk, "__version__", None),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "codec": type(get_codec()).__name__,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_results(path: str, results: List[Dict[str, Any]], options: Dict[str, Any]) -> None:
+    """写入结果文件"""
+    document = {"environment": environment(), "options": options, "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+def _key(result: Dict[str, Any]) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline_path: str, results: List[Dict[str, Any]], threshold: float = 0.1,
+            output: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """
+    与基线结果比较
+
+    Args:
+        baseline_path: 基线结果文件
+        results: 本次运行的结果
+        threshold: 吞吐下降或 p99 上升超过该比例视为退化
+        output: 输出比较表格的文件对象，默认为标准输出
+
+    Returns:
+        退化的场景列表
+    """
+    output = output or sys.stdout
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_key(item): item for item in json.load(f)["results"]}
+
+    regressions = []
+    output.write(f"{'场景':<48} {'吞吐变化':>10} {'p99 变化':>10}\n")
+    for result in results:
+        old = baseline.get(_key(result))
+        if old is None:
+            continue
+        throughput = result["items_per_sec"] / old["items_per_sec"] - 1 if old["items_per_sec"] else 0.0
+        p99 = result["p99_ms"] / old["p99_ms"] - 1 if old["p99_ms"] else 0.0
+        regressed = throughput < -threshold or p99 > threshold
+        label = f"{result['name']} {json.dumps(result['params'], sort_keys=True)}"
+        output.write(f"{label:<48} {throughput:>+10.1%} {p99:>+10.1%}{'  <- 退化' if regressed else ''}\n")
+        if regressed:
+            regressions.append(result)
+    return regressions
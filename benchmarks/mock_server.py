@@ -0,0 +1,147 @@
+"""
+模拟 TopStack HTTP 服务
+
+只实现基准测试用到的认证、实时值、历史数据和设备查询接口。响应体按请求规模缓存编码结果，
+使服务端开销在各次运行之间保持稳定，测量结果主要反映 SDK 自身的开销。
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from . import payloads
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive，与真实部署一样复用连接
+    protocol_version = "HTTP/1.1"
+    # 头部与响应体分两次写入，关闭 Nagle 算法避免等待延迟确认
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length))
+
+    def _reply(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        route = self.server.routes.get(url.path)
+        if route is None:
+            self._reply(404, b'{"code": "NotFound", "msg": "not found"}')
+            return
+        body = self._body()
+        if body is None and url.query:
+            body = dict(parse_qsl(url.query))
+        self.server.requests += 1
+        self._reply(200, route(body))
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    routes: Dict[str, Callable[[Any], bytes]]
+    requests: int
+
+
+class MockTopStackServer:
+    """
+    模拟 TopStack HTTP 服务
+
+    在 127.0.0.1 的随机端口上运行，可作为上下文管理器使用::
+
+        with MockTopStackServer(devices=10000) as server:
+            client = TopStackClient(server.url, "app", "secret")
+    """
+
+    def __init__(self, devices: int = 1000):
+        """
+        Args:
+            devices: device/query 返回的设备总数
+        """
+        self.devices = devices
+        self._cache: Dict[Tuple[Any, ...], bytes] = {}
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        """已处理的请求数"""
+        return self._server.requests
+
+    def start(self) -> "MockTopStackServer":
+        server = _Server(("127.0.0.1", 0), _Handler)
+        server.requests = 0
+        server.routes = {
+            "/open_api/v1/auth/access_token": self._auth,
+            "/iot/open_api/v1/data/findLast": self._find_last,
+            "/iot/open_api/v1/data/findLastBatch": self._find_last_batch,
+            "/iot/open_api/v1/data/query": self._history,
+            "/iot/open_api/v1/device/query": self._device_query,
+        }
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="mock-topstack", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> "MockTopStackServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _cached(self, key: Tuple[Any, ...], build: Callable[[], Any]) -> bytes:
+        body = self._cache.get(key)
+        if body is None:
+            body = self._cache[key] = json.dumps({"data": build()}, ensure_ascii=False).encode()
+        return body
+
+    def _auth(self, body: Any) -> bytes:
+        return b'{"access_token": "bench-token", "expire": 86400}'
+
+    def _find_last(self, body: Any) -> bytes:
+        return self._cached(("findLast",), lambda: payloads.point_value(1, 1))
+
+    def _find_last_batch(self, body: Any) -> bytes:
+        count = len(body or ())
+        return self._cached(("findLastBatch", count), lambda: payloads.point_values(count))
+
+    def _history(self, body: Any) -> bytes:
+        points = [{"deviceID": p["deviceID"], "pointID": p["pointID"]} for p in body["points"]]
+        rows = int(body.get("limit", 5000))
+        key = ("query", tuple((p["deviceID"], p["pointID"]) for p in points), rows)
+        return self._cached(key, lambda: payloads.history_page(points, rows))
+
+    def _device_query(self, body: Any) -> bytes:
+        body = body or {}
+        page_num = int(body.get("pageNum", 1))
+        page_size = int(body.get("pageSize", 10))
+        key = ("device", self.devices, page_num, page_size)
+        return self._cached(key, lambda: payloads.device_page(self.devices, page_num, page_size))
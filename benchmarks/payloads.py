@@ -0,0 +1,125 @@
+"""
+基准测试使用的模拟数据
+
+字段与平台接口一致，内容按序号确定性生成，多次运行的数据完全相同。
+"""
+
+from typing import Any, Dict, List
+
+TIMESTAMP = "2024-01-01T00:00:00Z"
+TIMESTAMP_MS = 1704067200000
+PROJECT_ID = "bench"
+
+
+def point_value(device: int, point: int) -> Dict[str, Any]:
+    """findLast 返回的单个测点实时值"""
+    return {
+        "deviceID": f"dev{device}",
+        "pointID": f"p{point}",
+        "value": device * 0.5 + point,
+        "quality": 0,
+        "timestamp": TIMESTAMP,
+    }
+
+
+def point_values(count: int) -> List[Dict[str, Any]]:
+    """findLastBatch 返回的测点实时值"""
+    return [point_value(i // 10, i % 10) for i in range(count)]
+
+
+def history_page(points: List[Dict[str, Any]], rows: int) -> Dict[str, Any]:
+    """data/query 返回的历史数据，每个测点 rows 行"""
+    values = [
+        {"time": f"2024-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z", "last": i * 0.1}
+        for i in range(rows)
+    ]
+    return {"results": [
+        {"deviceID": point["deviceID"], "pointID": point["pointID"], "values": values}
+        for point in points
+    ]}
+
+
+def device(index: int) -> Dict[str, Any]:
+    """device/query 返回的单个设备"""
+    return {
+        "id": f"dev{index}",
+        "code": f"D{index:06d}",
+        "name": f"设备{index}",
+        "gatewayID": f"gw{index % 20}",
+        "gatewayName": f"网关{index % 20}",
+        "typeID": f"type{index % 8}",
+        "typeName": f"模型{index % 8}",
+        "groupID": f"group{index % 50}",
+        "connectMode": "gateway",
+        "dataChannelID": f"ch{index % 40}",
+        "state": index % 2,
+        "stateChangeTime": TIMESTAMP,
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+        "hasProps": False,
+        "manualGI": False,
+    }
+
+
+def device_page(total: int, page_num: int, page_size: int) -> Dict[str, Any]:
+    """device/query 返回的一页设备"""
+    start = (page_num - 1) * page_size
+    return {"total": total, "items": [device(i) for i in range(start, min(total, start + page_size))]}
+
+
+def point_message(device: int, point: int, value_bytes: int) -> Dict[str, Any]:
+    """实时测点消息，value_bytes 大于 0 时值为该长度的字符串"""
+    return {
+        "deviceID": f"dev{device}",
+        "pointID": f"p{point}",
+        "deviceTypeID": "type1",
+        "projectID": PROJECT_ID,
+        "gatewayID": "gw1",
+        "value": "x" * value_bytes if value_bytes else device * 0.5 + point,
+        "quality": 0,
+        "status": 0,
+        "timestamp": TIMESTAMP_MS,
+    }
+
+
+def device_state_message(device: int, value_bytes: int) -> Dict[str, Any]:
+    return {"projectID": PROJECT_ID, "gatewayID": "gw1", "deviceID": f"dev{device}", "state": 1,
+            "timestamp": TIMESTAMP_MS, "remark": "x" * value_bytes}
+
+
+def gateway_state_message(gateway: int, value_bytes: int) -> Dict[str, Any]:
+    return {"sn": f"SN{gateway}", "name": f"网关{gateway}", "projectID": PROJECT_ID,
+            "gatewayID": f"gw{gateway}", "state": 1, "timestamp": TIMESTAMP_MS, "remark": "x" * value_bytes}
+
+
+def channel_state_message(channel: int, value_bytes: int) -> Dict[str, Any]:
+    return {"projectID": PROJECT_ID, "gatewayID": "gw1", "channelID": f"ch{channel}", "running": True,
+            "connected": True, "timestamp": TIMESTAMP_MS, "gatewayName": "网关1",
+            "channelName": f"通道{channel}", "remark": "x" * value_bytes}
+
+
+def alert_message(device: int, value_bytes: int) -> Dict[str, Any]:
+    return {
+        "id": f"alert{device}",
+        "status": "active",
+        "createdAt": TIMESTAMP_MS,
+        "title": "温度过高",
+        "content": "x" * value_bytes,
+        "ruleTemplateID": "rule1",
+        "triggerID": "trigger1",
+        "mode": "compare",
+        "compareMode": ">",
+        "compareValue": 80,
+        "inputValue": 85.5,
+        "pointID": "temp",
+        "projectID": PROJECT_ID,
+        "deviceID": f"dev{device}",
+        "alertTypeID": "type1",
+        "alertLevelID": "level1",
+        "ruleName": "温度告警",
+        "alertTypeName": "温度",
+        "alertTypeCode": "TEMP",
+        "alertLevelCode": "HIGH",
+        "deviceName": f"设备{device}",
+        "deviceTypeID": "type1",
+    }
@@ -0,0 +1,67 @@
+"""
+运行性能基准并写入 JSON 结果
+
+    python -m benchmarks.run                                 # 全部场景，结果写入 benchmark-results.json
+    python -m benchmarks.run --suite http --sizes 100,1000
+    python -m benchmarks.run --suite nats --nats-url nats://127.0.0.1:4222
+    python -m benchmarks.run --suite import --import-runs 20   # 导入与首次请求耗时
+    python -m benchmarks.run --compare baseline.json        # 与基线比较，出现退化时返回非零退出码
+
+需要在仓库根目录下运行，并能导入 topstack_sdk（已安装或设置 PYTHONPATH=src）。
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from . import bench_http, bench_import, bench_nats
+from .harness import compare, write_results
+
+
+def _ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TopStack SDK 性能基准")
+    parser.add_argument("--suite", choices=("all", "http", "nats", "import"), default="all", help="运行的基准")
+    parser.add_argument("--sizes", type=_ints, default=[10, 100, 1000, 5000],
+                        help="REST 场景的数据规模（测点数、历史行数、设备数），逗号分隔")
+    parser.add_argument("--iterations", type=int, default=200, help="REST 场景的基础重复次数")
+    parser.add_argument("--workers", type=int, default=4, help="批量实时值与设备遍历的并发请求数")
+    parser.add_argument("--value-bytes", type=_ints, default=[0, 256, 4096],
+                        help="NATS 消息中值字段的字节数，0 表示数值，逗号分隔")
+    parser.add_argument("--messages", type=int, default=20000, help="每个 NATS 场景发布的消息数")
+    parser.add_argument("--nats-url", default=None, help="nats-server 地址，默认使用进程内替身")
+    parser.add_argument("--only", type=lambda v: v.split(","), default=None, help="只运行指定名称的 NATS 场景")
+    parser.add_argument("--import-runs", type=int, default=10, help="导入耗时基准每个场景启动的进程数")
+    parser.add_argument("--codec", default=None, help="JSON 编解码器：auto,orjson,msgspec,json")
+    parser.add_argument("--output", default="benchmark-results.json", help="结果文件")
+    parser.add_argument("--compare", default=None, help="基线结果文件")
+    parser.add_argument("--threshold", type=float, default=0.1, help="吞吐下降或 p99 上升超过该比例视为退化")
+    args = parser.parse_args(argv)
+
+    results = []
+    if args.suite in ("all", "http"):
+        results += bench_http.run(args.sizes, args.iterations, args.codec, args.workers)
+    if args.suite in ("all", "nats"):
+        results += bench_nats.run(args.value_bytes, args.messages, args.nats_url, args.codec, only=args.only)
+    if args.suite in ("all", "import"):
+        results += bench_import.run(args.import_runs)
+
+    for result in results:
+        print(f"{result['name']:<36} {str(result['params']):<72} "
+              f"{result['items_per_sec']:>12.0f}/s  p50 {result['p50_ms']:>8.3f} ms  p99 {result['p99_ms']:>8.3f} ms")
+
+    options = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    write_results(args.output, results, options)
+    print(f"结果已写入 {args.output}")
+
+    if args.compare:
+        if compare(args.compare, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,8 +17,9 @@ setup(
     include_package_data=True,
     install_requires=[
         "requests>=2.25.0",
-        "pydantic>=1.8.0",
-        "python-dateutil>=2.8.0"
+        "pydantic>=2.0",
+        "python-dateutil>=2.8.0",
+        "typing_extensions>=4.0; python_version < '3.9'"
     ],
     python_requires=">=3.7",
     license="MIT",
@@ -2,40 +2,127 @@
 TopStack Python SDK
 
 一个用于与 TopStack 平台进行交互的 Python 客户端库。
+
+包中的名称在首次访问时才导入对应的模块（PEP 562）：`import topstack_sdk` 本身
+不导入 requests、pydantic 和 nats，只使用 REST 接口的程序也不会导入 NATS 客户端。
 """
 
-from .client import TopStackClient
-from .iot import IotApi, DeviceApi
-from .alert import AlertApi
-from .asset import AssetApi
-from .ems import EmsApi
-from .datav import DatavApi
-from .nats import (
-    NatsConfig, 
-    create_nats_bus, 
-    NatsBus, 
-    PointData, 
-    DeviceState, 
-    GatewayState, 
-    ChannelState, 
-    AlertInfo
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .client import TopStackClient, AsyncTopStackClient
+    from .retry import RetryPolicy, RetryBudget, CircuitBreaker
+    from .limits import RateLimiter, AdaptiveLimiter
+    from .metrics import Instrumentation, MetricsRegistry, RequestSample
+    from .iot import IotApi, DeviceApi, AsyncIotApi, AsyncDeviceApi
+    from .alert import AlertApi, AsyncAlertApi
+    from .asset import AssetApi, AsyncAssetApi
+    from .ems import EmsApi, AsyncEmsApi
+    from .datav import DatavApi
+    from .nats import (
+        NatsConfig,
+        create_nats_bus,
+        NatsBus,
+        PointData,
+        PointDataArray,
+        DeviceState,
+        GatewayState,
+        ChannelState,
+        AlertInfo
+    )
+    from .live_cache import LiveValueCache, AsyncLiveValueCache
+
+# 名称 -> 定义它的模块
+_LAZY = {
+    "TopStackClient": ".client",
+    "AsyncTopStackClient": ".client",
+    "RetryPolicy": ".retry",
+    "RetryBudget": ".retry",
+    "CircuitBreaker": ".retry",
+    "RateLimiter": ".limits",
+    "AdaptiveLimiter": ".limits",
+    "Instrumentation": ".metrics",
+    "MetricsRegistry": ".metrics",
+    "RequestSample": ".metrics",
+    "IotApi": ".iot.iot",
+    "AsyncIotApi": ".iot.iot",
+    "DeviceApi": ".iot.device.device",
+    "AsyncDeviceApi": ".iot.device.device",
+    "AlertApi": ".alert",
+    "AsyncAlertApi": ".alert",
+    "AssetApi": ".asset",
+    "AsyncAssetApi": ".asset",
+    "EmsApi": ".ems",
+    "AsyncEmsApi": ".ems",
+    "DatavApi": ".datav",
+    "NatsConfig": ".nats",
+    "create_nats_bus": ".nats",
+    "NatsBus": ".nats",
+    "PointData": ".nats",
+    "PointDataArray": ".nats",
+    "DeviceState": ".nats",
+    "GatewayState": ".nats",
+    "ChannelState": ".nats",
+    "AlertInfo": ".nats",
+    "LiveValueCache": ".live_cache",
+    "AsyncLiveValueCache": ".live_cache",
+}
+
+# 之前由包导入时顺带加载、可以直接作为属性访问的子模块
+_SUBMODULES = (
+    "alert", "asset", "auth", "batch", "client", "codec", "datav", "decode", "dispatch", "ems",
+    "iot", "limits", "live_cache", "metrics", "nats", "retry", "timestamps",
 )
 
 __version__ = "1.0.0"
 __all__ = [
     "TopStackClient",
+    "AsyncTopStackClient",
+    "RetryPolicy",
+    "RetryBudget",
+    "CircuitBreaker",
+    "RateLimiter",
+    "AdaptiveLimiter",
+    "Instrumentation",
+    "MetricsRegistry",
+    "RequestSample",
     "IotApi",
-    "DeviceApi", 
+    "DeviceApi",
     "AlertApi",
     "AssetApi",
     "EmsApi",
+    "AsyncIotApi",
+    "AsyncDeviceApi",
+    "AsyncAlertApi",
+    "AsyncAssetApi",
+    "AsyncEmsApi",
     "DatavApi",
     "NatsConfig",
     "create_nats_bus",
     "NatsBus",
     "PointData",
+    "PointDataArray",
     "DeviceState",
     "GatewayState",
     "ChannelState",
-    "AlertInfo"
-] 
\ No newline at end of file
+    "AlertInfo",
+    "LiveValueCache",
+    "AsyncLiveValueCache"
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    # 缓存到模块字典，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -2,6 +2,6 @@
 TopStack 告警模块
 """
 
-from .alert import AlertApi
+from .alert import AlertApi, AsyncAlertApi
 
-__all__ = ["AlertApi"] 
\ No newline at end of file
+__all__ = ["AlertApi", "AsyncAlertApi"] 
\ No newline at end of file
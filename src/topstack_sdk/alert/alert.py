@@ -3,7 +3,7 @@
 """
 
 from typing import List, Optional
-from ..client import TopStackClient, Response
+from ..client import TopStackClient, AsyncTopStackClient, Response
 
 class AlertApi:
     """告警 API 客户端"""
@@ -27,4 +27,29 @@ class AlertApi:
     
     def query_alert_records(self, **params):
         """查询告警记录"""
-        return self.client.get("/alert/open_api/v1/alert_record", params) 
\ No newline at end of file
+        return self.client.get("/alert/open_api/v1/alert_record", params)
+
+
+class AsyncAlertApi:
+    """告警 API 异步客户端"""
+
+    def __init__(self, client: AsyncTopStackClient):
+        """
+        初始化告警 API
+
+        Args:
+            client: TopStack 异步客户端实例
+        """
+        self.client = client
+
+    async def query_alert_levels(self):
+        """查询告警级别"""
+        return await self.client.get("/alert/open_api/v1/alert_level")
+
+    async def query_alert_types(self):
+        """查询告警类型"""
+        return await self.client.get("/alert/open_api/v1/alert_type")
+
+    async def query_alert_records(self, **params):
+        """查询告警记录"""
+        return await self.client.get("/alert/open_api/v1/alert_record", params)
\ No newline at end of file
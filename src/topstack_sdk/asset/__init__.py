@@ -2,6 +2,6 @@
 TopStack 资产管理模块
 """
 
-from .asset import AssetApi
+from .asset import AssetApi, AsyncAssetApi
 
-__all__ = ["AssetApi"] 
\ No newline at end of file
+__all__ = ["AssetApi", "AsyncAssetApi"] 
\ No newline at end of file
@@ -3,7 +3,7 @@
 """
 
 from typing import List, Optional
-from ..client import TopStackClient, Response
+from ..client import TopStackClient, AsyncTopStackClient, Response
 
 class AssetApi:
     """资产管理 API 客户端"""
@@ -23,4 +23,25 @@ class AssetApi:
     
     def get_work_order_detail(self, work_order_id: str):
         """获取工单详情"""
-        return self.client.get(f"/asset/open_api/v1/alert_work_order/{work_order_id}") 
\ No newline at end of file
+        return self.client.get(f"/asset/open_api/v1/alert_work_order/{work_order_id}")
+
+
+class AsyncAssetApi:
+    """资产管理 API 异步客户端"""
+
+    def __init__(self, client: AsyncTopStackClient):
+        """
+        初始化资产管理 API
+
+        Args:
+            client: TopStack 异步客户端实例
+        """
+        self.client = client
+
+    async def query_work_orders(self, **params):
+        """查询工单"""
+        return await self.client.get("/asset/open_api/v1/alert_work_order", params)
+
+    async def get_work_order_detail(self, work_order_id: str):
+        """获取工单详情"""
+        return await self.client.get(f"/asset/open_api/v1/alert_work_order/{work_order_id}")
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+TopStack 访问令牌管理模块
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 令牌获取函数返回 (访问令牌, 有效期秒数)
+TokenFetcher = Callable[[], Tuple[str, int]]
+AsyncTokenFetcher = Callable[[], Awaitable[Tuple[str, int]]]
+
+
+class _TokenState:
+    """一次令牌获取的结果，创建后不再修改，可在线程间安全共享"""
+
+    __slots__ = ("token", "refresh_at", "expires_at", "expires_at_wall")
+
+    def __init__(self, token: str, refresh_at: float, expires_at: float, expires_at_wall: datetime):
+        self.token = token
+        self.refresh_at = refresh_at
+        self.expires_at = expires_at
+        self.expires_at_wall = expires_at_wall
+
+
+class _TokenManagerBase:
+    """令牌有效期计算逻辑"""
+
+    def __init__(
+        self,
+        expire_margin: float = 300,
+        refresh_ahead: float = 60,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            expire_margin: 在服务端过期时间之前多少秒视为过期
+            refresh_ahead: 在视为过期之前多少秒开始后台刷新
+            clock: 单调时钟，便于测试替换
+        """
+        self.expire_margin = expire_margin
+        self.refresh_ahead = refresh_ahead
+        self._clock = clock
+        self._state: Optional[_TokenState] = None
+
+    @property
+    def token(self) -> Optional[str]:
+        """当前缓存的访问令牌"""
+        state = self._state
+        return state.token if state else None
+
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        """当前令牌视为过期的本地时间"""
+        state = self._state
+        return state.expires_at_wall if state else None
+
+    def invalidate(self) -> None:
+        """丢弃当前令牌，下次获取时重新认证（例如收到 401 响应后）"""
+        self._state = None
+
+    def _new_state(self, token: str, expire_seconds: int) -> _TokenState:
+        lifetime = max(expire_seconds - self.expire_margin, 0)
+        now = self._clock()
+        return _TokenState(
+            token,
+            now + max(lifetime - self.refresh_ahead, 0),
+            now + lifetime,
+            datetime.now() + timedelta(seconds=lifetime)
+        )
+
+
+class TokenManager(_TokenManagerBase):
+    """
+    线程安全的访问令牌管理器
+
+    - 令牌有效时直接返回，不加锁
+    - 进入提前刷新窗口后由一个后台线程刷新，其他线程继续使用旧令牌
+    - 令牌已过期时，并发调用合并为一次认证请求，其余线程等待结果
+    """
+
+    def __init__(
+        self,
+        fetch: TokenFetcher,
+        expire_margin: float = 300,
+        refresh_ahead: float = 60,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        初始化令牌管理器
+
+        Args:
+            fetch: 获取令牌的函数，返回 (访问令牌, 有效期秒数)
+            expire_margin: 在服务端过期时间之前多少秒视为过期
+            refresh_ahead: 在视为过期之前多少秒开始后台刷新
+            clock: 单调时钟，便于测试替换
+        """
+        super().__init__(expire_margin, refresh_ahead, clock)
+        self._fetch = fetch
+        self._cond = threading.Condition()
+        self._refreshing = False
+        self._generation = 0
+        self._last_error: Optional[BaseException] = None
+
+    def get_token(self) -> str:
+        """
+        获取有效的访问令牌
+
+        Returns:
+            访问令牌字符串
+        """
+        state = self._state
+        if state is not None:
+            now = self._clock()
+            if now < state.refresh_at:
+                return state.token
+            if now < state.expires_at:
+                self._refresh_in_background()
+                return state.token
+        return self._refresh_blocking()
+
+    def _refresh_in_background(self) -> None:
+        with self._cond:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        thread = threading.Thread(
+            target=self._background_refresh, name="topstack-token-refresh", daemon=True
+        )
+        thread.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self._refresh()
+        except Exception as e:
+            # 旧令牌仍然有效，过期后由前台请求重试
+            logger.warning(f"后台刷新访问令牌失败: {e}")
+
+    def _refresh_blocking(self) -> str:
+        with self._cond:
+            while True:
+                state = self._state
+                if state is not None and self._clock() < state.expires_at:
+                    return state.token
+                if not self._refreshing:
+                    self._refreshing = True
+                    break
+                # 等待进行中的刷新，失败时直接抛出同一个异常
+                generation = self._generation
+                while self._refreshing:
+                    self._cond.wait()
+                if self._generation != generation and self._last_error is not None:
+                    raise self._last_error
+        return self._refresh().token
+
+    def _refresh(self) -> _TokenState:
+        """执行一次认证请求，调用前必须已将 _refreshing 置为 True"""
+        state = None
+        error = None
+        try:
+            token, expire_seconds = self._fetch()
+            state = self._new_state(token, expire_seconds)
+            return state
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            with self._cond:
+                if state is not None:
+                    self._state = state
+                self._last_error = error
+                self._generation += 1
+                self._refreshing = False
+                self._cond.notify_all()
+
+
+class AsyncTokenManager(_TokenManagerBase):
+    """
+    asyncio 访问令牌管理器
+
+    行为与 TokenManager 一致：提前在后台任务中刷新，过期时并发协程共享同一次认证请求。
+    """
+
+    def __init__(
+        self,
+        fetch: AsyncTokenFetcher,
+        expire_margin: float = 300,
+        refresh_ahead: float = 60,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        初始化令牌管理器
+
+        Args:
+            fetch: 获取令牌的协程函数，返回 (访问令牌, 有效期秒数)
+            expire_margin: 在服务端过期时间之前多少秒视为过期
+            refresh_ahead: 在视为过期之前多少秒开始后台刷新
+            clock: 单调时钟，便于测试替换
+        """
+        super().__init__(expire_margin, refresh_ahead, clock)
+        self._fetch = fetch
+        self._task: Optional[asyncio.Task] = None
+
+    async def get_token(self) -> str:
+        """
+        获取有效的访问令牌
+
+        Returns:
+            访问令牌字符串
+        """
+        state = self._state
+        if state is not None:
+            now = self._clock()
+            if now < state.refresh_at:
+                return state.token
+            if now < state.expires_at:
+                self._refresh_task(background=True)
+                return state.token
+        state = await asyncio.shield(self._refresh_task())
+        return state.token
+
+    def _refresh_task(self, background: bool = False) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._refresh())
+            if background:
+                self._task.add_done_callback(self._log_background_error)
+        return self._task
+
+    async def _refresh(self) -> _TokenState:
+        try:
+            token, expire_seconds = await self._fetch()
+            self._state = self._new_state(token, expire_seconds)
+            return self._state
+        finally:
+            self._task = None
+
+    @staticmethod
+    def _log_background_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"后台刷新访问令牌失败: {task.exception()}")
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+TopStack 批量请求分片与并发执行工具
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from .client import TopStackError
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class ChunkFailure:
+    """失败的分片"""
+
+    def __init__(self, index: int, offset: int, items: Sequence[Any], error: BaseException):
+        """
+        Args:
+            index: 分片序号
+            offset: 分片第一个元素在原始输入中的位置
+            items: 分片包含的输入元素
+            error: 分片请求抛出的异常
+        """
+        self.index = index
+        self.offset = offset
+        self.items = items
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"ChunkFailure(index={self.index}, offset={self.offset}, size={len(self.items)}, error={self.error!r})"
+
+
+class BatchError(TopStackError):
+    """
+    批量请求部分分片失败
+
+    results 只拼接了成功分片的结果，不包含失败分片，位置不能与输入一一对应，需要按键
+    （例如设备 ID 和测点 ID）匹配。需要按位置对应时使用 chunk_results：第 i 个元素是
+    第 i 个分片的结果，失败分片为 None，分片在输入中的起始位置见 ChunkFailure.offset。
+    """
+
+    def __init__(
+        self,
+        message: str,
+        results: List[Any],
+        failures: List[ChunkFailure],
+        chunk_results: Optional[List[Optional[Any]]] = None
+    ):
+        """
+        Args:
+            message: 错误信息
+            results: 成功分片的结果按顺序拼接，不包含失败分片
+            failures: 失败分片列表
+            chunk_results: 按分片顺序排列的结果，失败分片的位置为 None
+        """
+        first = failures[0].error if failures else None
+        status_code = first.status_code if isinstance(first, TopStackError) else 0
+        super().__init__(message, status_code, None)
+        self.results = results
+        self.failures = failures
+        self.chunk_results = chunk_results
+
+
+def chunked(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    """
+    将序列按固定大小切分
+
+    Args:
+        items: 输入序列
+        size: 每个分片的最大元素数
+
+    Returns:
+        分片列表
+    """
+    if size <= 0:
+        raise ValueError("分片大小必须大于 0")
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_chunks(
+    func: Callable[[Sequence[T]], R],
+    chunks: List[Sequence[T]],
+    max_workers: int
+) -> Tuple[List[Optional[R]], List[ChunkFailure]]:
+    """
+    使用线程池并发执行分片请求
+
+    Args:
+        func: 处理单个分片的函数
+        chunks: 分片列表
+        max_workers: 最大并发数
+
+    Returns:
+        (按分片顺序排列的结果，失败分片的位置为 None, 失败分片列表)
+    """
+    results: List[Optional[R]] = [None] * len(chunks)
+    failures: List[ChunkFailure] = []
+    offsets = _offsets(chunks)
+
+    if len(chunks) <= 1 or max_workers <= 1:
+        for index, chunk in enumerate(chunks):
+            try:
+                results[index] = func(chunk)
+            except Exception as e:
+                failures.append(ChunkFailure(index, offsets[index], chunk, e))
+        return results, failures
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        futures = [executor.submit(func, chunk) for chunk in chunks]
+        for index, future in enumerate(futures):
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                failures.append(ChunkFailure(index, offsets[index], chunks[index], e))
+    return results, failures
+
+
+async def run_chunks_async(
+    func: Callable[[Sequence[T]], Awaitable[R]],
+    chunks: List[Sequence[T]],
+    max_concurrency: int
+) -> Tuple[List[Optional[R]], List[ChunkFailure]]:
+    """
+    在事件循环中并发执行分片请求
+
+    Args:
+        func: 处理单个分片的协程函数
+        chunks: 分片列表
+        max_concurrency: 最大并发数
+
+    Returns:
+        (按分片顺序排列的结果，失败分片的位置为 None, 失败分片列表)
+    """
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def run(chunk: Sequence[T]) -> R:
+        async with semaphore:
+            return await func(chunk)
+
+    outcomes = await asyncio.gather(*[run(chunk) for chunk in chunks], return_exceptions=True)
+
+    results: List[Optional[R]] = [None] * len(chunks)
+    failures: List[ChunkFailure] = []
+    offsets = _offsets(chunks)
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            failures.append(ChunkFailure(index, offsets[index], chunks[index], outcome))
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results[index] = outcome
+    return results, failures
+
+
+def merge_chunk_results(
+    results: List[Optional[List[Any]]],
+    failures: List[ChunkFailure],
+    description: str
+) -> List[Any]:
+    """
+    合并各分片的列表结果
+
+    单个分片失败时直接抛出原始异常；多个分片中部分失败时抛出 BatchError，
+    其中携带已成功的结果（不含失败分片）、按分片对齐的结果和失败分片。
+
+    Args:
+        results: run_chunks / run_chunks_async 返回的分片结果
+        failures: 失败分片列表
+        description: 用于错误信息的请求描述
+
+    Returns:
+        按输入顺序合并的结果列表
+    """
+    if failures and len(results) == 1:
+        raise failures[0].error
+
+    merged: List[Any] = []
+    for result in results:
+        if result:
+            merged.extend(result)
+
+    if failures:
+        raise BatchError(
+            f"{description}: {len(failures)}/{len(results)} 个分片失败，首个错误: {failures[0].error}",
+            merged,
+            failures,
+            results
+        )
+    return merged
+
+
+def _offsets(chunks: List[Sequence[Any]]) -> List[int]:
+    offsets = []
+    offset = 0
+    for chunk in chunks:
+        offsets.append(offset)
+        offset += len(chunk)
+    return offsets
\ No newline at end of file
@@ -2,131 +2,368 @@
 TopStack 客户端核心模块
 """
 
-import json
 import time
-from typing import Any, Dict, Generic, Optional, TypeVar, Union
+import asyncio
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar, Union
 from datetime import datetime, timedelta
-import requests
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+from .auth import TokenManager, AsyncTokenManager
+from .codec import JsonCodec, get_codec
+from .retry import RetryPolicy
+from .limits import AdaptiveLimiter, RateLimiter
+from .metrics import Instrumentation, RequestSample
+from . import decode
 
 T = TypeVar('T')
 
 class Response(BaseModel, Generic[T]):
     """API 响应模型"""
+    # 推迟到首次校验时再生成校验器，导入时只定义类
+    model_config = {"defer_build": True}
+
     status: Optional[int] = Field(None, description="HTTP 状态码")
     code: Optional[str] = Field(None, description="响应代码")
     msg: Optional[str] = Field(None, description="响应消息")
     data: Optional[T] = Field(None, description="响应数据")
+    success: Optional[bool] = Field(None, description="操作结果，只有部分接口（如批量下发）在响应顶层返回")
 
     def __str__(self) -> str:
         if self.msg:
             return f"{self.code}: {self.msg}"
         return self.code or "Unknown error"
 
-class TopStackClient:
+
+class _BaseClient:
+    """同步与异步客户端共用的认证与响应处理逻辑"""
+
+    AUTH_ENDPOINT = "/open_api/v1/auth/access_token"
+
+    def __init__(
+        self,
+        base_url: str,
+        app_id: str,
+        app_secret: str,
+        timeout: int = 20,
+        verify_ssl: bool = False,
+        codec: Union[str, JsonCodec, None] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.codec = get_codec(codec)
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.instrumentation = instrumentation
+
+        # 访问令牌由子类创建的令牌管理器维护
+        self.token_manager = None
+
+        if not verify_ssl:
+            # 禁用 SSL 验证警告
+            import urllib3
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """当前缓存的访问令牌"""
+        return self.token_manager.token
+
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        """当前访问令牌视为过期的时间（提前5分钟）"""
+        return self.token_manager.expires_at
+
+    def _auth_payload(self) -> Dict[str, str]:
+        """认证请求数据"""
+        return {
+            "app_id": self.app_id,
+            "app_secret": self.app_secret
+        }
+
+    def _encode_body(self, data: Any) -> Optional[bytes]:
+        """序列化请求体"""
+        if data is None:
+            return None
+        return self.codec.dumps(data)
+
+    def _decode_body(self, content: bytes, status_code: int, description: str = "响应解析失败") -> Any:
+        """
+        解析响应体
+
+        Raises:
+            TopStackError: 响应体不是合法的 JSON 时抛出异常
+        """
+        if not content:
+            return {}
+        try:
+            return self.codec.loads(content)
+        except ValueError as e:
+            raise TopStackError(f"{description}: {str(e)}", status_code, None)
+
+    def _token_refreshed(self, started: float, success: bool) -> None:
+        """记录一次访问令牌请求"""
+        if self.instrumentation is not None:
+            self.instrumentation.on_token_refresh(time.perf_counter() - started, success)
+
+    def _parse_token_response(self, status_code: int, ok: bool, resp_data: Dict[str, Any]) -> Tuple[str, int]:
+        """
+        校验认证响应
+
+        Returns:
+            (访问令牌, 有效期秒数)
+
+        Raises:
+            TopStackError: 认证失败时抛出异常
+        """
+        if not ok:
+            raise TopStackError(
+                f"获取访问令牌失败: HTTP {status_code}",
+                status_code,
+                None
+            )
+
+        # 检查业务错误
+        if resp_data.get('code'):
+            raise TopStackError(
+                f"获取访问令牌失败: {resp_data.get('code')}, {resp_data.get('msg', '')}",
+                status_code,
+                None
+            )
+
+        return resp_data.get('access_token'), resp_data.get('expire', 3600)
+
+    def _build_response(
+        self,
+        status_code: int,
+        ok: bool,
+        reason: str,
+        text: str,
+        resp_data: Any,
+        response_model: Optional[type] = None,
+        sample: Optional[RequestSample] = None
+    ) -> Response:
+        """
+        根据已解析的响应内容构建 Response 对象
+
+        Args:
+            sample: 请求采样，记录模型校验耗时
+
+        Raises:
+            TopStackError: HTTP 状态码表示失败时抛出异常
+            ResponseDecodeError: 响应数据不符合响应模型时抛出异常
+        """
+        if not isinstance(resp_data, dict):
+            resp_data = {}
+
+        # 创建响应对象，data 由下面的响应模型解析
+        api_response = Response.model_construct(
+            status=status_code,
+            code=resp_data.get('code'),
+            msg=resp_data.get('msg'),
+            data=resp_data.get('data'),
+            success=resp_data.get('success')
+        )
+
+        # 如果提供了响应模型，整体解析数据
+        if response_model and api_response.data and ok:
+            started = time.perf_counter() if sample is not None else 0.0
+            try:
+                api_response.data = decode.validate(api_response.data, response_model)
+            except ValidationError as e:
+                raise ResponseDecodeError(response_model, e, status_code, api_response)
+            finally:
+                if sample is not None:
+                    sample.validate = time.perf_counter() - started
+
+        # 检查错误
+        if not ok:
+            # 构建详细的错误信息
+            error_msg = f"HTTP {status_code}"
+            if api_response.msg:
+                error_msg += f": {api_response.msg}"
+            elif api_response.code:
+                error_msg += f": {api_response.code}"
+            else:
+                error_msg += f": {reason}"
+
+            # 如果有响应内容，也包含进去
+            if text:
+                try:
+                    error_data = self.codec.loads(text)
+                    if isinstance(error_data, dict):
+                        if 'message' in error_data:
+                            error_msg += f" - {error_data['message']}"
+                        elif 'error' in error_data:
+                            error_msg += f" - {error_data['error']}"
+                except ValueError:
+                    # 如果不是 JSON，显示前 200 个字符
+                    error_msg += f" - {text[:200]}"
+
+            raise TopStackError(error_msg, status_code, api_response)
+
+        return api_response
+
+
+class TopStackClient(_BaseClient):
     """TopStack 客户端"""
-    
+
     def __init__(
         self,
         base_url: str,
         app_id: str,
         app_secret: str,
         timeout: int = 20,
-        verify_ssl: bool = False
+        verify_ssl: bool = False,
+        token_refresh_ahead: float = 60,
+        pool_maxsize: int = 10,
+        codec: Union[str, JsonCodec, None] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None
     ):
         """
         初始化客户端
-        
+
         Args:
             base_url: API 基础 URL
             app_id: 应用 ID
             app_secret: 应用密钥
             timeout: 请求超时时间（秒）
             verify_ssl: 是否验证 SSL 证书
+            token_refresh_ahead: 令牌过期前多少秒开始后台刷新
+            pool_maxsize: 连接池保持的最大连接数，应不小于并发请求的线程数
+            codec: JSON 编解码器实例或名称：auto,orjson,msgspec,json，默认自动选择
+            retry: 重试策略，默认不重试
+            rate_limiter: 请求速率限制，默认不限制
+            concurrency_limiter: 自适应并发限制，默认不限制
+            instrumentation: 请求指标采集，例如 MetricsRegistry，默认不采集
         """
-        self.base_url = base_url.rstrip('/')
-        self.app_id = app_id
-        self.app_secret = app_secret
-        self.timeout = timeout
-        self.verify_ssl = verify_ssl
-        
-        # 访问令牌相关
-        self.access_token = None
-        self.token_expires_at = None
-        
+        super().__init__(base_url, app_id, app_secret, timeout, verify_ssl, codec, retry,
+                         rate_limiter, concurrency_limiter, instrumentation)
+
+        # 访问令牌：单飞刷新，提前后台续期
+        self.token_manager = TokenManager(
+            self._fetch_access_token, refresh_ahead=token_refresh_ahead
+        )
+
+        # requests 只有同步客户端使用，与 httpx 一样在创建客户端时才导入
+        import requests
+        self._requests = requests
+
         # 创建会话
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
         })
-        
-        if not verify_ssl:
-            # 禁用 SSL 验证警告
-            import urllib3
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
     def _get_access_token(self) -> str:
         """
         获取访问令牌
-        
+
         Returns:
             访问令牌字符串
-            
+
         Raises:
             TopStackError: 获取令牌失败时抛出异常
         """
-        # 检查令牌是否还有效（提前5分钟过期）
-        if (self.access_token and self.token_expires_at and 
-            datetime.now() < self.token_expires_at):
-            return self.access_token
-        
+        return self.token_manager.get_token()
+
+    def _fetch_access_token(self) -> Tuple[str, int]:
+        """
+        请求认证接口
+
+        Returns:
+            (访问令牌, 有效期秒数)
+
+        Raises:
+            TopStackError: 获取令牌失败时抛出异常
+        """
+        started = time.perf_counter()
+        success = False
+        try:
+            try:
+                # 发送认证请求
+                response = self.session.post(
+                    f"{self.base_url}{self.AUTH_ENDPOINT}",
+                    data=self._encode_body(self._auth_payload()),
+                    timeout=self.timeout,
+                    verify=self.verify_ssl
+                )
+            except self._requests.exceptions.RequestException as e:
+                raise TopStackError(f"获取访问令牌请求失败: {str(e)}", 0, None)
+
+            resp_data = self._decode_body(response.content, 0, "解析访问令牌响应失败") if response.ok else {}
+            token = self._parse_token_response(response.status_code, response.ok, resp_data)
+            success = True
+            return token
+        finally:
+            self._token_refreshed(started, success)
+
+    def _send(
+        self, method: str, url: str, body: Optional[bytes], sample: Optional[RequestSample] = None
+    ) -> Tuple[Any, Optional["TopStackError"], int, Any]:
+        """
+        发送一次请求，经过限流器
+
+        Args:
+            sample: 请求采样，记录获取令牌与 HTTP 往返耗时
+
+        Returns:
+            (原始响应, 异常, 状态码, 响应头部)，传输错误的状态码为 0
+        """
+        if sample is not None:
+            sample.attempts += 1
+            token_started = time.perf_counter()
         try:
-            # 准备认证请求数据
-            auth_data = {
-                "app_id": self.app_id,
-                "app_secret": self.app_secret
-            }
-            
-            # 发送认证请求
-            response = self.session.post(
-                f"{self.base_url}/open_api/v1/auth/access_token",
-                json=auth_data,
+            # 获取访问令牌，认证头部随请求携带，不修改共享会话
+            access_token = self._get_access_token()
+        except TopStackError as e:
+            return None, e, e.status_code, None
+        finally:
+            if sample is not None:
+                sample.token += time.perf_counter() - token_started
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        limiter = self.concurrency_limiter
+        if limiter is not None:
+            limiter.acquire()
+        started = time.perf_counter()
+        status_code = None
+        try:
+            response = self.session.request(
+                method=method,
+                url=url,
+                data=body,
+                headers={'Authorization': f'Bearer {access_token}'},
                 timeout=self.timeout,
                 verify=self.verify_ssl
             )
-            
-            if not response.ok:
-                raise TopStackError(
-                    f"获取访问令牌失败: HTTP {response.status_code}",
-                    response.status_code,
-                    None
-                )
-            
-            # 解析响应
-            resp_data = response.json()
-            
-            # 检查业务错误
-            if resp_data.get('code'):
-                raise TopStackError(
-                    f"获取访问令牌失败: {resp_data.get('code')}, {resp_data.get('msg', '')}",
-                    response.status_code,
-                    None
-                )
-            
-            # 保存令牌信息
-            self.access_token = resp_data.get('access_token')
-            expire_seconds = resp_data.get('expire', 3600)
-            
-            # 提前5分钟过期
-            self.token_expires_at = datetime.now() + timedelta(seconds=expire_seconds - 300)
-            
-            return self.access_token
-            
-        except requests.exceptions.RequestException as e:
-            raise TopStackError(f"获取访问令牌请求失败: {str(e)}", 0, None)
-        except json.JSONDecodeError as e:
-            raise TopStackError(f"解析访问令牌响应失败: {str(e)}", 0, None)
-    
+            status_code = response.status_code
+            if sample is not None:
+                sample.ttfb = response.elapsed.total_seconds()
+            return response, None, status_code, response.headers
+        except self._requests.exceptions.RequestException as e:
+            status_code = 0
+            return None, TopStackError(f"请求失败: {str(e)}", 0, None), 0, None
+        finally:
+            elapsed = time.perf_counter() - started
+            if sample is not None:
+                sample.http += elapsed
+            if limiter is not None:
+                limiter.release(elapsed, status_code)
+
     def _make_request(
         self,
         method: str,
@@ -136,106 +373,412 @@ class TopStackClient:
     ) -> Response:
         """
         发送 HTTP 请求
-        
+
         Args:
             method: HTTP 方法
             endpoint: API 端点
             data: 请求数据
             response_model: 响应数据模型
-            
+
         Returns:
             Response 对象
+
+        Raises:
+            CircuitOpenError: 接口熔断期间直接抛出异常
         """
-        # 获取访问令牌并设置认证头部
-        access_token = self._get_access_token()
-        self.session.headers['Authorization'] = f'Bearer {access_token}'
-        
-        url = f"{self.base_url}{endpoint}"
-        
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self._request(method, endpoint, data, response_model, None)
+
+        sample = RequestSample(method, endpoint)
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                timeout=self.timeout,
-                verify=self.verify_ssl
-            )
-            
-            # 解析响应
-            resp_data = response.json() if response.content else {}
-            
-            # 创建响应对象
-            api_response = Response(
-                status=response.status_code,
-                code=resp_data.get('code'),
-                msg=resp_data.get('msg'),
-                data=resp_data.get('data')
-            )
-            
-            # 如果提供了响应模型，尝试解析数据
-            if response_model and api_response.data:
-                try:
-                    if isinstance(api_response.data, list):
-                        api_response.data = [response_model(**item) for item in api_response.data]
-                    else:
-                        api_response.data = response_model(**api_response.data)
-                except Exception as e:
-                    # 如果解析失败，保持原始数据
-                    pass
-            
-            # 检查错误
-            if not response.ok:
-                # 构建详细的错误信息
-                error_msg = f"HTTP {response.status_code}"
-                if api_response.msg:
-                    error_msg += f": {api_response.msg}"
-                elif api_response.code:
-                    error_msg += f": {api_response.code}"
-                else:
-                    error_msg += f": {response.reason}"
-                
-                # 如果有响应内容，也包含进去
-                if response.text:
-                    try:
-                        error_data = response.json()
-                        if isinstance(error_data, dict):
-                            if 'message' in error_data:
-                                error_msg += f" - {error_data['message']}"
-                            elif 'error' in error_data:
-                                error_msg += f" - {error_data['error']}"
-                    except:
-                        # 如果不是 JSON，显示前 200 个字符
-                        error_msg += f" - {response.text[:200]}"
-                
-                raise TopStackError(error_msg, response.status_code, api_response)
-            
-            return api_response
-            
-        except requests.exceptions.RequestException as e:
-            raise TopStackError(f"请求失败: {str(e)}", 0, None)
-        except json.JSONDecodeError as e:
-            raise TopStackError(f"响应解析失败: {str(e)}", response.status_code, None)
-    
+            return self._request(method, endpoint, data, response_model, sample)
+        except Exception as e:
+            sample.fail(e)
+            raise
+        finally:
+            instrumentation.on_request(sample.finish())
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        response_model: Optional[type],
+        sample: Optional[RequestSample]
+    ) -> Response:
+        """发送 HTTP 请求，按需重试，sample 不为空时记录各阶段耗时"""
+        url = f"{self.base_url}{endpoint}"
+        body = self._encode_body(data)
+        if sample is not None and body is not None:
+            sample.bytes_out = len(body)
+        call = self.retry.start(method, endpoint) if self.retry is not None else None
+
+        while True:
+            if call is not None:
+                remaining = call.blocked()
+                if remaining is not None:
+                    raise CircuitOpenError(call.key, remaining)
+
+            response, error, status_code, headers = self._send(method, url, body, sample)
+            delay = call.next_delay(status_code, headers) if call is not None else None
+            if delay is None:
+                break
+            if sample is not None:
+                sample.backoff += delay
+            time.sleep(delay)
+
+        if error is not None:
+            raise error
+
+        if response.status_code == 401:
+            self.token_manager.invalidate()
+
+        # 解析响应
+        if sample is None:
+            resp_data = self._decode_body(response.content, response.status_code)
+        else:
+            sample.status = response.status_code
+            sample.bytes_in = len(response.content)
+            started = time.perf_counter()
+            resp_data = self._decode_body(response.content, response.status_code)
+            sample.decode = time.perf_counter() - started
+
+        return self._build_response(
+            response.status_code,
+            response.ok,
+            response.reason,
+            response.text,
+            resp_data,
+            response_model,
+            sample
+        )
+
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
         """发送 GET 请求"""
         return self._make_request('GET', endpoint, params, response_model)
-    
+
     def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
         """发送 POST 请求"""
         return self._make_request('POST', endpoint, data, response_model)
-    
+
     def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
         """发送 PUT 请求"""
         return self._make_request('PUT', endpoint, data, response_model)
-    
+
     def delete(self, endpoint: str, data: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
         """发送 DELETE 请求"""
         return self._make_request('DELETE', endpoint, data, response_model)
 
+
+class AsyncTopStackClient(_BaseClient):
+    """
+    TopStack 异步客户端
+
+    基于 httpx.AsyncClient，使用有界连接池复用 HTTP/1.1 keep-alive 连接，
+    可选启用 HTTP/2 多路复用，适合在单个事件循环中并发大量请求。
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        app_id: str,
+        app_secret: str,
+        timeout: int = 20,
+        verify_ssl: bool = False,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        http2: bool = False,
+        token_refresh_ahead: float = 60,
+        codec: Union[str, JsonCodec, None] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        初始化异步客户端
+
+        Args:
+            base_url: API 基础 URL
+            app_id: 应用 ID
+            app_secret: 应用密钥
+            timeout: 请求超时时间（秒）
+            verify_ssl: 是否验证 SSL 证书
+            max_connections: 连接池最大连接数
+            max_keepalive_connections: 连接池保持的空闲 keep-alive 连接数
+            http2: 是否启用 HTTP/2（需要安装 h2）
+            token_refresh_ahead: 令牌过期前多少秒开始后台刷新
+            codec: JSON 编解码器实例或名称：auto,orjson,msgspec,json，默认自动选择
+            retry: 重试策略，默认不重试
+            rate_limiter: 请求速率限制，默认不限制
+            concurrency_limiter: 自适应并发限制，默认不限制
+            instrumentation: 请求指标采集，例如 MetricsRegistry，默认不采集
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "AsyncTopStackClient 需要安装 httpx: pip install topstack-sdk[async]"
+            )
+
+        super().__init__(base_url, app_id, app_secret, timeout, verify_ssl, codec, retry,
+                         rate_limiter, concurrency_limiter, instrumentation)
+
+        self._httpx = httpx
+        self.token_manager = AsyncTokenManager(
+            self._fetch_access_token, refresh_ahead=token_refresh_ahead
+        )
+
+        # 创建带连接池的异步会话
+        self.session = httpx.AsyncClient(
+            timeout=timeout,
+            verify=verify_ssl,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            headers={'Content-Type': 'application/json'}
+        )
+
+    async def __aenter__(self) -> 'AsyncTopStackClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """关闭连接池"""
+        await self.session.aclose()
+
+    async def _get_access_token(self) -> str:
+        """
+        获取访问令牌
+
+        并发协程共用一次认证请求。
+
+        Returns:
+            访问令牌字符串
+
+        Raises:
+            TopStackError: 获取令牌失败时抛出异常
+        """
+        return await self.token_manager.get_token()
+
+    async def _fetch_access_token(self) -> Tuple[str, int]:
+        """
+        请求认证接口
+
+        Returns:
+            (访问令牌, 有效期秒数)
+
+        Raises:
+            TopStackError: 获取令牌失败时抛出异常
+        """
+        started = time.perf_counter()
+        success = False
+        try:
+            try:
+                response = await self.session.post(
+                    f"{self.base_url}{self.AUTH_ENDPOINT}",
+                    content=self._encode_body(self._auth_payload())
+                )
+            except self._httpx.HTTPError as e:
+                raise TopStackError(f"获取访问令牌请求失败: {str(e)}", 0, None)
+
+            resp_data = self._decode_body(response.content, 0, "解析访问令牌响应失败") if response.is_success else {}
+            token = self._parse_token_response(response.status_code, response.is_success, resp_data)
+            success = True
+            return token
+        finally:
+            self._token_refreshed(started, success)
+
+    async def _send(
+        self, method: str, url: str, body: Optional[bytes], sample: Optional[RequestSample] = None
+    ) -> Tuple[Any, Optional["TopStackError"], int, Any]:
+        """
+        发送一次请求，经过限流器
+
+        Args:
+            sample: 请求采样，记录获取令牌与 HTTP 往返耗时
+
+        Returns:
+            (原始响应, 异常, 状态码, 响应头部)，传输错误的状态码为 0
+        """
+        if sample is not None:
+            sample.attempts += 1
+            token_started = time.perf_counter()
+        try:
+            access_token = await self._get_access_token()
+        except TopStackError as e:
+            return None, e, e.status_code, None
+        finally:
+            if sample is not None:
+                sample.token += time.perf_counter() - token_started
+
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        limiter = self.concurrency_limiter
+        if limiter is not None:
+            await limiter.acquire_async()
+        started = time.perf_counter()
+        status_code = None
+        try:
+            response = await self.session.request(
+                method,
+                url,
+                content=body,
+                headers={'Authorization': f'Bearer {access_token}'}
+            )
+            status_code = response.status_code
+            return response, None, status_code, response.headers
+        except self._httpx.HTTPError as e:
+            status_code = 0
+            return None, TopStackError(f"请求失败: {str(e)}", 0, None), 0, None
+        finally:
+            elapsed = time.perf_counter() - started
+            if sample is not None:
+                sample.http += elapsed
+            if limiter is not None:
+                limiter.release(elapsed, status_code)
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        response_model: Optional[type] = None
+    ) -> Response:
+        """
+        发送 HTTP 请求
+
+        Args:
+            method: HTTP 方法
+            endpoint: API 端点
+            data: 请求数据
+            response_model: 响应数据模型
+
+        Returns:
+            Response 对象
+
+        Raises:
+            CircuitOpenError: 接口熔断期间直接抛出异常
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return await self._request(method, endpoint, data, response_model, None)
+
+        sample = RequestSample(method, endpoint)
+        try:
+            return await self._request(method, endpoint, data, response_model, sample)
+        except Exception as e:
+            sample.fail(e)
+            raise
+        finally:
+            instrumentation.on_request(sample.finish())
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        response_model: Optional[type],
+        sample: Optional[RequestSample]
+    ) -> Response:
+        """发送 HTTP 请求，按需重试，sample 不为空时记录各阶段耗时"""
+        url = f"{self.base_url}{endpoint}"
+        body = self._encode_body(data)
+        if sample is not None and body is not None:
+            sample.bytes_out = len(body)
+        call = self.retry.start(method, endpoint) if self.retry is not None else None
+
+        while True:
+            if call is not None:
+                remaining = call.blocked()
+                if remaining is not None:
+                    raise CircuitOpenError(call.key, remaining)
+
+            response, error, status_code, headers = await self._send(method, url, body, sample)
+            delay = call.next_delay(status_code, headers) if call is not None else None
+            if delay is None:
+                break
+            if sample is not None:
+                sample.backoff += delay
+            await asyncio.sleep(delay)
+
+        if error is not None:
+            raise error
+
+        if response.status_code == 401:
+            self.token_manager.invalidate()
+
+        # 解析响应
+        if sample is None:
+            resp_data = self._decode_body(response.content, response.status_code)
+        else:
+            sample.status = response.status_code
+            sample.bytes_in = len(response.content)
+            started = time.perf_counter()
+            resp_data = self._decode_body(response.content, response.status_code)
+            sample.decode = time.perf_counter() - started
+
+        return self._build_response(
+            response.status_code,
+            response.is_success,
+            response.reason_phrase,
+            response.text,
+            resp_data,
+            response_model,
+            sample
+        )
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
+        """发送 GET 请求"""
+        return await self._make_request('GET', endpoint, params, response_model)
+
+    async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
+        """发送 POST 请求"""
+        return await self._make_request('POST', endpoint, data, response_model)
+
+    async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
+        """发送 PUT 请求"""
+        return await self._make_request('PUT', endpoint, data, response_model)
+
+    async def delete(self, endpoint: str, data: Optional[Dict[str, Any]] = None, response_model: Optional[type] = None) -> Response:
+        """发送 DELETE 请求"""
+        return await self._make_request('DELETE', endpoint, data, response_model)
+
+
 class TopStackError(Exception):
     """TopStack SDK 异常"""
-    
+
     def __init__(self, message: str, status_code: int, response: Optional[Response]):
         super().__init__(message)
         self.status_code = status_code
-        self.response = response 
\ No newline at end of file
+        self.response = response
+
+
+class ResponseDecodeError(TopStackError):
+    """响应数据不符合响应模型"""
+
+    def __init__(self, model: type, error: Exception, status_code: int, response: Optional[Response]):
+        name = getattr(model, '__name__', str(model))
+        if isinstance(error, ValidationError):
+            first = error.errors()[0]
+            location = '.'.join(str(part) for part in first['loc'])
+            detail = f"{error.error_count()} 个字段错误，首个错误 {location}: {first['msg']}"
+        else:
+            detail = str(error)
+        super().__init__(f"响应数据解析为 {name} 失败: {detail}", status_code, response)
+        self.model = model
+        self.error = error
+
+
+class CircuitOpenError(TopStackError):
+    """接口熔断期间请求直接失败"""
+
+    def __init__(self, key: str, retry_in: float):
+        super().__init__(f"接口熔断中: {key}，{retry_in:.1f} 秒后重试", 0, None)
+        self.key = key
+        self.retry_in = retry_in
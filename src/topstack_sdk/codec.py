@@ -0,0 +1,137 @@
+"""
+JSON 编解码
+
+REST 客户端与 NATS 消息总线共用的 JSON 编解码层。默认自动选择已安装的最快实现：
+orjson > msgspec > 标准库 json。loads 直接接受 bytes / bytearray / memoryview，
+不需要先解码为 str；dumps 返回 bytes。
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Union
+
+Buffer = Union[bytes, bytearray, memoryview, str]
+
+
+def _json_default(value: Any) -> Any:
+    """JSON 序列化兜底：处理请求模型中的时间字段"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """
+    JSON 编解码器
+
+    loads 解析失败时抛出 ValueError（或其子类）。
+    """
+
+    name = "json"
+
+    def loads(self, data: Buffer) -> Any:
+        """解析 JSON"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """序列化为 UTF-8 编码的 JSON"""
+        return json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class OrjsonCodec(JsonCodec):
+    """基于 orjson 的编解码器"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data: Buffer) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj, default=_json_default, option=self._option)
+
+
+class MsgspecCodec(JsonCodec):
+    """基于 msgspec 的编解码器"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(enc_hook=_json_default)
+        self._error = msgspec.DecodeError
+
+    def loads(self, data: Buffer) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._error as e:
+            raise ValueError(str(e)) from e
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+_CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+
+_default = None
+
+
+def get_codec(codec: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    """
+    获取编解码器
+
+    Args:
+        codec: 编解码器实例或名称：auto,orjson,msgspec,json；为空时使用默认编解码器
+
+    Returns:
+        JsonCodec: 编解码器实例
+
+    Raises:
+        ImportError: 指定的编解码器未安装时抛出
+    """
+    global _default
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is None:
+        if _default is None:
+            _default = get_codec("auto")
+        return _default
+    if codec == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+        return JsonCodec()
+    if codec not in _CODECS:
+        raise ValueError(f"不支持的 JSON 编解码器: {codec}")
+    try:
+        return _CODECS[codec]()
+    except ImportError:
+        raise ImportError(f"JSON 编解码器 {codec} 需要安装 {codec}: pip install topstack-sdk[{codec}]")
+
+
+def set_default_codec(codec: Union[str, JsonCodec, None]) -> None:
+    """
+    设置默认编解码器，影响之后创建的客户端与消息总线
+
+    Args:
+        codec: 编解码器实例或名称，为空时恢复自动选择
+    """
+    global _default
+    _default = None if codec is None else get_codec(codec)
@@ -0,0 +1,486 @@
+"""
+NATS 消息分发
+
+相同 NATS 主题的回调共享一个 NATS 订阅（共享模式下同一项目、同一类主题的全部订阅使用
+一个通配订阅）。消息到达时只解析一次主题和消息体，再通过主题前缀树找到匹配的回调，
+每种转换函数对同一消息只调用一次。回调是否为协程在注册时确定。
+BatchBuffer 将逐条消息攒批后交给回调，适合批量写入数据库等场景。
+每个 NATS 订阅记录消息数、字节数、解析与回调耗时，由 Dispatcher.stats 读取。
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .codec import JsonCodec, get_codec
+
+# 回调：(回调函数, 是否为协程函数, 消息字典转换函数)
+Handler = Tuple[Callable[[Any], Any], bool, Callable[[Dict[str, Any]], Any]]
+
+# 转换结果缓存中表示尚未转换、转换失败的标记
+_MISSING = object()
+_DECODE_FAILED = object()
+
+
+class _Node:
+    """主题前缀树节点"""
+
+    __slots__ = ("children", "handlers")
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.handlers: List[Handler] = []
+
+
+class SubjectTrie:
+    """
+    按主题分段索引回调的前缀树
+
+    支持 NATS 通配符：``*`` 匹配一个分段，``>`` 匹配末尾的一个或多个分段。
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, tokens: List[str], handler: Handler) -> None:
+        """注册回调"""
+        node = self._root
+        for token in tokens:
+            node = node.children.setdefault(token, _Node())
+        node.handlers.append(handler)
+        self._size += 1
+
+    def remove(self, tokens: List[str], handler: Handler) -> bool:
+        """删除回调，并清理不再使用的节点"""
+        path = [self._root]
+        for token in tokens:
+            node = path[-1].children.get(token)
+            if node is None:
+                return False
+            path.append(node)
+        try:
+            path[-1].handlers.remove(handler)
+        except ValueError:
+            return False
+        self._size -= 1
+
+        for depth in range(len(tokens), 0, -1):
+            node = path[depth]
+            if node.handlers or node.children:
+                break
+            del path[depth - 1].children[tokens[depth - 1]]
+        return True
+
+    def match(self, tokens: List[str]) -> List[Handler]:
+        """查找与主题匹配的全部回调"""
+        matched: List[Handler] = []
+        self._match(self._root, tokens, 0, matched)
+        return matched
+
+    def _match(self, node: _Node, tokens: List[str], index: int, matched: List[Handler]) -> None:
+        if index == len(tokens):
+            matched.extend(node.handlers)
+            return
+        children = node.children
+        tail = children.get('>')
+        if tail is not None:
+            matched.extend(tail.handlers)
+        child = children.get(tokens[index])
+        if child is not None:
+            self._match(child, tokens, index + 1, matched)
+        child = children.get('*')
+        if child is not None:
+            self._match(child, tokens, index + 1, matched)
+
+
+class SubscriptionStats:
+    """
+    单个 NATS 订阅的累计统计
+
+    耗时单位为秒。snapshot 计算距离上次 snapshot 的速率与平均耗时。
+    """
+
+    __slots__ = (
+        "messages", "bytes", "parsed", "parse_time", "parse_failures",
+        "callbacks", "callback_time", "callback_errors", "dropped", "_mark"
+    )
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        # 有匹配回调、需要解析的消息数
+        self.parsed = 0
+        self.parse_time = 0.0
+        self.parse_failures = 0
+        self.callbacks = 0
+        self.callback_time = 0.0
+        self.callback_errors = 0
+        # NATS 客户端待处理队列满（slow consumer）时丢弃的消息数
+        self.dropped = 0
+        self._mark = (time.monotonic(), 0, 0, 0, 0.0, 0, 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        读取统计
+
+        Returns:
+            累计计数，以及距离上次读取的 msgs_per_sec、bytes_per_sec、parse_us（每条消息的
+            平均解析耗时）、callback_us（每次回调的平均耗时）
+        """
+        now = time.monotonic()
+        since, messages, size, parsed, parse_time, callbacks, callback_time = self._mark
+        self._mark = (now, self.messages, self.bytes, self.parsed, self.parse_time,
+                      self.callbacks, self.callback_time)
+        elapsed = now - since
+        parsed = self.parsed - parsed
+        callbacks = self.callbacks - callbacks
+        return {
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "parse_failures": self.parse_failures,
+            "callback_errors": self.callback_errors,
+            "dropped": self.dropped,
+            "msgs_per_sec": (self.messages - messages) / elapsed if elapsed > 0 else 0.0,
+            "bytes_per_sec": (self.bytes - size) / elapsed if elapsed > 0 else 0.0,
+            "parse_us": (self.parse_time - parse_time) / parsed * 1e6 if parsed else None,
+            "callback_us": (self.callback_time - callback_time) / callbacks * 1e6 if callbacks else None,
+        }
+
+
+class _Route:
+    """一个 NATS 订阅及其分发到的回调"""
+
+    __slots__ = ("subject", "error_message", "trie", "subscription", "stats")
+
+    def __init__(self, subject: str, error_message: str):
+        self.subject = subject
+        self.error_message = error_message
+        self.trie = SubjectTrie()
+        self.subscription = None
+        self.stats = SubscriptionStats()
+
+
+class SubscriptionHandle:
+    """订阅句柄，调用 unsubscribe 取消回调"""
+
+    def __init__(self, dispatcher: 'Dispatcher', route: _Route, topic: str, handler: Handler):
+        self._dispatcher = dispatcher
+        self._route = route
+        self._handler = handler
+        self.topic = topic
+        self.active = True
+
+    @property
+    def subject(self) -> str:
+        """实际的 NATS 订阅主题"""
+        return self._route.subject
+
+    async def unsubscribe(self) -> None:
+        """取消订阅，同一 NATS 订阅下没有其它回调时取消 NATS 订阅"""
+        if self.active:
+            self.active = False
+            await self._dispatcher.unregister(self._route, self.topic, self._handler)
+
+
+class Dispatcher:
+    """NATS 订阅共享与消息分发"""
+
+    def __init__(self, conn, logger: Optional[logging.Logger] = None,
+                 codec: Union[str, JsonCodec, None] = None):
+        """
+        Args:
+            conn: NATS 连接
+            logger: 解析或回调出错时使用的日志对象
+            codec: JSON 编解码器实例或名称，默认自动选择
+        """
+        self.conn = conn
+        self.logger = logger or logging.getLogger(__name__)
+        self.codec = get_codec(codec)
+        self._routes: Dict[str, _Route] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def subscription_count(self) -> int:
+        """当前的 NATS 订阅数"""
+        return len(self._routes)
+
+    async def register(
+        self,
+        subject: str,
+        topic: str,
+        decode: Callable[[Dict[str, Any]], Any],
+        callback: Callable[[Any], Any],
+        error_message: str
+    ) -> SubscriptionHandle:
+        """
+        注册回调
+
+        Args:
+            subject: NATS 订阅主题，相同主题的回调共享一个 NATS 订阅
+            topic: 回调关心的主题，必须被 subject 覆盖
+            decode: 将消息字典转换为回调参数，同一消息对每种转换函数只调用一次
+            callback: 回调函数，可以是协程函数
+            error_message: 解析失败时的日志前缀
+
+        Returns:
+            SubscriptionHandle: 订阅句柄
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        handler = (callback, asyncio.iscoroutinefunction(callback), decode)
+
+        async with self._lock:
+            route = self._routes.get(subject)
+            if route is None:
+                route = _Route(subject, error_message)
+                route.subscription = await self.conn.subscribe(subject, cb=self._handler_for(route))
+                self._routes[subject] = route
+            route.trie.insert(topic.split('.'), handler)
+        return SubscriptionHandle(self, route, topic, handler)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        读取各 NATS 订阅的统计
+
+        除 SubscriptionStats.snapshot 的内容外，还包括订阅主题、回调数，以及 NATS 客户端
+        待处理队列的消息数、字节数和上限（pending_msgs、pending_bytes、
+        pending_msgs_limit、pending_bytes_limit）。
+        """
+        result = []
+        for route in list(self._routes.values()):
+            item = {"subject": route.subject, "handlers": len(route.trie)}
+            item.update(route.stats.snapshot())
+            subscription = route.subscription
+            for name, attr in (
+                ("pending_msgs", "pending_msgs"),
+                ("pending_bytes", "pending_bytes"),
+                ("pending_msgs_limit", "_pending_msgs_limit"),
+                ("pending_bytes_limit", "_pending_bytes_limit"),
+            ):
+                item[name] = getattr(subscription, attr, None)
+            result.append(item)
+        return result
+
+    def record_dropped(self, subscription: Any) -> None:
+        """记录 NATS 客户端因待处理队列已满丢弃的一条消息"""
+        for route in self._routes.values():
+            if route.subscription is subscription:
+                route.stats.dropped += 1
+                return
+
+    async def unregister(self, route: _Route, topic: str, handler: Handler) -> None:
+        """删除回调"""
+        async with self._lock:
+            route.trie.remove(topic.split('.'), handler)
+            if len(route.trie) == 0 and self._routes.get(route.subject) is route:
+                del self._routes[route.subject]
+                await route.subscription.unsubscribe()
+
+    def _handler_for(self, route: _Route):
+        trie = route.trie
+        stats = route.stats
+        logger = self.logger
+        loads = self.codec.loads
+        clock = time.perf_counter
+
+        async def message_handler(msg):
+            stats.messages += 1
+            stats.bytes += len(msg.data)
+            handlers = trie.match(msg.subject.split('.'))
+            if not handlers:
+                return
+            stats.parsed += 1
+            started = clock()
+            try:
+                data = loads(msg.data)
+            except Exception as e:
+                stats.parse_time += clock() - started
+                stats.parse_failures += 1
+                logger.error(f"{route.error_message}: {e}")
+                return
+            stats.parse_time += clock() - started
+            # 按转换函数缓存转换结果，同一消息对每种转换函数只转换一次；
+            # 转换失败只跳过使用该转换函数的回调
+            decoded: Dict[Callable[[Dict[str, Any]], Any], Any] = {}
+            for callback, is_coroutine, decode in handlers:
+                message = decoded.get(decode, _MISSING)
+                if message is _MISSING:
+                    started = clock()
+                    try:
+                        message = decode(data)
+                    except Exception as e:
+                        stats.parse_failures += 1
+                        logger.error(f"{route.error_message}: {e}")
+                        message = _DECODE_FAILED
+                    finally:
+                        stats.parse_time += clock() - started
+                    decoded[decode] = message
+                if message is _DECODE_FAILED:
+                    continue
+                started = clock()
+                try:
+                    if is_coroutine:
+                        await callback(message)
+                    else:
+                        callback(message)
+                except Exception as e:
+                    stats.callback_errors += 1
+                    logger.error(f"处理 {msg.subject} 消息的回调出错: {e}")
+                stats.callbacks += 1
+                stats.callback_time += clock() - started
+
+        return message_handler
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class BatchBuffer:
+    """
+    批量投递缓冲区
+
+    消息先写入有界缓冲区，攒够 max_batch 条或距本批第一条消息超过 max_delay 秒时，
+    以列表形式一次交给回调。缓冲区满时按 overflow 处理：
+
+    - drop_oldest: 丢弃最早的消息
+    - drop_newest: 丢弃新到达的消息
+    - block: 暂停接收，直到回调取走数据（NATS 客户端的待处理队列随之增长，超过其上限后由客户端丢弃）
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[List[Any]], Any],
+        max_batch: int = 500,
+        max_delay: float = 0.1,
+        max_buffer: int = 10000,
+        overflow: str = "drop_oldest",
+        logger: Optional[logging.Logger] = None,
+        collect: Optional[Callable[[List[Any]], Any]] = None
+    ):
+        """
+        Args:
+            callback: 批量回调函数，可以是协程函数
+            max_batch: 每批最大消息数
+            max_delay: 每批最长等待时间（秒）
+            max_buffer: 缓冲区最大消息数
+            overflow: 缓冲区满时的处理方式：drop_oldest,drop_newest,block
+            logger: 回调出错时使用的日志对象
+            collect: 将每批消息列表转换为回调参数，例如转换为列式容器
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"不支持的溢出处理方式: {overflow}")
+        if max_batch < 1 or max_buffer < max_batch:
+            raise ValueError("max_batch 必须大于 0 且不超过 max_buffer")
+        self.callback = callback
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_buffer = max_buffer
+        self.overflow = overflow
+        self.logger = logger or logging.getLogger(__name__)
+        self.collect = collect
+        self.dropped = 0
+        self.delivered = 0
+        self._is_coroutine = asyncio.iscoroutinefunction(callback)
+        self._buffer: Deque[Any] = deque()
+        self._not_empty = asyncio.Event()
+        self._full = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.handle: Optional[SubscriptionHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def sink(self) -> Callable[[Any], Any]:
+        """注册到 Dispatcher 的单条消息回调，block 模式下为协程函数"""
+        return self.put if self.overflow == "block" else self.put_nowait
+
+    def start(self) -> None:
+        """启动投递任务"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def put_nowait(self, item: Any) -> None:
+        """写入一条消息，缓冲区满时按 drop_oldest / drop_newest 丢弃"""
+        buffer = self._buffer
+        if len(buffer) >= self.max_buffer:
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            buffer.popleft()
+        buffer.append(item)
+        self._not_empty.set()
+        if len(buffer) >= self.max_batch:
+            self._full.set()
+
+    async def put(self, item: Any) -> None:
+        """写入一条消息，缓冲区满时等待"""
+        while len(self._buffer) >= self.max_buffer:
+            self._space.clear()
+            await self._space.wait()
+        self.put_nowait(item)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_event_loop()
+        while not self._closed:
+            await self._not_empty.wait()
+            deadline = loop.time() + self.max_delay
+            while len(self._buffer) < self.max_batch and not self._closed:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            await self._deliver()
+
+    def _take(self) -> List[Any]:
+        buffer = self._buffer
+        count = min(len(buffer), self.max_batch)
+        batch = [buffer.popleft() for _ in range(count)]
+        if not buffer:
+            self._not_empty.clear()
+        self._space.set()
+        return batch
+
+    async def _deliver(self) -> None:
+        batch = self._take()
+        if not batch:
+            return
+        self.delivered += len(batch)
+        try:
+            if self.collect is not None:
+                batch = self.collect(batch)
+            if self._is_coroutine:
+                await self.callback(batch)
+            else:
+                self.callback(batch)
+        except Exception as e:
+            self.logger.error(f"批量回调出错: {e}")
+
+    async def flush(self) -> None:
+        """立即投递缓冲区中的全部消息"""
+        while self._buffer:
+            await self._deliver()
+
+    async def unsubscribe(self) -> None:
+        """取消订阅，投递剩余消息后停止投递任务"""
+        if self.handle is not None:
+            await self.handle.unsubscribe()
+        self._closed = True
+        if self._task is not None:
+            self._not_empty.set()
+            self._full.set()
+            await self._task
+            self._task = None
+        await self.flush()
@@ -2,6 +2,6 @@
 TopStack 能源管理模块
 """
 
-from .ems import EmsApi
+from .ems import EmsApi, AsyncEmsApi
 
-__all__ = ["EmsApi"] 
\ No newline at end of file
+__all__ = ["EmsApi", "AsyncEmsApi"] 
\ No newline at end of file
@@ -3,7 +3,7 @@
 """
 
 from typing import List, Optional
-from ..client import TopStackClient, Response
+from ..client import TopStackClient, AsyncTopStackClient, Response
 
 class EmsApi:
     """能源管理 API 客户端"""
@@ -39,4 +39,41 @@ class EmsApi:
     
     def get_subentry_detail(self, subentry_id: str):
         """获取分项详情"""
-        return self.client.post("/ems/open_api/v1/subentry/detail", {"id": subentry_id}) 
\ No newline at end of file
+        return self.client.post("/ems/open_api/v1/subentry/detail", {"id": subentry_id})
+
+
+class AsyncEmsApi:
+    """能源管理 API 异步客户端"""
+
+    def __init__(self, client: AsyncTopStackClient):
+        """
+        初始化能源管理 API
+
+        Args:
+            client: TopStack 异步客户端实例
+        """
+        self.client = client
+
+    async def query_meters(self, **params):
+        """查询电表"""
+        return await self.client.post("/ems/open_api/v1/meter/query", params)
+
+    async def get_meter_detail(self, meter_id: str):
+        """获取电表详情"""
+        return await self.client.post("/ems/open_api/v1/meter/detail", {"id": meter_id})
+
+    async def query_sectors(self, **params):
+        """查询部门"""
+        return await self.client.post("/ems/open_api/v1/sector/query", params)
+
+    async def get_sector_detail(self, sector_id: str):
+        """获取部门详情"""
+        return await self.client.post("/ems/open_api/v1/sector/detail", {"id": sector_id})
+
+    async def query_subentries(self, **params):
+        """查询分项"""
+        return await self.client.post("/ems/open_api/v1/subentry/query", params)
+
+    async def get_subentry_detail(self, subentry_id: str):
+        """获取分项详情"""
+        return await self.client.post("/ems/open_api/v1/subentry/detail", {"id": subentry_id})
\ No newline at end of file
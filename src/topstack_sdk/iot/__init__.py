@@ -1,19 +1,81 @@
 """
 TopStack IoT 模块
+
+名称在首次访问时才导入对应的模块，只使用 IotApi 时不导入设备管理模块。
 """
 
-from .iot import IotApi
-from .device import DeviceApi
-from .models import *
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .iot import IotApi, AsyncIotApi
+    from .device import DeviceApi, AsyncDeviceApi, DeviceMetadataCache, DeviceCatalog
+    from .models import *
+    from .columnar import HistoryColumns, HistoryFrame
+    from .history_cache import HistoryCache
+
+# 名称 -> 定义它的模块
+_LAZY = {
+    "IotApi": ".iot",
+    "AsyncIotApi": ".iot",
+    "DeviceApi": ".device.device",
+    "AsyncDeviceApi": ".device.device",
+    "DeviceMetadataCache": ".device.cache",
+    "DeviceCatalog": ".device.catalog",
+    "FindLastRequest": ".models",
+    "FindLastResponse": ".models",
+    "FindLastBatchRequest": ".models",
+    "FindLastBatchResponse": ".models",
+    "SetValueRequest": ".models",
+    "SetValueResult": ".models",
+    "HistoryValue": ".models",
+    "HistoryResult": ".models",
+    "HistoryRequest": ".models",
+    "HistoryResponse": ".models",
+    "DeviceHistoryPoint": ".models",
+    "DeviceHistoryRequest": ".models",
+    "HistoryColumns": ".columnar",
+    "HistoryFrame": ".columnar",
+    "HistoryCache": ".history_cache",
+}
+
+# 之前由包导入时顺带加载、可以直接作为属性访问的子模块
+_SUBMODULES = ("columnar", "device", "history_cache", "iot", "models", "windows")
 
 __all__ = [
     "IotApi",
+    "AsyncIotApi",
     "DeviceApi",
+    "AsyncDeviceApi",
+    "DeviceMetadataCache",
+    "DeviceCatalog",
     "FindLastRequest",
-    "FindLastResponse", 
+    "FindLastResponse",
     "FindLastBatchRequest",
     "FindLastBatchResponse",
     "SetValueRequest",
+    "SetValueResult",
     "HistoryRequest",
-    "HistoryResponse"
-] 
\ No newline at end of file
+    "HistoryResponse",
+    "DeviceHistoryPoint",
+    "DeviceHistoryRequest",
+    "HistoryColumns",
+    "HistoryFrame",
+    "HistoryCache"
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    # 缓存到模块字典，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
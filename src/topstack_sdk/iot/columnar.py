@@ -0,0 +1,191 @@
+"""
+IoT 历史数据列式结果
+
+历史数据直接解码为每个测点的 NumPy 数组（int64 纳秒时间戳、float64 数值），
+不逐行构建 pydantic 模型，可进一步转换为 pandas DataFrame 或 Arrow 表。
+需要安装 numpy；to_pandas / to_arrow 分别需要 pandas / pyarrow。
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..timestamps import epoch_ns
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("列式结果需要安装 numpy: pip install topstack-sdk[columnar]")
+    return numpy
+
+
+def _times_to_ns(np, times: List[Any]):
+    """批量解析时间列，统一使用 UTC（Z 结尾）时走 NumPy 向量化路径"""
+    if times and all(isinstance(t, str) and t.endswith('Z') for t in times):
+        try:
+            return np.array([t[:-1] for t in times], dtype='datetime64[ns]').view('int64')
+        except ValueError:
+            pass
+    return np.fromiter((epoch_ns(t) for t in times), dtype='int64', count=len(times))
+
+
+def _to_float(value: Any) -> float:
+    if value is None:
+        return float('nan')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _values_to_float(np, values: List[Any]):
+    """数值列转换为 float64，None 与非数值转换为 NaN"""
+    try:
+        return np.array(values, dtype='float64')
+    except (TypeError, ValueError):
+        return np.fromiter((_to_float(v) for v in values), dtype='float64', count=len(values))
+
+
+class HistoryColumns:
+    """单个测点的列式历史数据"""
+
+    def __init__(self, device_id: str, point_id: str, time, columns: Dict[str, Any]):
+        """
+        Args:
+            device_id: 设备ID
+            point_id: 测点ID
+            time: int64 数组，UTC 纳秒时间戳
+            columns: 字段名到 float64 数组的映射，例如 value、max、min
+        """
+        self.device_id = device_id
+        self.point_id = point_id
+        self.time = time
+        self.columns = columns
+
+    @property
+    def value(self):
+        """value 列"""
+        return self.columns.get('value')
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __repr__(self) -> str:
+        return (f"HistoryColumns(device_id={self.device_id!r}, point_id={self.point_id!r}, "
+                f"rows={len(self)}, columns={list(self.columns)})")
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> 'HistoryColumns':
+        """从接口返回的单个测点结果（原始字典）解码"""
+        np = _require_numpy()
+        values = result.get('values') or []
+
+        fields: Dict[str, None] = {}
+        for item in values:
+            for key in item:
+                if key != 'time' and key not in fields:
+                    fields[key] = None
+
+        time = _times_to_ns(np, [item.get('time') for item in values])
+        columns = {
+            field: _values_to_float(np, [item.get(field) for item in values])
+            for field in fields
+        }
+        return cls(result.get('deviceID'), result.get('pointID'), time, columns)
+
+
+class HistoryFrame:
+    """多个测点的列式历史数据，按 (设备ID, 测点ID) 索引"""
+
+    def __init__(self, series: Optional[Dict[Tuple[str, str], HistoryColumns]] = None):
+        self.series: Dict[Tuple[str, str], HistoryColumns] = series or {}
+
+    @classmethod
+    def from_results(cls, results: Optional[List[Dict[str, Any]]]) -> 'HistoryFrame':
+        """从接口返回的 results 列表（原始字典）解码"""
+        series = {}
+        for result in results or []:
+            columns = HistoryColumns.from_result(result)
+            series[(columns.device_id, columns.point_id)] = columns
+        return cls(series)
+
+    def __getitem__(self, key: Tuple[str, str]) -> HistoryColumns:
+        return self.series[key]
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self.series
+
+    def __iter__(self) -> Iterator[HistoryColumns]:
+        return iter(self.series.values())
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def __repr__(self) -> str:
+        return f"HistoryFrame(points={len(self)}, rows={sum(len(s) for s in self)})"
+
+    def _long_columns(self):
+        """拼接为长表格式的各列"""
+        np = _require_numpy()
+        parts = list(self)
+        fields: Dict[str, None] = {}
+        for part in parts:
+            for field in part.columns:
+                fields.setdefault(field, None)
+
+        if not parts:
+            empty = np.array([], dtype=object)
+            return empty, empty, np.array([], dtype='int64'), {}
+
+        device_ids = np.concatenate([np.full(len(p), p.device_id, dtype=object) for p in parts])
+        point_ids = np.concatenate([np.full(len(p), p.point_id, dtype=object) for p in parts])
+        time = np.concatenate([p.time for p in parts])
+        columns = {
+            field: np.concatenate([
+                p.columns[field] if field in p.columns else np.full(len(p), np.nan)
+                for p in parts
+            ])
+            for field in fields
+        }
+        return device_ids, point_ids, time, columns
+
+    def to_pandas(self):
+        """
+        转换为长表格式的 pandas DataFrame
+
+        Returns:
+            包含 device_id、point_id、time（UTC）及各数值字段列的 DataFrame
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("to_pandas 需要安装 pandas: pip install topstack-sdk[pandas]")
+        device_ids, point_ids, time, columns = self._long_columns()
+        data = {
+            'device_id': device_ids,
+            'point_id': point_ids,
+            'time': pd.to_datetime(time, unit='ns', utc=True),
+        }
+        data.update(columns)
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        """
+        转换为长表格式的 pyarrow.Table
+
+        Returns:
+            包含 device_id、point_id、time（UTC 纳秒）及各数值字段列的 Table
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("to_arrow 需要安装 pyarrow: pip install topstack-sdk[arrow]")
+        device_ids, point_ids, time, columns = self._long_columns()
+        arrays = {
+            'device_id': pa.array(device_ids, type=pa.string()),
+            'point_id': pa.array(point_ids, type=pa.string()),
+            'time': pa.array(time, type=pa.timestamp('ns', tz='UTC')),
+        }
+        for field, values in columns.items():
+            arrays[field] = pa.array(values, type=pa.float64())
+        return pa.table(arrays)
\ No newline at end of file
@@ -2,6 +2,8 @@
 TopStack IoT 设备管理模块
 """
 
-from .device import DeviceApi
+from .device import DeviceApi, AsyncDeviceApi
+from .cache import DeviceMetadataCache
+from .catalog import DeviceCatalog
 
-__all__ = ["DeviceApi"] 
\ No newline at end of file
+__all__ = ["DeviceApi", "AsyncDeviceApi", "DeviceMetadataCache", "DeviceCatalog"] 
\ No newline at end of file
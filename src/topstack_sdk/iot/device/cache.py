@@ -0,0 +1,202 @@
+"""
+设备元数据缓存
+
+设备、测点和属性等元数据一天只变化几次，但事件补全逻辑往往对每条消息都查询一次。
+DeviceMetadataCache 为 DeviceApi 提供可选的本地缓存：
+
+- 每种查询单独设置过期时间（秒）
+- 按条目数限制内存，超出时淘汰最久未使用的条目（LRU）
+- 查询参数规范化为缓存键：忽略空值和参数顺序
+- 可以按设备失效，也可以订阅设备状态消息自动失效
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# 各查询的默认过期时间（秒）
+DEFAULT_TTLS = {
+    "query": 300.0,
+    "query_points": 600.0,
+    "query_props": 600.0,
+    "query_type_points": 600.0,
+}
+
+# 缓存键：(查询名称, 规范化后的参数)
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+# 未命中标记，缓存值本身可能为 None
+MISSING = object()
+
+
+class _Entry:
+    """缓存条目"""
+
+    __slots__ = ("value", "expires_at", "device_ids")
+
+    def __init__(self, value: Any, expires_at: float, device_ids: FrozenSet[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.device_ids = device_ids
+
+
+class DeviceMetadataCache:
+    """
+    设备元数据缓存
+
+    返回的是缓存中的同一个对象，调用方不应修改。线程安全，同步与异步 DeviceApi 可以共用。
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            ttls: 各查询的过期时间（秒），键为 query、query_points、query_props、query_type_points，
+                未指定的使用 DEFAULT_TTLS，设置为 0 表示不缓存该查询
+            max_entries: 最大缓存条目数
+            clock: 单调时钟
+        """
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        # 设备ID -> 包含该设备的缓存键
+        self._by_device: Dict[str, Set[CacheKey]] = {}
+        # 按状态过滤的设备查询，设备状态变化时结果集可能变化
+        self._state_queries: Set[CacheKey] = set()
+        self._lock = threading.Lock()
+        self._subscriptions: List[Any] = []
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(method: str, params: Dict[str, Any]) -> CacheKey:
+        """
+        生成缓存键
+
+        Args:
+            method: 查询名称
+            params: 查询参数，空值被忽略
+        """
+        return method, tuple(sorted((k, v) for k, v in params.items() if v is not None))
+
+    def enabled(self, method: str) -> bool:
+        """查询是否启用缓存"""
+        return self.ttls.get(method, 0) > 0
+
+    def get(self, key: CacheKey) -> Any:
+        """
+        读取缓存
+
+        Returns:
+            缓存值，未命中或已过期时返回 MISSING
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key: CacheKey, value: Any, device_ids: Iterable[str] = ()) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 查询结果
+            device_ids: 结果涉及的设备，用于按设备失效
+        """
+        ttl = self.ttls.get(key[0], 0)
+        if ttl <= 0:
+            return
+        device_ids = frozenset(device_ids)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, self._clock() + ttl, device_ids)
+            for device_id in device_ids:
+                self._by_device.setdefault(device_id, set()).add(key)
+            if key[0] == "query" and any(name == "state" for name, _ in key[1]):
+                self._state_queries.add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: CacheKey) -> None:
+        """删除条目，调用时需持有锁"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._state_queries.discard(key)
+        for device_id in entry.device_ids:
+            keys = self._by_device.get(device_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_device[device_id]
+
+    def invalidate(self, device_id: Optional[str] = None, method: Optional[str] = None) -> None:
+        """
+        删除缓存
+
+        Args:
+            device_id: 设备ID，删除涉及该设备的全部条目；为空时不按设备过滤
+            method: 查询名称，只删除该查询的条目；为空时不按查询过滤
+        """
+        with self._lock:
+            if device_id is not None:
+                keys = list(self._by_device.get(device_id, ()))
+            else:
+                keys = list(self._entries)
+            for key in keys:
+                if method is None or key[0] == method:
+                    self._remove(key)
+
+    def on_device_state(self, state: Any) -> None:
+        """
+        设备状态变化时失效缓存
+
+        删除涉及该设备的条目，以及按状态过滤的设备查询（结果集可能因此变化）。
+        可以直接作为 NatsBus.subscribe_device_state 的回调。
+        """
+        with self._lock:
+            keys = self._by_device.get(state.device_id, set()) | self._state_queries
+            for key in keys:
+                self._remove(key)
+
+    async def subscribe(self, bus: Any, project_id: str, device_id: str = "*") -> Any:
+        """
+        订阅设备状态消息，收到后自动失效相关缓存
+
+        Args:
+            bus: NATS 消息总线
+            project_id: 项目ID
+            device_id: 设备ID，默认订阅全部设备
+
+        Returns:
+            SubscriptionHandle: 订阅句柄，close 时自动取消
+        """
+        subscription = await bus.subscribe_device_state(project_id, device_id, self.on_device_state)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    async def close(self) -> None:
+        """取消全部订阅"""
+        subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            await subscription.unsubscribe()
+
@@ -0,0 +1,310 @@
+"""
+设备目录
+
+一次性加载全部设备、设备模型的测点定义（以及可选的设备测点），建立按网关、模型、分组、
+通道和名称前缀的索引，在本地回答“网关 Y 下分组 Z 中模型为 X 的设备”这类查询。
+
+目录可以保存为快照文件，进程重启时从磁盘加载而不必重新遍历接口。快照为按列存储的
+msgpack（已安装时）或 JSON。
+"""
+
+import asyncio
+import os
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ... import decode
+from ...codec import get_codec
+from .device import AsyncDeviceApi, DeviceApi
+from .models import DeviceItem, PointItem
+
+# 快照文件头：魔数 + 版本 + 格式（m: msgpack, j: JSON）
+_MAGIC = b"TSCAT"
+_VERSION = 1
+
+
+def _dump_rows(models: Sequence[Any], model: type) -> Dict[str, Any]:
+    """按列保存模型列表：字段名只存一次"""
+    fields = list(model.model_fields)
+    rows = []
+    for item in models:
+        data = item.model_dump(mode="json")
+        rows.append([data.get(field) for field in fields])
+    return {"fields": fields, "rows": rows}
+
+
+def _load_rows(table: Dict[str, Any], model: type) -> List[Any]:
+    return decode.construct_rows(model, table["fields"], table["rows"])
+
+
+def _serializer(format: str) -> Tuple[bytes, Any, Any]:
+    """
+    获取快照序列化方式
+
+    Returns:
+        (格式标记, dumps, loads)
+    """
+    if format in ("auto", "msgpack"):
+        try:
+            import msgpack
+            return b"m", msgpack.packb, lambda data: msgpack.unpackb(data, strict_map_key=False)
+        except ImportError:
+            if format == "msgpack":
+                raise ImportError("msgpack 快照需要安装 msgpack: pip install topstack-sdk[msgpack]")
+    elif format != "json":
+        raise ValueError(f"不支持的快照格式: {format}")
+    codec = get_codec()
+    return b"j", codec.dumps, codec.loads
+
+
+class DeviceCatalog:
+    """
+    设备目录
+
+    只读的内存索引，查询结果按加载顺序返回。设备信息变化后需要重新加载。
+    """
+
+    def __init__(
+        self,
+        devices: Iterable[DeviceItem],
+        type_points: Optional[Dict[str, List[PointItem]]] = None,
+        device_points: Optional[Dict[str, List[PointItem]]] = None,
+        created_at: Optional[float] = None
+    ):
+        """
+        Args:
+            devices: 设备列表
+            type_points: 设备模型ID -> 测点定义
+            device_points: 设备ID -> 测点，优先于设备模型的测点定义
+            created_at: 数据加载时间（Unix 秒），默认为当前时间
+        """
+        self.devices: List[DeviceItem] = list(devices)
+        self.type_points = type_points or {}
+        self.device_points = device_points or {}
+        self.created_at = created_at if created_at is not None else time.time()
+
+        self._by_id: Dict[str, int] = {}
+        self._indexes: Dict[str, Dict[str, List[int]]] = {
+            "gateway": {}, "type": {}, "group": {}, "channel": {}
+        }
+        names = []
+        for position, device in enumerate(self.devices):
+            self._by_id[device.id] = position
+            for index, value in (
+                ("gateway", device.gateway_id),
+                ("type", device.type_id),
+                ("group", device.group_id),
+                ("channel", device.data_channel_id),
+                ("channel", device.custom_channel_id),
+            ):
+                if value is not None:
+                    self._indexes[index].setdefault(value, []).append(position)
+            names.append((device.name or "", position))
+        names.sort()
+        self._names = [name for name, _ in names]
+        self._name_positions = [position for _, position in names]
+        self._point_maps: Dict[str, Dict[str, PointItem]] = {}
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    def __iter__(self) -> Iterator[DeviceItem]:
+        return iter(self.devices)
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._by_id
+
+    @property
+    def age(self) -> float:
+        """距离数据加载的秒数"""
+        return time.time() - self.created_at
+
+    def get(self, device_id: str) -> Optional[DeviceItem]:
+        """按ID获取设备"""
+        position = self._by_id.get(device_id)
+        return self.devices[position] if position is not None else None
+
+    def find(
+        self,
+        gateway_id: Optional[str] = None,
+        type_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        channel_id: Optional[str] = None,
+        name_prefix: Optional[str] = None
+    ) -> List[DeviceItem]:
+        """
+        按条件查询设备，多个条件同时满足
+
+        Args:
+            gateway_id: 所属网关
+            type_id: 所属设备模型
+            group_id: 所属设备分组
+            channel_id: 所属数据通道或自定义通道
+            name_prefix: 名称前缀
+
+        Returns:
+            List[DeviceItem]: 符合条件的设备，按加载顺序排列
+        """
+        candidates: List[Sequence[int]] = []
+        for index, value in (
+            ("gateway", gateway_id), ("type", type_id), ("group", group_id), ("channel", channel_id)
+        ):
+            if value is not None:
+                candidates.append(self._indexes[index].get(value, ()))
+        if name_prefix is not None:
+            start = bisect_left(self._names, name_prefix)
+            end = start
+            while end < len(self._names) and self._names[end].startswith(name_prefix):
+                end += 1
+            candidates.append(sorted(self._name_positions[start:end]))
+
+        if not candidates:
+            return list(self.devices)
+        candidates.sort(key=len)
+        positions = candidates[0]
+        for other in candidates[1:]:
+            if not positions:
+                break
+            allowed = set(other)
+            positions = [position for position in positions if position in allowed]
+        return [self.devices[position] for position in positions]
+
+    def points(self, device_id: str) -> List[PointItem]:
+        """
+        获取设备的测点
+
+        优先返回单独加载的设备测点，否则返回设备模型的测点定义。
+        """
+        if device_id in self.device_points:
+            return self.device_points[device_id]
+        device = self.get(device_id)
+        if device is None or device.type_id is None:
+            return []
+        return self.type_points.get(device.type_id, [])
+
+    def point(self, device_id: str, point_id: str) -> Optional[PointItem]:
+        """获取设备的单个测点"""
+        points = self._point_maps.get(device_id)
+        if points is None:
+            points = self._point_maps[device_id] = {point.point_id: point for point in self.points(device_id)}
+        return points.get(point_id)
+
+    @classmethod
+    def load(
+        cls,
+        device_api: DeviceApi,
+        max_workers: int = 4,
+        with_device_points: bool = False,
+        **filters: Any
+    ) -> "DeviceCatalog":
+        """
+        从平台加载设备目录
+
+        Args:
+            device_api: 设备管理 API
+            max_workers: 最大并发请求数
+            with_device_points: 是否逐个设备加载测点，默认只加载设备模型的测点定义
+            **filters: 设备查询条件，含义同 DeviceApi.query
+
+        Returns:
+            DeviceCatalog: 设备目录
+        """
+        created_at = time.time()
+        devices = list(device_api.iter_devices(max_workers=max_workers, ordered=True, **filters))
+        type_ids = sorted({device.type_id for device in devices if device.type_id})
+        device_points = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            type_points = dict(zip(type_ids, executor.map(device_api.query_type_points, type_ids)))
+            if with_device_points:
+                def fetch_points(device_id: str) -> List[PointItem]:
+                    return list(device_api.iter_points(device_id=device_id, max_workers=1))
+
+                device_ids = [device.id for device in devices]
+                device_points = dict(zip(device_ids, executor.map(fetch_points, device_ids)))
+        return cls(devices, type_points, device_points, created_at)
+
+    @classmethod
+    async def load_async(
+        cls,
+        device_api: AsyncDeviceApi,
+        max_concurrency: int = 4,
+        with_device_points: bool = False,
+        **filters: Any
+    ) -> "DeviceCatalog":
+        """
+        从平台加载设备目录
+
+        参数含义同 load，max_concurrency 为最大并发请求数。
+        """
+        created_at = time.time()
+        devices = [
+            device async for device in
+            device_api.iter_devices(max_concurrency=max_concurrency, ordered=True, **filters)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+
+        async def fetch_points(device_id: str) -> List[PointItem]:
+            return [point async for point in device_api.iter_points(device_id=device_id, max_concurrency=1)]
+
+        type_ids = sorted({device.type_id for device in devices if device.type_id})
+        type_points = dict(zip(type_ids, await asyncio.gather(*[
+            limited(device_api.query_type_points(type_id)) for type_id in type_ids
+        ])))
+        device_points = {}
+        if with_device_points:
+            device_ids = [device.id for device in devices]
+            device_points = dict(zip(device_ids, await asyncio.gather(*[
+                limited(fetch_points(device_id)) for device_id in device_ids
+            ])))
+        return cls(devices, type_points, device_points, created_at)
+
+    def save(self, path: str, format: str = "auto") -> None:
+        """
+        保存快照
+
+        先写临时文件再替换，写入过程中断不会破坏已有快照。
+
+        Args:
+            path: 文件路径
+            format: auto（已安装 msgpack 时使用 msgpack，否则使用 JSON）、msgpack 或 json
+        """
+        marker, dumps, _ = _serializer(format)
+        snapshot = {
+            "created_at": self.created_at,
+            "devices": _dump_rows(self.devices, DeviceItem),
+            "type_points": {k: _dump_rows(v, PointItem) for k, v in self.type_points.items()},
+            "device_points": {k: _dump_rows(v, PointItem) for k, v in self.device_points.items()},
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_MAGIC + bytes([_VERSION]) + marker)
+            f.write(dumps(snapshot))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def open(cls, path: str) -> "DeviceCatalog":
+        """
+        从快照加载设备目录
+
+        Raises:
+            ValueError: 文件不是设备目录快照或版本不兼容时抛出
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        header = len(_MAGIC) + 2
+        if len(data) < header or data[:len(_MAGIC)] != _MAGIC or data[len(_MAGIC)] != _VERSION:
+            raise ValueError(f"不是有效的设备目录快照: {path}")
+        _, _, loads = _serializer("msgpack" if data[header - 1:header] == b"m" else "json")
+        snapshot = loads(data[header:])
+        return cls(
+            _load_rows(snapshot["devices"], DeviceItem),
+            {k: _load_rows(v, PointItem) for k, v in snapshot["type_points"].items()},
+            {k: _load_rows(v, PointItem) for k, v in snapshot["device_points"].items()},
+            snapshot["created_at"]
+        )
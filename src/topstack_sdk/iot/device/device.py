@@ -2,25 +2,182 @@
 设备管理 API 实现
 """
 
-from typing import List, Optional
-from ...client import TopStackClient, Response
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from ...client import TopStackClient, AsyncTopStackClient, Response
+from .cache import CacheKey, DeviceMetadataCache, MISSING
 from .models import (
-    QueryRequest, QueryResponse,
-    PropsQueryResponse, PointQueryRequest, PointQueryResponse
+    QueryRequest, QueryResponse, DeviceItem,
+    PropsQueryResponse, PointQueryRequest, PointQueryResponse, PointItem,
+    TypePointsQueryResponse
 )
 
+# 遍历全部设备/测点时的默认每页数量
+ITER_PAGE_SIZE = 500
+
+
+def _props_list(data: Any) -> List[Any]:
+    """处理 RootModel 响应"""
+    if data is not None:
+        return data.root if hasattr(data, 'root') else data
+    return []
+
+
+def _page_count(first: Any, page_size: int) -> int:
+    """
+    根据第一页计算总页数
+
+    服务端可能限制每页数量，第一页的条数少于请求的 page_size 时按实际条数计算，
+    避免漏掉后面的页。
+    """
+    size = len(first.items)
+    if not size:
+        return 1
+    return -(-first.total // min(size, page_size))
+
+
+def _iter_pages(fetch: Callable[[int], Any], page_size: int, max_workers: int, ordered: bool) -> Iterator[Any]:
+    """
+    遍历分页查询结果
+
+    先请求第一页得到总数，其余页并发请求，同时最多保留 max_workers * 2 个未处理的页。
+
+    Args:
+        fetch: 按页码请求一页数据，返回带 total 和 items 的响应
+        page_size: 每页数量
+        max_workers: 最大并发请求数
+        ordered: 是否按页码顺序返回，为 False 时哪一页先完成先返回
+    """
+    first = fetch(1)
+    if first is None:
+        return
+    yield from first.items
+    pages = iter(range(2, _page_count(first, page_size) + 1))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    window = max_workers * 2
+    pending = deque()
+    try:
+        for page_num in pages:
+            pending.append(executor.submit(fetch, page_num))
+            if len(pending) >= window:
+                break
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+            for future in done:
+                page = future.result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append(executor.submit(fetch, next_page))
+                if page is not None:
+                    yield from page.items
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def _aiter_pages(
+    fetch: Callable[[int], Awaitable[Any]],
+    page_size: int,
+    max_concurrency: int,
+    ordered: bool
+) -> AsyncIterator[Any]:
+    """遍历分页查询结果，参数含义同 _iter_pages"""
+    first = await fetch(1)
+    if first is None:
+        return
+    for item in first.items:
+        yield item
+    pages = iter(range(2, _page_count(first, page_size) + 1))
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_page(page_num: int) -> Any:
+        async with semaphore:
+            return await fetch(page_num)
+
+    window = max_concurrency * 2
+    pending = deque()
+    try:
+        for page_num in pages:
+            pending.append(asyncio.ensure_future(fetch_page(page_num)))
+            if len(pending) >= window:
+                break
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                done = [task for task in pending if task in finished]
+                for task in done:
+                    pending.remove(task)
+            for task in done:
+                page = await task
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                if page is not None:
+                    for item in page.items:
+                        yield item
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _cache_lookup(
+    cache: Optional[DeviceMetadataCache],
+    method: str,
+    params: Dict[str, Any]
+) -> Tuple[Optional[CacheKey], Any]:
+    """
+    查询缓存
+
+    Returns:
+        (缓存键, 缓存值)，未启用缓存时缓存键为 None，未命中时缓存值为 MISSING
+    """
+    if cache is None or not cache.enabled(method):
+        return None, MISSING
+    key = cache.make_key(method, params)
+    return key, cache.get(key)
+
+
+def _cached_device_ids(key: CacheKey, value: Any) -> Iterable[str]:
+    """查询结果涉及的设备"""
+    if key[0] == "query":
+        return [item.id for item in value.items] if value is not None else []
+    device_id = dict(key[1]).get("deviceID")
+    return [device_id] if device_id is not None else []
+
+
+def _cache_store(cache: Optional[DeviceMetadataCache], key: Optional[CacheKey], value: Any) -> None:
+    """写入缓存"""
+    if key is not None:
+        cache.put(key, value, _cached_device_ids(key, value))
+
+
 class DeviceApi:
     """设备管理 API 客户端"""
-    
-    def __init__(self, client: TopStackClient):
+
+    def __init__(self, client: TopStackClient, cache: Optional[DeviceMetadataCache] = None):
         """
         初始化设备管理 API
-        
+
         Args:
             client: TopStack 客户端实例
+            cache: 元数据缓存，为空时每次都请求平台
         """
         self.client = client
-    
+        self.cache = cache
+
     def query(
         self,
         search: Optional[str] = None,
@@ -38,7 +195,7 @@ class DeviceApi:
     ) -> QueryResponse:
         """
         查询设备
-        
+
         Args:
             search: 名称或标识关键字
             gateway_id: 所属网关
@@ -52,7 +209,7 @@ class DeviceApi:
             group_id: 所属设备分组
             page_num: 当前页
             page_size: 每页数量
-            
+
         Returns:
             QueryResponse: 设备查询结果
         """
@@ -70,33 +227,42 @@ class DeviceApi:
             page_num=page_num,
             page_size=page_size
         )
-        
+
+        params = request.dict(by_alias=True, exclude_none=True)
+        key, cached = _cache_lookup(self.cache, "query", params)
+        if cached is not MISSING:
+            return cached
+
         response = self.client.get(
             "/iot/open_api/v1/device/query",
-            request.dict(by_alias=True, exclude_none=True),
+            params,
             QueryResponse
         )
+        _cache_store(self.cache, key, response.data)
         return response.data
-    
+
     def query_props(self, device_id: str) -> List[dict]:
         """
         查询设备属性
-        
+
         Args:
             device_id: 设备ID
-            
+
         Returns:
             List[dict]: 设备属性列表
         """
+        key, cached = _cache_lookup(self.cache, "query_props", {"deviceID": device_id})
+        if cached is not MISSING:
+            return cached
+
         response = self.client.get(
             f"/iot/open_api/v1/device/{device_id}/props",
             response_model=PropsQueryResponse
         )
-        # 处理 RootModel 响应
-        if response.data is not None:
-            return response.data.root if hasattr(response.data, 'root') else response.data
-        return []
-    
+        props = _props_list(response.data)
+        _cache_store(self.cache, key, props)
+        return props
+
     def query_points(
         self,
         search: Optional[str] = None,
@@ -108,7 +274,7 @@ class DeviceApi:
     ) -> PointQueryResponse:
         """
         查询设备测点
-        
+
         Args:
             search: 搜索关键字
             device_id: 设备ID
@@ -116,7 +282,7 @@ class DeviceApi:
             order: 排序方式
             page_num: 当前页
             page_size: 每页数量
-            
+
         Returns:
             PointQueryResponse: 测点查询结果
         """
@@ -128,10 +294,336 @@ class DeviceApi:
             page_num=page_num,
             page_size=page_size
         )
-        
+
+        params = request.dict(by_alias=True, exclude_none=True)
+        key, cached = _cache_lookup(self.cache, "query_points", params)
+        if cached is not MISSING:
+            return cached
+
         response = self.client.get(
             "/iot/open_api/v1/device_point/query",
-            request.dict(by_alias=True, exclude_none=True),
+            params,
             PointQueryResponse
         )
-        return response.data 
\ No newline at end of file
+        _cache_store(self.cache, key, response.data)
+        return response.data
+
+    def query_type_points(self, type_id: str) -> List[PointItem]:
+        """
+        查询设备模型的测点
+
+        Args:
+            type_id: 设备模型ID
+
+        Returns:
+            List[PointItem]: 测点列表
+        """
+        params = {"deviceTypeID": type_id}
+        key, cached = _cache_lookup(self.cache, "query_type_points", params)
+        if cached is not MISSING:
+            return cached
+
+        response = self.client.get(
+            "/iot/open_api/v1/device_type_point",
+            params,
+            TypePointsQueryResponse
+        )
+        points = _props_list(response.data)
+        _cache_store(self.cache, key, points)
+        return points
+
+    def iter_devices(
+        self,
+        search: Optional[str] = None,
+        gateway_id: Optional[str] = None,
+        type_id: Optional[str] = None,
+        connect_mode: Optional[str] = None,
+        data_channel_id: Optional[str] = None,
+        custom_channel_id: Optional[str] = None,
+        state: Optional[str] = None,
+        user_group_id: Optional[str] = None,
+        empty: Optional[bool] = None,
+        group_id: Optional[str] = None,
+        page_size: int = ITER_PAGE_SIZE,
+        max_workers: int = 4,
+        ordered: bool = False
+    ) -> Iterator[DeviceItem]:
+        """
+        遍历全部符合条件的设备
+
+        第一页返回总数后，其余页并发请求，每页完成后立即返回其中的设备。
+        遍历期间设备增删可能导致个别设备重复或遗漏。
+
+        Args:
+            page_size: 每页数量
+            max_workers: 最大并发请求数
+            ordered: 是否按查询顺序返回，为 False 时先完成的页先返回
+            其余参数含义同 query
+
+        Yields:
+            DeviceItem: 设备
+        """
+        def fetch(page_num: int) -> QueryResponse:
+            return self.query(
+                search=search,
+                gateway_id=gateway_id,
+                type_id=type_id,
+                connect_mode=connect_mode,
+                data_channel_id=data_channel_id,
+                custom_channel_id=custom_channel_id,
+                state=state,
+                user_group_id=user_group_id,
+                empty=empty,
+                group_id=group_id,
+                page_num=page_num,
+                page_size=page_size
+            )
+
+        return _iter_pages(fetch, page_size, max_workers, ordered)
+
+    def iter_points(
+        self,
+        search: Optional[str] = None,
+        device_id: Optional[str] = None,
+        type: Optional[str] = None,
+        order: Optional[str] = None,
+        page_size: int = ITER_PAGE_SIZE,
+        max_workers: int = 4,
+        ordered: bool = False
+    ) -> Iterator[PointItem]:
+        """
+        遍历全部符合条件的测点
+
+        分页方式同 iter_devices。
+
+        Args:
+            page_size: 每页数量
+            max_workers: 最大并发请求数
+            ordered: 是否按查询顺序返回，为 False 时先完成的页先返回
+            其余参数含义同 query_points
+
+        Yields:
+            PointItem: 测点
+        """
+        def fetch(page_num: int) -> PointQueryResponse:
+            return self.query_points(search, device_id, type, order, page_num, page_size)
+
+        return _iter_pages(fetch, page_size, max_workers, ordered)
+
+
+class AsyncDeviceApi:
+    """设备管理 API 异步客户端"""
+
+    def __init__(self, client: AsyncTopStackClient, cache: Optional[DeviceMetadataCache] = None):
+        """
+        初始化设备管理 API
+
+        Args:
+            client: TopStack 异步客户端实例
+            cache: 元数据缓存，为空时每次都请求平台
+        """
+        self.client = client
+        self.cache = cache
+
+    async def query(
+        self,
+        search: Optional[str] = None,
+        gateway_id: Optional[str] = None,
+        type_id: Optional[str] = None,
+        connect_mode: Optional[str] = None,
+        data_channel_id: Optional[str] = None,
+        custom_channel_id: Optional[str] = None,
+        state: Optional[str] = None,
+        user_group_id: Optional[str] = None,
+        empty: Optional[bool] = None,
+        group_id: Optional[str] = None,
+        page_num: int = 1,
+        page_size: int = 10
+    ) -> QueryResponse:
+        """
+        查询设备
+
+        参数含义同 DeviceApi.query。
+
+        Returns:
+            QueryResponse: 设备查询结果
+        """
+        request = QueryRequest(
+            search=search,
+            gateway_id=gateway_id,
+            type_id=type_id,
+            connect_mode=connect_mode,
+            data_channel_id=data_channel_id,
+            custom_channel_id=custom_channel_id,
+            state=state,
+            user_group_id=user_group_id,
+            empty=empty,
+            group_id=group_id,
+            page_num=page_num,
+            page_size=page_size
+        )
+
+        params = request.dict(by_alias=True, exclude_none=True)
+        key, cached = _cache_lookup(self.cache, "query", params)
+        if cached is not MISSING:
+            return cached
+
+        response = await self.client.get(
+            "/iot/open_api/v1/device/query",
+            params,
+            QueryResponse
+        )
+        _cache_store(self.cache, key, response.data)
+        return response.data
+
+    async def query_props(self, device_id: str) -> List[dict]:
+        """
+        查询设备属性
+
+        Args:
+            device_id: 设备ID
+
+        Returns:
+            List[dict]: 设备属性列表
+        """
+        key, cached = _cache_lookup(self.cache, "query_props", {"deviceID": device_id})
+        if cached is not MISSING:
+            return cached
+
+        response = await self.client.get(
+            f"/iot/open_api/v1/device/{device_id}/props",
+            response_model=PropsQueryResponse
+        )
+        props = _props_list(response.data)
+        _cache_store(self.cache, key, props)
+        return props
+
+    async def query_points(
+        self,
+        search: Optional[str] = None,
+        device_id: Optional[str] = None,
+        type: Optional[str] = None,
+        order: Optional[str] = None,
+        page_num: int = 1,
+        page_size: int = 10
+    ) -> PointQueryResponse:
+        """
+        查询设备测点
+
+        参数含义同 DeviceApi.query_points。
+
+        Returns:
+            PointQueryResponse: 测点查询结果
+        """
+        request = PointQueryRequest(
+            search=search,
+            device_id=device_id,
+            type=type,
+            order=order,
+            page_num=page_num,
+            page_size=page_size
+        )
+
+        params = request.dict(by_alias=True, exclude_none=True)
+        key, cached = _cache_lookup(self.cache, "query_points", params)
+        if cached is not MISSING:
+            return cached
+
+        response = await self.client.get(
+            "/iot/open_api/v1/device_point/query",
+            params,
+            PointQueryResponse
+        )
+        _cache_store(self.cache, key, response.data)
+        return response.data
+
+    async def query_type_points(self, type_id: str) -> List[PointItem]:
+        """
+        查询设备模型的测点
+
+        Args:
+            type_id: 设备模型ID
+
+        Returns:
+            List[PointItem]: 测点列表
+        """
+        params = {"deviceTypeID": type_id}
+        key, cached = _cache_lookup(self.cache, "query_type_points", params)
+        if cached is not MISSING:
+            return cached
+
+        response = await self.client.get(
+            "/iot/open_api/v1/device_type_point",
+            params,
+            TypePointsQueryResponse
+        )
+        points = _props_list(response.data)
+        _cache_store(self.cache, key, points)
+        return points
+
+    async def iter_devices(
+        self,
+        search: Optional[str] = None,
+        gateway_id: Optional[str] = None,
+        type_id: Optional[str] = None,
+        connect_mode: Optional[str] = None,
+        data_channel_id: Optional[str] = None,
+        custom_channel_id: Optional[str] = None,
+        state: Optional[str] = None,
+        user_group_id: Optional[str] = None,
+        empty: Optional[bool] = None,
+        group_id: Optional[str] = None,
+        page_size: int = ITER_PAGE_SIZE,
+        max_concurrency: int = 4,
+        ordered: bool = False
+    ) -> AsyncIterator[DeviceItem]:
+        """
+        遍历全部符合条件的设备
+
+        参数含义同 DeviceApi.iter_devices，max_concurrency 为最大并发请求数。
+
+        Yields:
+            DeviceItem: 设备
+        """
+        def fetch(page_num: int) -> Awaitable[QueryResponse]:
+            return self.query(
+                search=search,
+                gateway_id=gateway_id,
+                type_id=type_id,
+                connect_mode=connect_mode,
+                data_channel_id=data_channel_id,
+                custom_channel_id=custom_channel_id,
+                state=state,
+                user_group_id=user_group_id,
+                empty=empty,
+                group_id=group_id,
+                page_num=page_num,
+                page_size=page_size
+            )
+
+        async for device in _aiter_pages(fetch, page_size, max_concurrency, ordered):
+            yield device
+
+    async def iter_points(
+        self,
+        search: Optional[str] = None,
+        device_id: Optional[str] = None,
+        type: Optional[str] = None,
+        order: Optional[str] = None,
+        page_size: int = ITER_PAGE_SIZE,
+        max_concurrency: int = 4,
+        ordered: bool = False
+    ) -> AsyncIterator[PointItem]:
+        """
+        遍历全部符合条件的测点
+
+        参数含义同 DeviceApi.iter_points，max_concurrency 为最大并发请求数。
+
+        Yields:
+            PointItem: 测点
+        """
+        def fetch(page_num: int) -> Awaitable[PointQueryResponse]:
+            return self.query_points(search, device_id, type, order, page_num, page_size)
+
+        async for point in _aiter_pages(fetch, page_size, max_concurrency, ordered):
+            yield point
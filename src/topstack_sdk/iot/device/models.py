@@ -5,9 +5,12 @@
 from typing import List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel, Field, RootModel
+from ...timestamps import UtcDatetime
 
 class QueryRequest(BaseModel):
     """设备查询请求"""
+    model_config = {"defer_build": True, "populate_by_name": True}
+
     search: Optional[str] = Field(None, description="名称或标识关键字")
     gateway_id: Optional[str] = Field(None, alias="gatewayID", description="所属网关")
     type_id: Optional[str] = Field(None, alias="typeID", description="所属模型")
@@ -23,8 +26,10 @@ class QueryRequest(BaseModel):
 
 class DeviceItem(BaseModel):
     """设备项"""
+    model_config = {"defer_build": True}
+
     id: str = Field(..., description="设备ID")
-    code: str = Field(..., description="设备代码")
+    code: Optional[str] = Field(None, description="设备代码")
     name: str = Field(..., description="设备名称")
     description: Optional[str] = Field(None, description="设备描述")
     gateway_id: Optional[str] = Field(None, alias="gatewayID", description="网关ID")
@@ -36,7 +41,7 @@ class DeviceItem(BaseModel):
     template: bool = Field(False, description="是否为模板")
     address: Optional[str] = Field(None, description="地址")
     idle_timeout: Optional[int] = Field(None, alias="idleTimeout", description="空闲超时")
-    connect_mode: str = Field(..., alias="connectMode", description="连接模式")
+    connect_mode: Optional[str] = Field(None, alias="connectMode", description="连接模式")
     user_group_id: Optional[str] = Field(None, alias="userGroupID", description="用户组ID")
     user_group_name: Optional[str] = Field(None, alias="userGroupName", description="用户组名称")
     data_channel_id: Optional[str] = Field(None, alias="dataChannelID", description="数据通道ID")
@@ -44,9 +49,9 @@ class DeviceItem(BaseModel):
     custom_channel_id: Optional[str] = Field(None, alias="customChannelID", description="自定义通道ID")
     custom_channel_name: Optional[str] = Field(None, alias="customChannelName", description="自定义通道名称")
     state: int = Field(..., description="状态：0表示在线，1表示离线")
-    state_change_time: Optional[datetime] = Field(None, alias="stateChangeTime", description="状态变更时间")
-    created_at: Optional[datetime] = Field(None, alias="createdAt", description="创建时间")
-    updated_at: Optional[datetime] = Field(None, alias="updatedAt", description="更新时间")
+    state_change_time: Optional[UtcDatetime] = Field(None, alias="stateChangeTime", description="状态变更时间")
+    created_at: Optional[UtcDatetime] = Field(None, alias="createdAt", description="创建时间")
+    updated_at: Optional[UtcDatetime] = Field(None, alias="updatedAt", description="更新时间")
     has_props: bool = Field(False, alias="hasProps", description="是否有属性")
     manual_gi: bool = Field(False, alias="manualGI", description="手动地理信息")
     longitude: Optional[float] = Field(None, description="经度")
@@ -56,11 +61,15 @@ class DeviceItem(BaseModel):
 
 class QueryResponse(BaseModel):
     """设备查询响应"""
+    model_config = {"defer_build": True}
+
     total: int = Field(..., description="总数")
     items: List[DeviceItem] = Field(..., description="设备列表")
 
 class PropertyItem(BaseModel):
     """属性项"""
+    model_config = {"defer_build": True}
+
     property_id: str = Field(..., alias="id", description="属性ID")
     property_type: str = Field(..., alias="type", description="属性类型")
     name: str = Field(..., description="属性名称")
@@ -69,10 +78,12 @@ class PropertyItem(BaseModel):
 
 class PropsQueryResponse(RootModel[List[PropertyItem]]):
     """属性查询响应"""
-    model_config = {"title": "PropsQueryResponse", "description": "属性列表"}
+    model_config = {"defer_build": True, "title": "PropsQueryResponse", "description": "属性列表"}
 
 class PointQueryRequest(BaseModel):
     """测点查询请求"""
+    model_config = {"defer_build": True, "populate_by_name": True}
+
     search: Optional[str] = Field(None, description="搜索关键字")
     device_id: Optional[str] = Field(None, alias="deviceID", description="设备ID")
     type: Optional[str] = Field(None, description="测点类型")
@@ -82,6 +93,8 @@ class PointQueryRequest(BaseModel):
 
 class PointItem(BaseModel):
     """测点项"""
+    model_config = {"defer_build": True}
+
     point_id: str = Field(..., alias="pointID", description="测点ID")
     name: str = Field(..., description="测点名称")
     type: str = Field(..., description="测点类型：int double string bool array float time")
@@ -97,5 +110,11 @@ class PointItem(BaseModel):
 
 class PointQueryResponse(BaseModel):
     """测点查询响应"""
+    model_config = {"defer_build": True}
+
     total: int = Field(..., description="总数")
-    items: List[PointItem] = Field(..., description="测点列表") 
\ No newline at end of file
+    items: List[PointItem] = Field(..., description="测点列表")
+
+class TypePointsQueryResponse(RootModel[List[PointItem]]):
+    """设备模型测点查询响应"""
+    model_config = {"defer_build": True, "title": "TypePointsQueryResponse", "description": "测点列表"} 
\ No newline at end of file
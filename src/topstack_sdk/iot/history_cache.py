@@ -0,0 +1,277 @@
+"""
+IoT 历史数据本地缓存
+
+基于 SQLite 持久化历史数据，并记录每个序列（设备/测点/聚合方式/间隔/填充方式）
+已覆盖的时间范围。查询时只向服务端请求缺失的时间段，其余部分从本地读取。
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import HistoryResponse, HistoryResult, HistoryValue
+from ..timestamps import to_datetime
+from .windows import parse_interval
+
+# 查询任务：(测点分组, 窗口开始, 窗口结束)
+HistoryTask = Tuple[List[Dict[str, str]], datetime, datetime]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    series TEXT NOT NULL,
+    t INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (series, t)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    series TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_series ON coverage (series, start);
+"""
+
+_SEP = "\x1f"
+
+
+def _to_ms(dt: datetime) -> int:
+    # 无时区时按 UTC 处理，与请求模型一致
+    return int(round(to_datetime(dt).timestamp() * 1000))
+
+
+def _from_ms(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+class HistoryCache:
+    """
+    历史数据本地缓存
+
+    时间范围以毫秒为单位、两端闭合。距当前时间不足 settle_seconds 的数据可能仍在变化，
+    只返回不标记为已覆盖，下次查询会重新请求。
+    """
+
+    def __init__(self, path: str = ":memory:", settle_seconds: float = 60):
+        """
+        初始化历史数据缓存
+
+        Args:
+            path: SQLite 数据库文件路径，默认仅在内存中缓存
+            settle_seconds: 距当前时间多少秒以内的数据不视为已稳定
+        """
+        self.path = path
+        self.settle_seconds = settle_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def series_key(device_id: str, point_id: str, aggregation: str, interval: str, fill: str) -> str:
+        """序列缓存键"""
+        return _SEP.join((device_id, point_id, aggregation, interval, fill))
+
+    def _horizon_ms(self) -> int:
+        return int((time.time() - self.settle_seconds) * 1000)
+
+    def missing_ranges(
+        self,
+        device_id: str,
+        point_id: str,
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null"
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        计算序列在 start..end 内尚未缓存的时间段
+
+        缺失时间段向外对齐到聚合间隔，保证请求到的聚合桶是完整的。
+
+        Returns:
+            [(开始时间, 结束时间)] 列表
+        """
+        series = self.series_key(device_id, point_id, aggregation, interval, fill)
+        return [
+            (_from_ms(s), _from_ms(e))
+            for s, e in self._gaps(series, _to_ms(start), _to_ms(end), interval)
+        ]
+
+    def _gaps(self, series: str, start: int, end: int, interval: str) -> List[Tuple[int, int]]:
+        with self._lock:
+            covered = self._conn.execute(
+                "SELECT start, end FROM coverage WHERE series = ? AND end >= ? AND start <= ? ORDER BY start",
+                (series, start, end)
+            ).fetchall()
+
+        gaps = []
+        cursor = start
+        for s, e in covered:
+            if s > cursor:
+                gaps.append((cursor, s - 1))
+            cursor = max(cursor, e + 1)
+        if cursor <= end:
+            gaps.append((cursor, end))
+
+        step = parse_interval(interval)
+        step_ms = int(step.total_seconds() * 1000) if step else 0
+        if step_ms >= 1000:
+            gaps = [(s - s % step_ms, (e // step_ms + 1) * step_ms - 1) for s, e in gaps]
+        return gaps
+
+    def plan(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null"
+    ) -> List[HistoryTask]:
+        """
+        生成补齐缓存所需的查询任务
+
+        缺失时间段相同的测点合并到同一个任务中。
+
+        Returns:
+            [(测点分组, 开始时间, 结束时间)] 列表
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        groups: Dict[Tuple[Tuple[int, int], ...], List[Dict[str, str]]] = {}
+        for point in points:
+            series = self.series_key(point["device_id"], point["point_id"], aggregation, interval, fill)
+            gaps = tuple(self._gaps(series, start_ms, end_ms, interval))
+            if gaps:
+                groups.setdefault(gaps, []).append(point)
+
+        return [
+            (group, _from_ms(s), _from_ms(e))
+            for gaps, group in groups.items()
+            for s, e in gaps
+        ]
+
+    def store(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        pages: Iterable[HistoryResponse],
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null"
+    ) -> None:
+        """
+        写入一个查询任务的结果，并将 start..end 标记为已覆盖
+
+        start..end 内的数据全部写入，以便 load 返回；距当前时间不足 settle_seconds
+        的部分不标记为已覆盖，下次查询时重新请求并覆盖。
+
+        Args:
+            points: 任务包含的测点（没有返回数据的测点同样标记为已覆盖）
+            start: 任务开始时间
+            end: 任务结束时间
+            pages: 任务返回的全部分页
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        covered_end = min(end_ms, self._horizon_ms())
+
+        rows = []
+        for page in pages:
+            if page is None:
+                continue
+            for result in page.results:
+                series = self.series_key(result.device_id, result.point_id, aggregation, interval, fill)
+                for value in result.values:
+                    t = _to_ms(value.time)
+                    if start_ms <= t <= end_ms:
+                        rows.append((series, t, value.model_dump_json(exclude_none=True)))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO samples (series, t, data) VALUES (?, ?, ?)", rows
+            )
+            if covered_end < start_ms:
+                return
+            for point in points:
+                series = self.series_key(point["device_id"], point["point_id"], aggregation, interval, fill)
+                self._add_coverage(series, start_ms, covered_end)
+
+    def _add_coverage(self, series: str, start: int, end: int) -> None:
+        """合并重叠或相邻的已覆盖时间段，调用方持有锁和事务"""
+        overlapping = self._conn.execute(
+            "SELECT start, end FROM coverage WHERE series = ? AND end >= ? AND start <= ?",
+            (series, start - 1, end + 1)
+        ).fetchall()
+        for s, e in overlapping:
+            start, end = min(start, s), max(end, e)
+        self._conn.execute(
+            "DELETE FROM coverage WHERE series = ? AND end >= ? AND start <= ?",
+            (series, start - 1, end + 1)
+        )
+        self._conn.execute(
+            "INSERT INTO coverage (series, start, end) VALUES (?, ?, ?)", (series, start, end)
+        )
+
+    def load(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        order: str = "asc"
+    ) -> HistoryResponse:
+        """
+        从缓存读取 start..end 内的历史数据
+
+        Returns:
+            HistoryResponse: 每个测点一个结果，按 order 排序
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        direction = "DESC" if order == "desc" else "ASC"
+        results = []
+        with self._lock:
+            for point in points:
+                series = self.series_key(point["device_id"], point["point_id"], aggregation, interval, fill)
+                rows = self._conn.execute(
+                    f"SELECT data FROM samples WHERE series = ? AND t BETWEEN ? AND ? ORDER BY t {direction}",
+                    (series, start_ms, end_ms)
+                ).fetchall()
+                results.append(HistoryResult.model_construct(
+                    device_id=point["device_id"],
+                    point_id=point["point_id"],
+                    values=[HistoryValue.model_validate_json(data) for (data,) in rows]
+                ))
+        return HistoryResponse.model_construct(results=results)
+
+    def invalidate(self, device_id: Optional[str] = None, point_id: Optional[str] = None) -> None:
+        """
+        删除缓存数据
+
+        Args:
+            device_id: 设备ID，为空时删除全部
+            point_id: 测点ID，为空时删除该设备的全部测点
+        """
+        if device_id is None:
+            prefix = ""
+        elif point_id is None:
+            prefix = device_id + _SEP
+        else:
+            prefix = device_id + _SEP + point_id + _SEP
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock, self._conn:
+            for table in ("samples", "coverage"):
+                self._conn.execute(f"DELETE FROM {table} WHERE series LIKE ? ESCAPE '\\'", (pattern,))
+
+    def clear(self) -> None:
+        """删除全部缓存数据"""
+        self.invalidate()
\ No newline at end of file
@@ -2,35 +2,344 @@
 IoT API 实现
 """
 
-from typing import List, Union, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
-from ..client import TopStackClient, Response
+from ..client import TopStackClient, AsyncTopStackClient, Response, TopStackError
+from ..batch import BatchError, chunked, run_chunks, run_chunks_async, merge_chunk_results
 from .models import (
     FindLastRequest, FindLastResponse,
     FindLastBatchRequest, FindLastBatchResponse,
-    SetValueRequest, HistoryRequest, HistoryResponse
+    SetValueRequest, SetValueResult, HistoryRequest, HistoryResponse, HistoryValue,
+    DeviceHistoryPoint, DeviceHistoryRequest
 )
+from .columnar import HistoryFrame
+from .windows import merge_results, split_range
+from .history_cache import HistoryCache
+
+# findLastBatch 单次请求允许的最大测点数
+FIND_LAST_BATCH_SIZE = 100
+
+# data/query 单次请求允许的最大返回条数
+HISTORY_PAGE_SIZE = 5000
+
+# batchSetValue 单次请求包含的默认最大测点数
+SET_VALUE_BATCH_SIZE = 100
+
+# 批量下发分片：[(输入位置, 测点写入)]
+SetValueChunk = List[Tuple[int, Dict[str, Any]]]
+
+
+def _find_last_batch_payload(points: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """构建批量实时值查询请求数据"""
+    return [
+        {"deviceID": point["device_id"], "pointID": point["point_id"]}
+        for point in points
+    ]
+
+
+def _as_list(data: Any) -> List[Any]:
+    """确保批量查询结果为列表格式"""
+    if isinstance(data, list):
+        return data
+    elif data is not None:
+        return [data]
+    return []
+
+
+def _history_request(
+    points: List[Dict[str, str]],
+    start: datetime,
+    end: datetime,
+    aggregation: str,
+    interval: str,
+    fill: str,
+    offset: int,
+    limit: int,
+    order: str
+) -> HistoryRequest:
+    """构建历史数据查询请求"""
+    # 构建测点列表
+    point_requests = []
+    for point in points:
+        point_requests.append(FindLastRequest(
+            device_id=point["device_id"],
+            point_id=point["point_id"]
+        ))
+
+    return HistoryRequest(
+        points=point_requests,
+        start=start,
+        end=end,
+        aggregation=aggregation,
+        interval=interval,
+        fill=fill,
+        offset=offset,
+        limit=limit,
+        order=order
+    )
+
+
+def _device_history_request(
+    device_id: str,
+    points: List[Union[str, Dict[str, Any]]],
+    start: datetime,
+    end: datetime,
+    aggregation: str,
+    interval: str,
+    offset: int,
+    limit: int
+) -> DeviceHistoryRequest:
+    """构建设备历史数据查询请求"""
+    point_requests = []
+    for point in points:
+        if isinstance(point, str):
+            point_requests.append(DeviceHistoryPoint(point_id=point))
+        else:
+            point_requests.append(DeviceHistoryPoint(
+                point_id=point["point_id"],
+                aggregations=point.get("aggregations")
+            ))
+
+    return DeviceHistoryRequest(
+        device_id=device_id,
+        points=point_requests,
+        start=start,
+        end=end,
+        aggregation=aggregation,
+        interval=interval,
+        offset=offset,
+        limit=limit
+    )
+
+
+def _history_frame(data: Any) -> HistoryFrame:
+    """将原始历史数据响应解码为列式结果"""
+    results = data.get("results") if isinstance(data, dict) else None
+    return HistoryFrame.from_results(results)
+
+
+def _unfinished_points(
+    points: List[Dict[str, str]],
+    page: Optional[HistoryResponse],
+    page_size: int
+) -> List[Dict[str, str]]:
+    """返回本页数据已满、可能还有下一页的测点"""
+    if page is None:
+        return []
+    full = {
+        (result.device_id, result.point_id)
+        for result in page.results
+        if len(result.values) >= page_size
+    }
+    return [p for p in points if (p["device_id"], p["point_id"]) in full]
+
+
+def _history_tasks(
+    points: List[Dict[str, str]],
+    start: datetime,
+    end: datetime,
+    interval: str,
+    shards: int,
+    point_group_size: Optional[int],
+    history_cache: Optional[HistoryCache] = None,
+    aggregation: str = "last",
+    fill: str = "null"
+) -> List[Tuple[List[Dict[str, str]], datetime, datetime]]:
+    """
+    按时间窗口与测点分组生成并行查询任务
+
+    启用缓存时只为缓存中缺失的时间段生成任务。
+    """
+    if history_cache is not None:
+        ranges = history_cache.plan(points, start, end, aggregation, interval, fill)
+    else:
+        ranges = [(points, start, end)]
+
+    tasks = []
+    for range_points, range_start, range_end in ranges:
+        groups = chunked(range_points, point_group_size) if point_group_size else [range_points]
+        for window_start, window_end in split_range(range_start, range_end, shards, interval):
+            for group in groups:
+                tasks.append((group, window_start, window_end))
+    return tasks
+
+
+def _stitch_history(
+    pages: List[Optional[List[HistoryResponse]]],
+    failures: List[Any],
+    order: str,
+    history_cache: Optional[HistoryCache] = None,
+    tasks: Optional[List[Tuple[List[Dict[str, str]], datetime, datetime]]] = None,
+    query: Optional[Tuple[Any, ...]] = None
+) -> HistoryResponse:
+    """
+    拼接各任务结果，部分任务失败时抛出 BatchError
+
+    启用缓存时先写入成功任务的结果，再从缓存读取完整范围。
+    """
+    if history_cache is not None:
+        points, start, end, aggregation, interval, fill = query
+        for task, task_pages in zip(tasks, pages):
+            if task_pages is not None:
+                group, window_start, window_end = task
+                history_cache.store(group, window_start, window_end, task_pages, aggregation, interval, fill)
+
+    if failures and len(pages) == 1:
+        raise failures[0].error
+
+    if history_cache is not None:
+        merged = history_cache.load(points, start, end, aggregation, interval, fill, order)
+    else:
+        merged = HistoryResponse.model_construct(
+            results=merge_results((page for task in pages if task for page in task), order)
+        )
+    if failures:
+        raise BatchError(
+            f"历史数据并行查询失败: {len(failures)}/{len(pages)} 个任务失败，首个错误: {failures[0].error}",
+            merged.results,
+            failures,
+            pages
+        )
+    return merged
+
+
+def _set_value_rounds(
+    values: List[Dict[str, Any]],
+    chunk_size: int,
+    coalesce: bool
+) -> Tuple[List[List[SetValueChunk]], Dict[int, int]]:
+    """
+    生成批量下发的分片
+
+    同一请求中每个测点只能出现一次，且只能包含同一网关或直连通道下的设备，因此先按写入顺序
+    分轮（不合并时同一测点的第 n 次写入放在第 n 轮），每轮再按 _set_value_group 分组、按
+    chunk_size 分片。
+
+    Returns:
+        (各轮分片, 被合并的输入位置到最终写入位置的映射)
+    """
+    latest: Dict[Tuple[str, str], int] = {}
+    merged: Dict[int, int] = {}
+    rounds: List[List[Tuple[int, Dict[str, Any]]]] = []
+    occurrences: Dict[Tuple[str, str], int] = {}
+    for index, item in enumerate(values):
+        key = (item["device_id"], item["point_id"])
+        if coalesce:
+            latest[key] = index
+            continue
+        n = occurrences.get(key, 0)
+        occurrences[key] = n + 1
+        if n == len(rounds):
+            rounds.append([])
+        rounds[n].append((index, item))
+
+    if coalesce:
+        kept = set(latest.values())
+        for index, item in enumerate(values):
+            if index not in kept:
+                merged[index] = latest[(item["device_id"], item["point_id"])]
+        rounds = [[(index, values[index]) for index in sorted(kept)]] if kept else []
+
+    chunks = []
+    for entries in rounds:
+        groups: Dict[Tuple[str, str], List[Tuple[int, Dict[str, Any]]]] = {}
+        for entry in entries:
+            groups.setdefault(_set_value_group(entry[1]), []).append(entry)
+        chunks.append([chunk for group in groups.values() for chunk in chunked(group, chunk_size)])
+    return chunks, merged
+
+
+def _set_value_group(item: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    批量下发的分组键
+
+    提供 gateway_id 或 channel_id 时按网关或直连通道分组；都没有提供时无法判断设备所属的
+    网关，按设备分组（一个设备只属于一个网关或通道），避免把不同网关的设备放进同一请求。
+    """
+    if item.get("gateway_id"):
+        return "gateway", item["gateway_id"]
+    if item.get("channel_id"):
+        return "channel", item["channel_id"]
+    return "device", item["device_id"]
+
+
+def _batch_set_value_payload(chunk: SetValueChunk) -> Dict[str, Dict[str, Any]]:
+    """构建批量下发请求数据：{设备ID: {测点ID: 值}}"""
+    payload: Dict[str, Dict[str, Any]] = {}
+    for _, item in chunk:
+        payload.setdefault(item["device_id"], {})[item["point_id"]] = item["value"]
+    return payload
+
+
+def _check_set_value(response: Response) -> None:
+    """检查批量下发响应，服务端在响应顶层返回 success=false 时抛出异常"""
+    if response.success is False:
+        raise TopStackError("批量下发失败: 服务端返回 success=false", response.status or 200, response)
+
+
+def _set_value_results(
+    values: List[Dict[str, Any]],
+    errors: Dict[int, Optional[BaseException]],
+    merged: Dict[int, int]
+) -> List[SetValueResult]:
+    """按输入顺序生成每个测点的下发结果"""
+    results = []
+    for index, item in enumerate(values):
+        target = merged.get(index, index)
+        error = errors.get(target)
+        results.append(SetValueResult(
+            device_id=item["device_id"],
+            point_id=item["point_id"],
+            value=item["value"],
+            success=error is None,
+            error=str(error) if error is not None else None,
+            coalesced=index in merged
+        ))
+    return results
+
+
+def _record_set_value_round(
+    chunks: List[SetValueChunk],
+    failures: List[Any],
+    errors: Dict[int, Optional[BaseException]]
+) -> None:
+    """记录一轮下发中失败分片包含的测点"""
+    for failure in failures:
+        for index, _ in chunks[failure.index]:
+            errors[index] = failure.error
+
+
+def _page_rows(page: HistoryResponse) -> Iterator[Tuple[str, str, HistoryValue]]:
+    """将一页历史数据展开为 (设备ID, 测点ID, 数据值) 行"""
+    for result in page.results:
+        for value in result.values:
+            yield result.device_id, result.point_id, value
+
 
 class IotApi:
     """IoT API 客户端"""
-    
-    def __init__(self, client: TopStackClient):
+
+    def __init__(self, client: TopStackClient, history_cache: Optional[HistoryCache] = None):
         """
         初始化 IoT API
-        
+
         Args:
             client: TopStack 客户端实例
+            history_cache: 历史数据本地缓存，启用后 fetch_history 只请求缺失的时间段
         """
         self.client = client
-    
+        self.history_cache = history_cache
+
     def find_last(self, device_id: str, point_id: str) -> FindLastResponse:
         """
         查询单测点实时值
-        
+
         Args:
             device_id: 设备ID
             point_id: 测点ID
-            
+
         Returns:
             FindLastResponse: 测点实时值
         """
@@ -41,42 +350,48 @@ class IotApi:
             FindLastResponse
         )
         return response.data
-    
-    def find_last_batch(self, points: List[Dict[str, str]]) -> List[FindLastResponse]:
+
+    def find_last_batch(
+        self,
+        points: List[Dict[str, str]],
+        chunk_size: int = FIND_LAST_BATCH_SIZE,
+        max_workers: int = 8
+    ) -> List[FindLastResponse]:
         """
         批量查询多测点实时值
-        
+
+        测点数超过 chunk_size 时自动分片，并通过连接池并发请求，结果按输入顺序合并。
+
         Args:
             points: 测点列表，每个元素包含 device_id 和 point_id
-            
+            chunk_size: 每个请求包含的最大测点数
+            max_workers: 最大并发请求数
+
         Returns:
             List[FindLastResponse]: 测点实时值列表
+
+        Raises:
+            BatchError: 部分分片失败时抛出，results 为成功分片拼接的结果（不含失败分片），
+                chunk_results 按分片对齐，失败分片为 None
         """
-        # 构建请求数据
-        request_data = []
-        for point in points:
-            request_data.append({
-                "deviceID": point["device_id"],
-                "pointID": point["point_id"]
-            })
-        
+        results, failures = run_chunks(
+            self._find_last_chunk, chunked(points, chunk_size), max_workers
+        )
+        return merge_chunk_results(results, failures, "批量查询实时值失败")
+
+    def _find_last_chunk(self, points: List[Dict[str, str]]) -> List[FindLastResponse]:
         response = self.client.post(
             "/iot/open_api/v1/data/findLastBatch",
-            request_data,
+            _find_last_batch_payload(points),
             FindLastResponse
         )
         # 处理响应数据，确保返回列表格式
-        if isinstance(response.data, list):
-            return response.data
-        elif response.data is not None:
-            return [response.data]
-        else:
-            return []
-    
+        return _as_list(response.data)
+
     def set_value(self, device_id: str, point_id: str, value: str) -> None:
         """
         设置测点值（控制指令下发）
-        
+
         Args:
             device_id: 设备ID
             point_id: 测点ID
@@ -84,7 +399,55 @@ class IotApi:
         """
         request = SetValueRequest(device_id=device_id, point_id=point_id, value=value)
         self.client.post("/iot/open_api/v1/data/setValue", request.dict(by_alias=True))
-    
+
+    def batch_set_value(self, values: Dict[str, Dict[str, Any]]) -> Response:
+        """
+        批量设置测点值
+
+        每次请求只允许写入同一个网关或同一个直连通道下的设备。
+
+        Args:
+            values: {设备ID: {测点ID: 值}}
+
+        Returns:
+            Response: 响应数据，success 为服务端返回的下发结果
+        """
+        return self.client.post("/iot/open_api/v1/data/batchSetValue", values)
+
+    def set_values(
+        self,
+        values: List[Dict[str, Any]],
+        chunk_size: int = SET_VALUE_BATCH_SIZE,
+        max_workers: int = 8,
+        coalesce: bool = True
+    ) -> List[SetValueResult]:
+        """
+        批量下发多个测点值
+
+        按 gateway_id 或 channel_id 分组、按 chunk_size 分片后通过 batchSetValue 并发下发。
+        单个分片失败不影响其它分片，失败信息记录在对应测点的结果中。
+
+        Args:
+            values: 测点写入列表，每个元素包含 device_id、point_id、value，以及可选的
+                gateway_id（网关设备）或 channel_id（直连通道设备）；都没有提供的写入按设备分别下发
+            chunk_size: 每个请求包含的最大测点数
+            max_workers: 最大并发请求数
+            coalesce: 是否合并对同一测点的多次写入，只下发最后一次的值；
+                为 False 时按写入顺序依次下发
+
+        Returns:
+            List[SetValueResult]: 每个测点的下发结果，按输入顺序排列
+        """
+        rounds, merged = _set_value_rounds(values, chunk_size, coalesce)
+        errors: Dict[int, Optional[BaseException]] = {}
+        for chunks in rounds:
+            _, failures = run_chunks(self._set_value_chunk, chunks, max_workers)
+            _record_set_value_round(chunks, failures, errors)
+        return _set_value_results(values, errors, merged)
+
+    def _set_value_chunk(self, chunk: SetValueChunk) -> None:
+        _check_set_value(self.batch_set_value(_batch_set_value_payload(chunk)))
+
     def query_history(
         self,
         points: List[Dict[str, str]],
@@ -99,7 +462,7 @@ class IotApi:
     ) -> HistoryResponse:
         """
         查询历史数据
-        
+
         Args:
             points: 测点列表，每个元素包含 device_id 和 point_id
             start: 开始时间
@@ -110,33 +473,631 @@ class IotApi:
             offset: 偏移量
             limit: 限制数量
             order: 排序方式
-            
+
         Returns:
             HistoryResponse: 历史数据
         """
-        # 构建测点列表
-        point_requests = []
-        for point in points:
-            point_requests.append(FindLastRequest(
-                device_id=point["device_id"],
-                point_id=point["point_id"]
-            ))
-        
-        request = HistoryRequest(
-            points=point_requests,
-            start=start,
-            end=end,
-            aggregation=aggregation,
-            interval=interval,
-            fill=fill,
-            offset=offset,
-            limit=limit,
-            order=order
-        )
-        
+        request = _history_request(
+            points, start, end, aggregation, interval, fill, offset, limit, order
+        )
+
         response = self.client.post(
             "/iot/open_api/v1/data/query",
             request.dict(by_alias=True),
             HistoryResponse
         )
-        return response.data 
\ No newline at end of file
+        return response.data
+
+    def query_history_columns(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        offset: int = 0,
+        limit: int = 5000,
+        order: str = "asc"
+    ) -> HistoryFrame:
+        """
+        查询历史数据，返回列式结果
+
+        参数含义同 query_history。响应直接解码为每个测点的 NumPy 数组，
+        不构建逐行的 HistoryValue 模型，适合大数据量分析。需要安装 numpy。
+
+        Returns:
+            HistoryFrame: 列式历史数据，可通过 to_pandas() / to_arrow() 转换
+        """
+        request = _history_request(
+            points, start, end, aggregation, interval, fill, offset, limit, order
+        )
+
+        response = self.client.post(
+            "/iot/open_api/v1/data/query",
+            request.dict(by_alias=True)
+        )
+        return _history_frame(response.data)
+
+    def query_device(
+        self,
+        device_id: str,
+        points: List[Union[str, Dict[str, Any]]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        offset: int = 0,
+        limit: int = 5000
+    ) -> HistoryResponse:
+        """
+        查询单个设备的历史数据
+
+        Args:
+            device_id: 设备ID
+            points: 测点ID列表，或包含 point_id 与可选 aggregations 的字典列表
+            start: 开始时间
+            end: 结束时间
+            aggregation: 默认聚合方式
+            interval: 时间间隔
+            offset: 偏移量
+            limit: 限制数量
+
+        Returns:
+            HistoryResponse: 历史数据
+        """
+        request = _device_history_request(
+            device_id, points, start, end, aggregation, interval, offset, limit
+        )
+
+        response = self.client.post(
+            "/iot/open_api/v1/data/query_device",
+            request.dict(by_alias=True, exclude_none=True),
+            HistoryResponse
+        )
+        return response.data
+
+    def query_device_columns(
+        self,
+        device_id: str,
+        points: List[Union[str, Dict[str, Any]]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        offset: int = 0,
+        limit: int = 5000
+    ) -> HistoryFrame:
+        """
+        查询单个设备的历史数据，返回列式结果
+
+        参数含义同 query_device。需要安装 numpy。
+
+        Returns:
+            HistoryFrame: 列式历史数据
+        """
+        request = _device_history_request(
+            device_id, points, start, end, aggregation, interval, offset, limit
+        )
+
+        response = self.client.post(
+            "/iot/open_api/v1/data/query_device",
+            request.dict(by_alias=True, exclude_none=True)
+        )
+        return _history_frame(response.data)
+
+    def iter_history_pages(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        order: str = "asc",
+        page_size: int = HISTORY_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[HistoryResponse]:
+        """
+        分页遍历历史数据
+
+        自动递增 offset 直到所有测点的数据取完，每次只在内存中保留当前页
+        （启用预取时另加正在下载的下一页）。已取完的测点不再出现在后续请求中。
+
+        Args:
+            points: 测点列表，每个元素包含 device_id 和 point_id
+            start: 开始时间
+            end: 结束时间
+            aggregation: 聚合方式
+            interval: 时间间隔
+            fill: 填充方式
+            order: 排序方式
+            page_size: 每页条数，最大 5000
+            prefetch: 是否在调用方处理当前页时后台请求下一页
+
+        Yields:
+            HistoryResponse: 每页历史数据
+        """
+        def fetch(page_points: List[Dict[str, str]], offset: int) -> HistoryResponse:
+            return self.query_history(
+                page_points, start, end, aggregation, interval, fill, offset, page_size, order
+            )
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending = None
+        try:
+            offset = 0
+            page = fetch(points, offset)
+            while page is not None:
+                points = _unfinished_points(points, page, page_size)
+                offset += page_size
+                if points and executor is not None:
+                    pending = executor.submit(fetch, points, offset)
+                yield page
+                if not points:
+                    break
+                if pending is not None:
+                    page, pending = pending.result(), None
+                else:
+                    page = fetch(points, offset)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def iter_history(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        order: str = "asc",
+        page_size: int = HISTORY_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[Tuple[str, str, HistoryValue]]:
+        """
+        逐行遍历历史数据
+
+        参数含义同 iter_history_pages。
+
+        Yields:
+            (设备ID, 测点ID, HistoryValue)
+        """
+        for page in self.iter_history_pages(
+            points, start, end, aggregation, interval, fill, order, page_size, prefetch
+        ):
+            yield from _page_rows(page)
+
+    def fetch_history(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        order: str = "asc",
+        shards: int = 4,
+        point_group_size: Optional[int] = None,
+        max_workers: int = 4,
+        page_size: int = HISTORY_PAGE_SIZE
+    ) -> HistoryResponse:
+        """
+        并行查询完整时间范围内的历史数据
+
+        将 start..end 切分为 shards 个时间窗口（切分点对齐到 interval），
+        可选再按 point_group_size 对测点分组，各任务自动分页并由线程池并发执行，
+        最后按测点拼接、按时间去重并按 order 排序。
+        设置了 history_cache 时只请求缓存中缺失的时间段。
+
+        Args:
+            points: 测点列表，每个元素包含 device_id 和 point_id
+            start: 开始时间
+            end: 结束时间
+            aggregation: 聚合方式
+            interval: 时间间隔
+            fill: 填充方式
+            order: 排序方式
+            shards: 时间窗口数
+            point_group_size: 每组测点数，为空时不分组
+            max_workers: 最大并发任务数
+            page_size: 每页条数，最大 5000
+
+        Returns:
+            HistoryResponse: 完整的历史数据
+
+        Raises:
+            BatchError: 部分任务失败时抛出，results 为已成功部分拼接的测点结果，
+                chunk_results 为各任务的分页结果，失败任务为 None
+        """
+        def fetch(task: Tuple[List[Dict[str, str]], datetime, datetime]) -> List[HistoryResponse]:
+            group, window_start, window_end = task
+            return list(self.iter_history_pages(
+                group, window_start, window_end, aggregation, interval, fill, order,
+                page_size, prefetch=False
+            ))
+
+        tasks = _history_tasks(
+            points, start, end, interval, shards, point_group_size,
+            self.history_cache, aggregation, fill
+        )
+        pages, failures = run_chunks(fetch, tasks, max_workers)
+        return _stitch_history(
+            pages, failures, order, self.history_cache, tasks,
+            (points, start, end, aggregation, interval, fill)
+        )
+
+
+class AsyncIotApi:
+    """IoT API 异步客户端"""
+
+    def __init__(self, client: AsyncTopStackClient, history_cache: Optional[HistoryCache] = None):
+        """
+        初始化 IoT API
+
+        Args:
+            client: TopStack 异步客户端实例
+            history_cache: 历史数据本地缓存，启用后 fetch_history 只请求缺失的时间段
+        """
+        self.client = client
+        self.history_cache = history_cache
+
+    async def find_last(self, device_id: str, point_id: str) -> FindLastResponse:
+        """
+        查询单测点实时值
+
+        Args:
+            device_id: 设备ID
+            point_id: 测点ID
+
+        Returns:
+            FindLastResponse: 测点实时值
+        """
+        request = FindLastRequest(device_id=device_id, point_id=point_id)
+        response = await self.client.post(
+            "/iot/open_api/v1/data/findLast",
+            request.dict(by_alias=True),
+            FindLastResponse
+        )
+        return response.data
+
+    async def find_last_batch(
+        self,
+        points: List[Dict[str, str]],
+        chunk_size: int = FIND_LAST_BATCH_SIZE,
+        max_concurrency: int = 16
+    ) -> List[FindLastResponse]:
+        """
+        批量查询多测点实时值
+
+        测点数超过 chunk_size 时自动分片并发请求，结果按输入顺序合并。
+
+        Args:
+            points: 测点列表，每个元素包含 device_id 和 point_id
+            chunk_size: 每个请求包含的最大测点数
+            max_concurrency: 最大并发请求数
+
+        Returns:
+            List[FindLastResponse]: 测点实时值列表
+
+        Raises:
+            BatchError: 部分分片失败时抛出，results 为成功分片拼接的结果（不含失败分片），
+                chunk_results 按分片对齐，失败分片为 None
+        """
+        results, failures = await run_chunks_async(
+            self._find_last_chunk, chunked(points, chunk_size), max_concurrency
+        )
+        return merge_chunk_results(results, failures, "批量查询实时值失败")
+
+    async def _find_last_chunk(self, points: List[Dict[str, str]]) -> List[FindLastResponse]:
+        response = await self.client.post(
+            "/iot/open_api/v1/data/findLastBatch",
+            _find_last_batch_payload(points),
+            FindLastResponse
+        )
+        return _as_list(response.data)
+
+    async def set_value(self, device_id: str, point_id: str, value: str) -> None:
+        """
+        设置测点值（控制指令下发）
+
+        Args:
+            device_id: 设备ID
+            point_id: 测点ID
+            value: 要设置的值
+        """
+        request = SetValueRequest(device_id=device_id, point_id=point_id, value=value)
+        await self.client.post("/iot/open_api/v1/data/setValue", request.dict(by_alias=True))
+
+    async def batch_set_value(self, values: Dict[str, Dict[str, Any]]) -> Response:
+        """
+        批量设置测点值
+
+        每次请求只允许写入同一个网关或同一个直连通道下的设备。
+
+        Args:
+            values: {设备ID: {测点ID: 值}}
+
+        Returns:
+            Response: 响应数据，success 为服务端返回的下发结果
+        """
+        return await self.client.post("/iot/open_api/v1/data/batchSetValue", values)
+
+    async def set_values(
+        self,
+        values: List[Dict[str, Any]],
+        chunk_size: int = SET_VALUE_BATCH_SIZE,
+        max_concurrency: int = 16,
+        coalesce: bool = True
+    ) -> List[SetValueResult]:
+        """
+        批量下发多个测点值
+
+        按 gateway_id 或 channel_id 分组、按 chunk_size 分片后通过 batchSetValue 并发下发。
+        单个分片失败不影响其它分片，失败信息记录在对应测点的结果中。
+
+        Args:
+            values: 测点写入列表，每个元素包含 device_id、point_id、value，以及可选的
+                gateway_id（网关设备）或 channel_id（直连通道设备）；都没有提供的写入按设备分别下发
+            chunk_size: 每个请求包含的最大测点数
+            max_concurrency: 最大并发请求数
+            coalesce: 是否合并对同一测点的多次写入，只下发最后一次的值；
+                为 False 时按写入顺序依次下发
+
+        Returns:
+            List[SetValueResult]: 每个测点的下发结果，按输入顺序排列
+        """
+        rounds, merged = _set_value_rounds(values, chunk_size, coalesce)
+        errors: Dict[int, Optional[BaseException]] = {}
+        for chunks in rounds:
+            _, failures = await run_chunks_async(self._set_value_chunk, chunks, max_concurrency)
+            _record_set_value_round(chunks, failures, errors)
+        return _set_value_results(values, errors, merged)
+
+    async def _set_value_chunk(self, chunk: SetValueChunk) -> None:
+        _check_set_value(await self.batch_set_value(_batch_set_value_payload(chunk)))
+
+    async def query_history(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        offset: int = 0,
+        limit: int = 5000,
+        order: str = "asc"
+    ) -> HistoryResponse:
+        """
+        查询历史数据
+
+        参数含义同 IotApi.query_history。
+
+        Returns:
+            HistoryResponse: 历史数据
+        """
+        request = _history_request(
+            points, start, end, aggregation, interval, fill, offset, limit, order
+        )
+
+        response = await self.client.post(
+            "/iot/open_api/v1/data/query",
+            request.dict(by_alias=True),
+            HistoryResponse
+        )
+        return response.data
+
+    async def query_history_columns(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        offset: int = 0,
+        limit: int = 5000,
+        order: str = "asc"
+    ) -> HistoryFrame:
+        """
+        查询历史数据，返回列式结果
+
+        参数含义同 IotApi.query_history_columns。
+
+        Returns:
+            HistoryFrame: 列式历史数据，可通过 to_pandas() / to_arrow() 转换
+        """
+        request = _history_request(
+            points, start, end, aggregation, interval, fill, offset, limit, order
+        )
+
+        response = await self.client.post(
+            "/iot/open_api/v1/data/query",
+            request.dict(by_alias=True)
+        )
+        return _history_frame(response.data)
+
+    async def query_device(
+        self,
+        device_id: str,
+        points: List[Union[str, Dict[str, Any]]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        offset: int = 0,
+        limit: int = 5000
+    ) -> HistoryResponse:
+        """
+        查询单个设备的历史数据
+
+        Args:
+            device_id: 设备ID
+            points: 测点ID列表，或包含 point_id 与可选 aggregations 的字典列表
+            start: 开始时间
+            end: 结束时间
+            aggregation: 默认聚合方式
+            interval: 时间间隔
+            offset: 偏移量
+            limit: 限制数量
+
+        Returns:
+            HistoryResponse: 历史数据
+        """
+        request = _device_history_request(
+            device_id, points, start, end, aggregation, interval, offset, limit
+        )
+
+        response = await self.client.post(
+            "/iot/open_api/v1/data/query_device",
+            request.dict(by_alias=True, exclude_none=True),
+            HistoryResponse
+        )
+        return response.data
+
+    async def query_device_columns(
+        self,
+        device_id: str,
+        points: List[Union[str, Dict[str, Any]]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        offset: int = 0,
+        limit: int = 5000
+    ) -> HistoryFrame:
+        """
+        查询单个设备的历史数据，返回列式结果
+
+        参数含义同 IotApi.query_device_columns。
+
+        Returns:
+            HistoryFrame: 列式历史数据
+        """
+        request = _device_history_request(
+            device_id, points, start, end, aggregation, interval, offset, limit
+        )
+
+        response = await self.client.post(
+            "/iot/open_api/v1/data/query_device",
+            request.dict(by_alias=True, exclude_none=True)
+        )
+        return _history_frame(response.data)
+
+    async def iter_history_pages(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        order: str = "asc",
+        page_size: int = HISTORY_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> AsyncIterator[HistoryResponse]:
+        """
+        分页遍历历史数据
+
+        参数含义同 IotApi.iter_history_pages，预取通过后台任务完成。
+
+        Yields:
+            HistoryResponse: 每页历史数据
+        """
+        def fetch(page_points: List[Dict[str, str]], offset: int):
+            return self.query_history(
+                page_points, start, end, aggregation, interval, fill, offset, page_size, order
+            )
+
+        pending = None
+        try:
+            offset = 0
+            page = await fetch(points, offset)
+            while page is not None:
+                points = _unfinished_points(points, page, page_size)
+                offset += page_size
+                if points and prefetch:
+                    pending = asyncio.ensure_future(fetch(points, offset))
+                yield page
+                if not points:
+                    break
+                if pending is not None:
+                    page, pending = await pending, None
+                else:
+                    page = await fetch(points, offset)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def iter_history(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        order: str = "asc",
+        page_size: int = HISTORY_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> AsyncIterator[Tuple[str, str, HistoryValue]]:
+        """
+        逐行遍历历史数据
+
+        参数含义同 IotApi.iter_history_pages。
+
+        Yields:
+            (设备ID, 测点ID, HistoryValue)
+        """
+        async for page in self.iter_history_pages(
+            points, start, end, aggregation, interval, fill, order, page_size, prefetch
+        ):
+            for row in _page_rows(page):
+                yield row
+
+    async def fetch_history(
+        self,
+        points: List[Dict[str, str]],
+        start: datetime,
+        end: datetime,
+        aggregation: str = "last",
+        interval: str = "10s",
+        fill: str = "null",
+        order: str = "asc",
+        shards: int = 4,
+        point_group_size: Optional[int] = None,
+        max_concurrency: int = 8,
+        page_size: int = HISTORY_PAGE_SIZE
+    ) -> HistoryResponse:
+        """
+        并行查询完整时间范围内的历史数据
+
+        参数含义同 IotApi.fetch_history，max_concurrency 为最大并发任务数。
+
+        Returns:
+            HistoryResponse: 完整的历史数据
+
+        Raises:
+            BatchError: 部分任务失败时抛出，results 为已成功部分拼接的测点结果，
+                chunk_results 为各任务的分页结果，失败任务为 None
+        """
+        async def fetch(task: Tuple[List[Dict[str, str]], datetime, datetime]) -> List[HistoryResponse]:
+            group, window_start, window_end = task
+            return [page async for page in self.iter_history_pages(
+                group, window_start, window_end, aggregation, interval, fill, order,
+                page_size, prefetch=False
+            )]
+
+        tasks = _history_tasks(
+            points, start, end, interval, shards, point_group_size,
+            self.history_cache, aggregation, fill
+        )
+        pages, failures = await run_chunks_async(fetch, tasks, max_concurrency)
+        return _stitch_history(
+            pages, failures, order, self.history_cache, tasks,
+            (points, start, end, aggregation, interval, fill)
+        )
\ No newline at end of file
@@ -5,36 +5,56 @@ IoT 模块数据模型
 from typing import Any, List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel, Field, RootModel
+from ..timestamps import UtcDatetime
 
 class FindLastRequest(BaseModel):
     """查询单测点实时值请求"""
+    model_config = {"defer_build": True, "populate_by_name": True}
+
     device_id: str = Field(..., alias="deviceID", description="设备ID")
     point_id: str = Field(..., alias="pointID", description="测点ID")
 
 class FindLastResponse(BaseModel):
     """查询单测点实时值响应"""
+    model_config = {"defer_build": True}
+
     device_id: str = Field(..., alias="deviceID", description="设备ID")
     point_id: str = Field(..., alias="pointID", description="测点ID")
     value: Any = Field(None, description="测点值")
     quality: int = Field(0, description="数据质量：0表示正常，1表示离线，2表示无效")
-    timestamp: datetime = Field(..., description="时间戳")
+    timestamp: UtcDatetime = Field(..., description="时间戳")
 
 class FindLastBatchRequest(RootModel[List[FindLastRequest]]):
     """批量查询多测点实时值请求"""
-    model_config = {"title": "FindLastBatchRequest", "description": "测点列表"}
+    model_config = {"defer_build": True, "title": "FindLastBatchRequest", "description": "测点列表"}
 
 class FindLastBatchResponse(RootModel[List[FindLastResponse]]):
     """批量查询多测点实时值响应"""
-    model_config = {"title": "FindLastBatchResponse", "description": "测点数据列表"}
+    model_config = {"defer_build": True, "title": "FindLastBatchResponse", "description": "测点数据列表"}
 
 class SetValueRequest(BaseModel):
     """设置测点值请求"""
+    model_config = {"defer_build": True, "populate_by_name": True}
+
     device_id: str = Field(..., alias="deviceID", description="设备ID")
     point_id: str = Field(..., alias="pointID", description="测点ID")
     value: str = Field(..., description="要设置的值")
 
+class SetValueResult(BaseModel):
+    """批量下发中单个测点的结果"""
+    model_config = {"defer_build": True}
+
+    device_id: str = Field(..., description="设备ID")
+    point_id: str = Field(..., description="测点ID")
+    value: Any = Field(None, description="要设置的值")
+    success: bool = Field(..., description="是否下发成功")
+    error: Optional[str] = Field(None, description="失败原因")
+    coalesced: bool = Field(False, description="是否被同一测点之后的写入合并，此时结果为最终写入的结果")
+
 class HistoryValue(BaseModel):
     """历史数据值"""
+    model_config = {"defer_build": True}
+
     value: Optional[Any] = Field(None, description="值")
     first: Optional[Any] = Field(None, description="第一个值")
     last: Optional[Any] = Field(None, description="最后一个值")
@@ -46,16 +66,20 @@ class HistoryValue(BaseModel):
     count: Optional[Any] = Field(None, description="计数")
     spread: Optional[Any] = Field(None, description="范围")
     stddev: Optional[Any] = Field(None, description="标准差")
-    time: datetime = Field(..., description="时间")
+    time: UtcDatetime = Field(..., description="时间")
 
 class HistoryResult(BaseModel):
     """历史数据结果"""
+    model_config = {"defer_build": True}
+
     device_id: str = Field(..., alias="deviceID", description="设备ID")
     point_id: str = Field(..., alias="pointID", description="测点ID")
     values: List[HistoryValue] = Field(..., description="历史数据值列表")
 
 class HistoryRequest(BaseModel):
     """查询历史数据请求"""
+    model_config = {"defer_build": True, "populate_by_name": True}
+
     points: List[FindLastRequest] = Field(..., description="测点列表")
     start: datetime = Field(..., description="开始时间")
     end: datetime = Field(..., description="结束时间")
@@ -68,4 +92,26 @@ class HistoryRequest(BaseModel):
 
 class HistoryResponse(BaseModel):
     """查询历史数据响应"""
-    results: List[HistoryResult] = Field(..., description="历史数据结果列表") 
\ No newline at end of file
+    model_config = {"defer_build": True}
+
+    results: List[HistoryResult] = Field(..., description="历史数据结果列表")
+
+class DeviceHistoryPoint(BaseModel):
+    """设备历史数据查询测点"""
+    model_config = {"defer_build": True, "populate_by_name": True}
+
+    point_id: str = Field(..., alias="pointID", description="测点ID")
+    aggregations: Optional[List[str]] = Field(None, description="该测点的聚合方式列表，例如 last,max,min,difference")
+
+class DeviceHistoryRequest(BaseModel):
+    """设备历史数据查询请求"""
+    model_config = {"defer_build": True, "populate_by_name": True}
+
+    device_id: str = Field(..., alias="deviceID", description="设备ID")
+    points: List[DeviceHistoryPoint] = Field(..., description="测点列表")
+    start: datetime = Field(..., description="开始时间")
+    end: datetime = Field(..., description="结束时间")
+    aggregation: str = Field("last", description="聚合方式：first,last,min,max,mean")
+    interval: str = Field("5s", description="时间间隔")
+    offset: int = Field(0, ge=0, description="偏移量")
+    limit: int = Field(5000, ge=0, le=5000, description="限制数量")
\ No newline at end of file
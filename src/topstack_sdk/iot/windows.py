@@ -0,0 +1,117 @@
+"""
+IoT 历史数据时间窗口工具
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import HistoryResponse, HistoryResult, HistoryValue
+
+_INTERVAL_RE = re.compile(r'^\s*(\d+)\s*(ns|us|µs|ms|s|m|h|d|w)\s*$')
+
+_UNITS = {
+    'ns': timedelta(microseconds=0.001),
+    'us': timedelta(microseconds=1),
+    'µs': timedelta(microseconds=1),
+    'ms': timedelta(milliseconds=1),
+    's': timedelta(seconds=1),
+    'm': timedelta(minutes=1),
+    'h': timedelta(hours=1),
+    'd': timedelta(days=1),
+    'w': timedelta(weeks=1),
+}
+
+
+def parse_interval(interval: str) -> Optional[timedelta]:
+    """
+    解析时间间隔字符串
+
+    Args:
+        interval: 例如 5s、10m、1h、1d
+
+    Returns:
+        时间间隔，无法解析时返回 None
+    """
+    match = _INTERVAL_RE.match(interval or '')
+    if not match:
+        return None
+    step = int(match.group(1)) * _UNITS[match.group(2)]
+    return step if step > timedelta(0) else None
+
+
+def align_time(dt: datetime, step: Optional[timedelta]) -> datetime:
+    """将时间向下对齐到 step 的整数倍（以 1970-01-01 为起点）"""
+    if step is None or step < timedelta(seconds=1):
+        return dt
+    epoch = datetime(1970, 1, 1, tzinfo=dt.tzinfo)
+    delta = dt - epoch
+    return epoch + (delta - delta % step)
+
+
+def split_range(
+    start: datetime,
+    end: datetime,
+    shards: int,
+    interval: Optional[str] = None
+) -> List[Tuple[datetime, datetime]]:
+    """
+    将时间范围切分为若干个相邻的窗口
+
+    切分点对齐到聚合间隔，避免同一个聚合桶被拆到两个窗口中。
+
+    Args:
+        start: 开始时间
+        end: 结束时间
+        shards: 窗口数
+        interval: 聚合间隔
+
+    Returns:
+        [(窗口开始, 窗口结束)] 列表，按时间升序
+    """
+    if shards <= 1 or end <= start:
+        return [(start, end)]
+
+    step = parse_interval(interval) if interval else None
+    width = (end - start) / shards
+    bounds = [start]
+    for i in range(1, shards):
+        cut = align_time(start + width * i, step)
+        if bounds[-1] < cut < end:
+            bounds.append(cut)
+    bounds.append(end)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def merge_results(pages: Iterable[HistoryResponse], order: str = "asc") -> List[HistoryResult]:
+    """
+    合并多个窗口/分页的历史数据
+
+    同一测点的数据按时间去重（窗口边界可能重复返回同一时刻）并按 order 排序，
+    测点按首次出现的顺序排列。
+
+    Args:
+        pages: 历史数据列表
+        order: 排序方式：asc,desc
+
+    Returns:
+        合并后的测点结果列表
+    """
+    series: Dict[Tuple[str, str], Dict[datetime, HistoryValue]] = {}
+    for page in pages:
+        if page is None:
+            continue
+        for result in page.results:
+            values = series.setdefault((result.device_id, result.point_id), {})
+            for value in result.values:
+                values[value.time] = value
+
+    # 数据值已经过校验，直接构建结果
+    return [
+        HistoryResult.model_construct(
+            device_id=device_id,
+            point_id=point_id,
+            values=[values[t] for t in sorted(values, reverse=(order == "desc"))]
+        )
+        for (device_id, point_id), values in series.items()
+    ]
\ No newline at end of file
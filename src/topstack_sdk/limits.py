@@ -0,0 +1,204 @@
+"""
+客户端限流
+
+多个作业共用一个 TopStack 实例时，客户端需要主动控制请求速率与并发数：
+
+- RateLimiter：令牌桶，限制每秒请求数，允许 burst 个请求的突发
+- AdaptiveLimiter：AIMD 自适应并发限制。请求成功时缓慢增加并发上限，遇到 429/5xx、
+  传输错误或延迟明显升高时减半，使吞吐收敛到服务端可承受的水平
+
+两者均可同时用于同步与异步客户端，在同一客户端的所有 API 模块之间共享。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Iterable, Optional
+
+# 表示服务端过载的状态码，另外传输错误（状态码 0）也视为过载
+OVERLOAD_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class RateLimiter:
+    """
+    令牌桶限流器
+
+    令牌按 rate 个/秒补充，最多积累 burst 个。令牌不足时按预约顺序等待。
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: 每秒请求数
+            burst: 允许突发的请求数，默认与 rate 相同（至少为 1）
+            clock: 单调时钟
+        """
+        if rate <= 0:
+            raise ValueError("rate 必须大于 0")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        预约一个令牌
+
+        Returns:
+            取得令牌前需要等待的秒数
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        """取得一个令牌，必要时阻塞等待"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """取得一个令牌，必要时异步等待"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 自适应并发限制
+
+    - 加性增加：并发占用超过上限一半时，每个成功请求使上限增加 increase / limit，
+      即每轮（约 limit 个请求）增加 increase
+    - 乘性减少：遇到过载状态码、传输错误，或请求延迟超过最小延迟的 latency_tolerance 倍时，
+      上限乘以 decrease；同一轮请求内最多减少一次
+    """
+
+    def __init__(
+        self,
+        initial: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: Optional[float] = None,
+        overload_statuses: Iterable[int] = OVERLOAD_STATUSES,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            initial: 初始并发上限
+            min_limit: 最小并发上限
+            max_limit: 最大并发上限
+            increase: 每轮增加的并发数
+            decrease: 过载时上限的缩小比例
+            latency_tolerance: 延迟超过最小延迟多少倍视为过载，为空时不根据延迟调整
+            overload_statuses: 表示过载的 HTTP 状态码
+            clock: 单调时钟
+        """
+        if not 0 < decrease < 1:
+            raise ValueError("decrease 必须在 0 和 1 之间")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.overload_statuses = frozenset(overload_statuses)
+        self._clock = clock
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._min_latency: Optional[float] = None
+        self._last_decrease = float('-inf')
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """正在执行的请求数"""
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """占用一个并发名额，名额不足时阻塞等待"""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """占用一个并发名额，名额不足时异步等待"""
+        with self._lock:
+            if self._in_flight < int(self._limit) and not self._waiters:
+                self._in_flight += 1
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+        try:
+            # 唤醒时名额已经转交给当前协程
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                elif not future.cancelled():
+                    self._in_flight -= 1
+                    self._wake()
+            raise
+
+    def release(self, latency: float, status_code: Optional[int]) -> None:
+        """
+        释放并发名额并根据请求结果调整上限
+
+        Args:
+            latency: 请求耗时（秒）
+            status_code: HTTP 状态码，传输错误为 0，请求被取消时为 None（不调整上限）
+        """
+        with self._lock:
+            busy = self._in_flight
+            self._in_flight -= 1
+            if status_code is not None:
+                self._adjust(latency, status_code, busy)
+            self._wake()
+
+    def _adjust(self, latency: float, status_code: int, busy: int) -> None:
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        overloaded = status_code == 0 or status_code in self.overload_statuses
+        if not overloaded and self.latency_tolerance is not None:
+            overloaded = latency > self._min_latency * self.latency_tolerance
+        if overloaded:
+            now = self._clock()
+            # 同一轮（约一个请求耗时）内的多个失败只减少一次
+            if now - self._last_decrease >= latency:
+                self._limit = max(float(self.min_limit), self._limit * self.decrease)
+                self._last_decrease = now
+        elif busy * 2 >= self._limit:
+            self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+
+    def _wake(self) -> None:
+        """名额释放或上限增加后唤醒等待者，调用时需持有锁"""
+        while self._waiters and self._in_flight < int(self._limit):
+            future = self._waiters.popleft()
+            self._in_flight += 1
+            future.get_loop().call_soon_threadsafe(self._grant, future)
+        self._cond.notify_all()
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            # 等待者已取消，归还名额
+            with self._lock:
+                self._in_flight -= 1
+                self._wake()
+        else:
+            future.set_result(None)
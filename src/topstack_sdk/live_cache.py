@@ -0,0 +1,249 @@
+"""
+实时值本地缓存
+
+订阅项目下全部测点的 NATS 实时数据，保存每个测点的最新值。查询实时值时优先从本地
+读取，缓存未命中或数据过期时回退到 REST 接口。
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .iot.iot import IotApi, AsyncIotApi
+from .iot.models import FindLastResponse
+from .dispatch import SubscriptionHandle
+from .nats import NatsBus, PointData
+from .timestamps import to_datetime
+
+# 缓存条目：(值, 数据质量, 时间戳（毫秒时间戳或 datetime）, 接收时间)
+_Entry = Tuple[Any, int, Union[int, datetime], float]
+
+
+class _LiveValueStore:
+    """实时值缓存的公共实现"""
+
+    def __init__(self, max_age: Optional[float] = 30, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_age: 缓存值的最大有效期（秒，从接收时刻算起），为 None 时不过期
+            clock: 单调时钟，用于测试
+        """
+        self.max_age = max_age
+        self._clock = clock
+        self._values: Dict[Tuple[str, str], _Entry] = {}
+        self._subscriptions: List[SubscriptionHandle] = []
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    async def subscribe(self, bus: NatsBus, project_id: str) -> SubscriptionHandle:
+        """
+        订阅项目下全部测点的实时数据并写入缓存
+
+        Args:
+            bus: NATS 消息总线
+            project_id: 项目ID
+
+        Returns:
+            SubscriptionHandle: 订阅句柄，close 时自动取消
+        """
+        subscription = await bus.subscribe_project_point_data(project_id, self.update)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    async def close(self) -> None:
+        """取消全部订阅"""
+        subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            await subscription.unsubscribe()
+
+    def update(self, point_data: PointData) -> None:
+        """写入一条实时数据"""
+        # 保存毫秒时间戳，命中时才构建 datetime
+        self._values[(point_data.device_id, point_data.point_id)] = (
+            point_data.value, point_data.quality or 0,
+            point_data.timestamp_ms or int(time.time() * 1000), self._clock()
+        )
+
+    def _store(self, result: FindLastResponse) -> None:
+        """写入 REST 查询结果"""
+        self._values[(result.device_id, result.point_id)] = (
+            result.value, result.quality, result.timestamp, self._clock()
+        )
+
+    def invalidate(self, device_id: Optional[str] = None, point_id: Optional[str] = None) -> None:
+        """
+        删除缓存值
+
+        Args:
+            device_id: 设备ID，为空时删除全部
+            point_id: 测点ID，为空时删除该设备的全部测点
+        """
+        if device_id is None:
+            self._values.clear()
+        elif point_id is not None:
+            self._values.pop((device_id, point_id), None)
+        else:
+            for key in [key for key in self._values if key[0] == device_id]:
+                self._values.pop(key, None)
+
+    def get(self, device_id: str, point_id: str) -> Optional[FindLastResponse]:
+        """
+        读取未过期的缓存值
+
+        Returns:
+            FindLastResponse: 测点实时值，未命中或已过期时返回 None
+        """
+        entry = self._values.get((device_id, point_id))
+        if entry is None:
+            return None
+        value, quality, timestamp, received = entry
+        if self.max_age is not None and self._clock() - received > self.max_age:
+            return None
+        return FindLastResponse.model_construct(
+            device_id=device_id, point_id=point_id,
+            value=value, quality=quality, timestamp=to_datetime(timestamp)
+        )
+
+    def _lookup(self, points: List[Dict[str, str]]) -> Tuple[List[Optional[FindLastResponse]], List[Dict[str, str]]]:
+        """按输入顺序读取缓存，返回 (结果列表, 未命中的测点)"""
+        results = [self.get(point["device_id"], point["point_id"]) for point in points]
+        missing = [point for point, result in zip(points, results) if result is None]
+        self.hits += len(points) - len(missing)
+        self.misses += len(missing)
+        return results, missing
+
+    def _fill(
+        self,
+        results: List[Optional[FindLastResponse]],
+        points: List[Dict[str, str]],
+        fetched: List[FindLastResponse]
+    ) -> List[FindLastResponse]:
+        """将 REST 查询结果写入缓存并填回未命中的位置，服务端未返回的测点不出现在结果中"""
+        by_key = {}
+        for result in fetched:
+            self._store(result)
+            by_key[(result.device_id, result.point_id)] = result
+        merged = []
+        for point, result in zip(points, results):
+            if result is None:
+                result = by_key.get((point["device_id"], point["point_id"]))
+            if result is not None:
+                merged.append(result)
+        return merged
+
+
+class LiveValueCache(_LiveValueStore):
+    """
+    实时值本地缓存，未命中时通过 IotApi 查询
+
+    NATS 回调运行在事件循环中，查询可以在其它线程中进行。
+    """
+
+    def __init__(self, iot_api: IotApi, max_age: Optional[float] = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        初始化实时值缓存
+
+        Args:
+            iot_api: 缓存未命中时使用的 IoT API
+            max_age: 缓存值的最大有效期（秒，从接收时刻算起），为 None 时不过期
+            clock: 单调时钟，用于测试
+        """
+        super().__init__(max_age, clock)
+        self.iot_api = iot_api
+
+    def find_last(self, device_id: str, point_id: str) -> FindLastResponse:
+        """
+        查询单测点实时值
+
+        Args:
+            device_id: 设备ID
+            point_id: 测点ID
+
+        Returns:
+            FindLastResponse: 测点实时值
+        """
+        result = self.get(device_id, point_id)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = self.iot_api.find_last(device_id, point_id)
+        if result is not None:
+            self._store(result)
+        return result
+
+    def find_last_batch(self, points: List[Dict[str, str]], **kwargs) -> List[FindLastResponse]:
+        """
+        批量查询多测点实时值
+
+        命中的测点直接返回，未命中的测点合并为一次 IotApi.find_last_batch 调用。
+
+        Args:
+            points: 测点列表，每个元素包含 device_id 和 point_id
+            **kwargs: 传递给 IotApi.find_last_batch 的参数，例如 chunk_size
+
+        Returns:
+            List[FindLastResponse]: 测点实时值列表，按输入顺序排列
+        """
+        results, missing = self._lookup(points)
+        fetched = self.iot_api.find_last_batch(missing, **kwargs) if missing else []
+        return self._fill(results, points, fetched)
+
+
+class AsyncLiveValueCache(_LiveValueStore):
+    """实时值本地缓存，未命中时通过 AsyncIotApi 查询"""
+
+    def __init__(self, iot_api: AsyncIotApi, max_age: Optional[float] = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        初始化实时值缓存
+
+        Args:
+            iot_api: 缓存未命中时使用的异步 IoT API
+            max_age: 缓存值的最大有效期（秒，从接收时刻算起），为 None 时不过期
+            clock: 单调时钟，用于测试
+        """
+        super().__init__(max_age, clock)
+        self.iot_api = iot_api
+
+    async def find_last(self, device_id: str, point_id: str) -> FindLastResponse:
+        """
+        查询单测点实时值
+
+        Args:
+            device_id: 设备ID
+            point_id: 测点ID
+
+        Returns:
+            FindLastResponse: 测点实时值
+        """
+        result = self.get(device_id, point_id)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = await self.iot_api.find_last(device_id, point_id)
+        if result is not None:
+            self._store(result)
+        return result
+
+    async def find_last_batch(self, points: List[Dict[str, str]], **kwargs) -> List[FindLastResponse]:
+        """
+        批量查询多测点实时值
+
+        命中的测点直接返回，未命中的测点合并为一次 AsyncIotApi.find_last_batch 调用。
+
+        Args:
+            points: 测点列表，每个元素包含 device_id 和 point_id
+            **kwargs: 传递给 AsyncIotApi.find_last_batch 的参数，例如 chunk_size
+
+        Returns:
+            List[FindLastResponse]: 测点实时值列表，按输入顺序排列
+        """
+        results, missing = self._lookup(points)
+        fetched = await self.iot_api.find_last_batch(missing, **kwargs) if missing else []
+        return self._fill(results, points, fetched)
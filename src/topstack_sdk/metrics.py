@@ -0,0 +1,306 @@
+"""
+请求指标
+
+客户端通过 instrumentation 参数接入指标采集。每个请求结束后生成一个 RequestSample，
+记录各阶段耗时（获取令牌、HTTP 往返、JSON 解析、模型校验、重试等待）、收发字节数、
+重试次数和错误类型，交给 Instrumentation.on_request 处理。
+
+MetricsRegistry 是内置的进程内实现，按接口汇总为直方图和计数器，可以直接读取或导出
+为 Prometheus 文本格式。未配置 instrumentation 时不创建采样对象，也不计时。
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+# 默认直方图分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 路径中带ID的接口，汇总时替换为模板，避免标签数量随ID增长
+ENDPOINT_TEMPLATES: Tuple[Tuple[Pattern, str], ...] = (
+    (re.compile(r"^/iot/open_api/v1/device/[^/]+/props$"), "/iot/open_api/v1/device/{id}/props"),
+    (re.compile(r"^/asset/open_api/v1/alert_work_order/[^/]+$"), "/asset/open_api/v1/alert_work_order/{id}"),
+)
+
+# 请求阶段
+PHASES = ("token", "http", "decode", "validate", "backoff")
+
+
+class RequestSample:
+    """单个请求的采样数据，耗时单位为秒"""
+
+    __slots__ = (
+        "method", "endpoint", "status", "error", "attempts", "started",
+        "duration", "token", "http", "ttfb", "decode", "validate", "backoff",
+        "bytes_out", "bytes_in"
+    )
+
+    def __init__(self, method: str, endpoint: str):
+        self.method = method
+        self.endpoint = endpoint
+        self.status = 0
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.token = 0.0
+        self.http = 0.0
+        # 发出请求到收到响应头的时间，只有同步客户端提供
+        self.ttfb: Optional[float] = None
+        self.decode = 0.0
+        self.validate = 0.0
+        self.backoff = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    @property
+    def retries(self) -> int:
+        """重试次数"""
+        return max(0, self.attempts - 1)
+
+    def fail(self, error: BaseException) -> None:
+        """记录请求失败"""
+        self.error = type(error).__name__
+        self.status = getattr(error, "status_code", self.status) or self.status
+
+    def finish(self) -> "RequestSample":
+        """记录总耗时"""
+        self.duration = time.perf_counter() - self.started
+        return self
+
+    def __repr__(self) -> str:
+        return (f"RequestSample({self.method} {self.endpoint}, status={self.status}, "
+                f"duration={self.duration:.4f}, attempts={self.attempts}, error={self.error})")
+
+
+class Instrumentation:
+    """指标采集接口，子类按需覆盖"""
+
+    def on_request(self, sample: RequestSample) -> None:
+        """请求结束（成功或失败）"""
+
+    def on_token_refresh(self, duration: float, success: bool) -> None:
+        """访问令牌请求结束"""
+
+
+class Histogram:
+    """累积分桶直方图"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        估算分位数
+
+        在所在分桶内线性插值，落在最后一个分桶之外时返回最大分桶上限。
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                low = self.buckets[i - 1] if i else 0.0
+                return low + (self.buckets[i] - low) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class _EndpointStats:
+    """单个接口的汇总数据"""
+
+    __slots__ = ("latency", "decode", "statuses", "errors", "phases", "retries", "bytes_out", "bytes_in")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.latency = Histogram(buckets)
+        self.decode = Histogram(buckets)
+        self.statuses: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.retries = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+
+def endpoint_label(endpoint: str) -> str:
+    """接口的汇总标签：路径中的ID替换为 {id}"""
+    for pattern, template in ENDPOINT_TEMPLATES:
+        if pattern.match(endpoint):
+            return template
+    return endpoint
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: Any) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+class MetricsRegistry(Instrumentation):
+    """
+    进程内指标汇总
+
+    按 (HTTP 方法, 接口) 汇总请求耗时直方图、各阶段耗时、状态码、错误类型、重试次数与
+    收发字节数。接口数超过 max_endpoints 后新接口汇总到 other。线程安全。
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, max_endpoints: int = 200):
+        """
+        Args:
+            buckets: 直方图分桶上限（秒）
+            max_endpoints: 最多单独汇总的接口数
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.max_endpoints = max_endpoints
+        self._endpoints: Dict[Tuple[str, str], _EndpointStats] = {}
+        self._token = Histogram(self.buckets)
+        self._token_failures = 0
+        self._lock = threading.Lock()
+
+    def on_request(self, sample: RequestSample) -> None:
+        key = (sample.method, endpoint_label(sample.endpoint))
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                if len(self._endpoints) >= self.max_endpoints:
+                    key = (sample.method, "other")
+                    stats = self._endpoints.get(key)
+                if stats is None:
+                    stats = self._endpoints[key] = _EndpointStats(self.buckets)
+            stats.latency.observe(sample.duration)
+            stats.decode.observe(sample.decode + sample.validate)
+            stats.statuses[sample.status] = stats.statuses.get(sample.status, 0) + 1
+            if sample.error is not None:
+                stats.errors[sample.error] = stats.errors.get(sample.error, 0) + 1
+            phases = stats.phases
+            phases["token"] += sample.token
+            phases["http"] += sample.http
+            phases["decode"] += sample.decode
+            phases["validate"] += sample.validate
+            phases["backoff"] += sample.backoff
+            stats.retries += sample.retries
+            stats.bytes_out += sample.bytes_out
+            stats.bytes_in += sample.bytes_in
+
+    def on_token_refresh(self, duration: float, success: bool) -> None:
+        with self._lock:
+            self._token.observe(duration)
+            if not success:
+                self._token_failures += 1
+
+    def reset(self) -> None:
+        """清空全部指标"""
+        with self._lock:
+            self._endpoints.clear()
+            self._token = Histogram(self.buckets)
+            self._token_failures = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        读取当前指标
+
+        Returns:
+            {"endpoints": [每个接口的汇总], "token_refreshes": 次数, "token_refresh_failures": 失败次数,
+             "token_refresh_seconds": 总耗时}
+        """
+        with self._lock:
+            endpoints = []
+            for (method, endpoint), stats in sorted(self._endpoints.items(), key=lambda kv: kv[0]):
+                latency = stats.latency
+                endpoints.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": latency.count,
+                    "errors": dict(stats.errors),
+                    "statuses": dict(stats.statuses),
+                    "retries": stats.retries,
+                    "bytes_out": stats.bytes_out,
+                    "bytes_in": stats.bytes_in,
+                    "latency_avg": latency.sum / latency.count if latency.count else None,
+                    "latency_p50": latency.quantile(0.5),
+                    "latency_p99": latency.quantile(0.99),
+                    "phases": dict(stats.phases),
+                })
+            return {
+                "endpoints": endpoints,
+                "token_refreshes": self._token.count,
+                "token_refresh_failures": self._token_failures,
+                "token_refresh_seconds": self._token.sum,
+            }
+
+    def to_prometheus(self, prefix: str = "topstack") -> str:
+        """导出为 Prometheus 文本格式"""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name: str, hist: Histogram, **labels: Any) -> None:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), hist.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{prefix}_{name}_bucket{{{_labels(**labels, le=le)}}} {cumulative}")
+            lines.append(f"{prefix}_{name}_sum{{{_labels(**labels)}}} {hist.sum!r}")
+            lines.append(f"{prefix}_{name}_count{{{_labels(**labels)}}} {hist.count}")
+
+        with self._lock:
+            items = sorted(self._endpoints.items(), key=lambda kv: kv[0])
+
+            header("requests_total", "counter", "请求数")
+            for (method, endpoint), stats in items:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f"{prefix}_requests_total{{{_labels(method=method, endpoint=endpoint, status=status)}}} {count}")
+
+            header("request_errors_total", "counter", "失败请求数")
+            for (method, endpoint), stats in items:
+                for error, count in sorted(stats.errors.items()):
+                    lines.append(f"{prefix}_request_errors_total{{{_labels(method=method, endpoint=endpoint, error=error)}}} {count}")
+
+            header("request_duration_seconds", "histogram", "请求总耗时")
+            for (method, endpoint), stats in items:
+                histogram("request_duration_seconds", stats.latency, method=method, endpoint=endpoint)
+
+            header("response_decode_seconds", "histogram", "响应解析与校验耗时")
+            for (method, endpoint), stats in items:
+                histogram("response_decode_seconds", stats.decode, method=method, endpoint=endpoint)
+
+            header("request_phase_seconds_total", "counter", "各阶段累计耗时")
+            for (method, endpoint), stats in items:
+                for phase, seconds in stats.phases.items():
+                    lines.append(f"{prefix}_request_phase_seconds_total{{{_labels(method=method, endpoint=endpoint, phase=phase)}}} {seconds!r}")
+
+            for name, attr, help in (
+                ("request_retries_total", "retries", "重试次数"),
+                ("request_bytes_sent_total", "bytes_out", "请求体字节数"),
+                ("request_bytes_received_total", "bytes_in", "响应体字节数"),
+            ):
+                header(name, "counter", help)
+                for (method, endpoint), stats in items:
+                    lines.append(f"{prefix}_{name}{{{_labels(method=method, endpoint=endpoint)}}} {getattr(stats, attr)}")
+
+            header("token_refreshes_total", "counter", "访问令牌请求次数")
+            lines.append(f"{prefix}_token_refreshes_total{{{_labels(result='success')}}} {self._token.count - self._token_failures}")
+            lines.append(f"{prefix}_token_refreshes_total{{{_labels(result='failure')}}} {self._token_failures}")
+            header("token_refresh_seconds_total", "counter", "访问令牌请求累计耗时")
+            lines.append(f"{prefix}_token_refresh_seconds_total {self._token.sum!r}")
+
+        return "\n".join(lines) + "\n"
@@ -1,11 +1,15 @@
-import json
-import logging
 import asyncio
-from datetime import datetime
-from typing import Callable, Optional, Any, Dict, Union
+import logging
+import sys
+import weakref
+from array import array
+from typing import Callable, Optional, Any, Dict, Iterator, List, Union
 import nats
+from nats.errors import SlowConsumerError
 from nats.aio.client import Client as NATSClient
-from nats.aio.subscription import Subscription
+from .codec import JsonCodec
+from .timestamps import LazyTimestamp, RawTimestamp, epoch_ms
+from .dispatch import BatchBuffer, Dispatcher, SubscriptionHandle
 
 
 class NatsConfig:
@@ -18,11 +22,25 @@ class NatsConfig:
         self.password = password
 
 
+def _intern(value: Optional[str]) -> Optional[str]:
+    """驻留 ID 字符串，大量消息引用同一个设备/测点时共享同一个字符串对象"""
+    return sys.intern(value) if type(value) is str else value
+
+
 class PointData:
-    """测点数据结构"""
+    """
+    测点数据结构
+
+    timestamp 保存消息中的原始时间（毫秒时间戳或 ISO 字符串），首次读取时转换为 UTC datetime。
+    """
+    
+    __slots__ = ('device_id', 'point_id', 'value', 'quality', '_timestamp', 'status',
+                 'device_type_id', 'project_id', 'gateway_id', 'not_save')
+    
+    timestamp = LazyTimestamp()
     
     def __init__(self, device_id: str = None, point_id: str = None, value: Any = None, 
-                 quality: int = None, timestamp: datetime = None, status: int = None,
+                 quality: int = None, timestamp: RawTimestamp = None, status: int = None,
                  device_type_id: str = None, project_id: str = None, gateway_id: str = None,
                  not_save: bool = False):
         self.device_id = device_id
@@ -36,35 +54,113 @@ class PointData:
         self.gateway_id = gateway_id
         self.not_save = not_save
     
+    @property
+    def timestamp_ms(self) -> Optional[int]:
+        """毫秒时间戳，原始值为数值时不构建 datetime"""
+        return epoch_ms(self._timestamp)
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PointData':
         """从字典创建 PointData 对象"""
-        timestamp = None
-        if 'timestamp' in data and data['timestamp']:
-            if isinstance(data['timestamp'], str):
-                timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-            elif isinstance(data['timestamp'], (int, float)):
-                timestamp = datetime.fromtimestamp(data['timestamp'] / 1000)
-        
         return cls(
-            device_id=data.get('deviceID'),
-            point_id=data.get('pointID'),
+            device_id=_intern(data.get('deviceID')),
+            point_id=_intern(data.get('pointID')),
             value=data.get('value'),
             quality=data.get('quality'),
-            timestamp=timestamp,
+            timestamp=data.get('timestamp') or None,
             status=data.get('status'),
-            device_type_id=data.get('deviceTypeID'),
-            project_id=data.get('projectID'),
-            gateway_id=data.get('gatewayID'),
+            device_type_id=_intern(data.get('deviceTypeID')),
+            project_id=_intern(data.get('projectID')),
+            gateway_id=_intern(data.get('gatewayID')),
             not_save=data.get('notSave', False)
         )
 
 
+def _raw_message(data: Dict[str, Any]) -> Dict[str, Any]:
+    return data
+
+
+class PointDataArray:
+    """
+    列式存储的测点数据序列
+
+    ID 列为驻留字符串列表，数据质量、状态和毫秒时间戳保存在 array 中，不为每条数据
+    创建对象。数值列 quality、status、timestamps 支持缓冲区协议，可直接
+    numpy.frombuffer。
+    """
+    
+    __slots__ = ('device_ids', 'point_ids', 'values', 'quality', 'status', 'timestamps')
+    
+    def __init__(self):
+        self.device_ids: List[str] = []
+        self.point_ids: List[str] = []
+        self.values: List[Any] = []
+        self.quality = array('b')  # 缺失时为 0
+        self.status = array('i')  # 缺失时为 0
+        self.timestamps = array('q')  # 毫秒时间戳，缺失时为 0
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def __getitem__(self, index: int) -> PointData:
+        timestamp = self.timestamps[index]
+        return PointData(
+            device_id=self.device_ids[index],
+            point_id=self.point_ids[index],
+            value=self.values[index],
+            quality=self.quality[index],
+            timestamp=timestamp or None,
+            status=self.status[index]
+        )
+    
+    def __iter__(self) -> Iterator[PointData]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def append_dict(self, data: Dict[str, Any]) -> None:
+        """追加一条消息字典"""
+        self.device_ids.append(_intern(data.get('deviceID')))
+        self.point_ids.append(_intern(data.get('pointID')))
+        self.values.append(data.get('value'))
+        self.quality.append(data.get('quality') or 0)
+        self.status.append(data.get('status') or 0)
+        self.timestamps.append(epoch_ms(data.get('timestamp')) or 0)
+    
+    def append(self, point_data: PointData) -> None:
+        """追加一条 PointData"""
+        self.device_ids.append(_intern(point_data.device_id))
+        self.point_ids.append(_intern(point_data.point_id))
+        self.values.append(point_data.value)
+        self.quality.append(point_data.quality or 0)
+        self.status.append(point_data.status or 0)
+        self.timestamps.append(point_data.timestamp_ms or 0)
+    
+    @classmethod
+    def from_dicts(cls, items: List[Dict[str, Any]]) -> 'PointDataArray':
+        """从消息字典列表创建"""
+        result = cls()
+        for data in items:
+            result.append_dict(data)
+        return result
+    
+    @classmethod
+    def from_points(cls, points: List[PointData]) -> 'PointDataArray':
+        """从 PointData 列表创建"""
+        result = cls()
+        for point_data in points:
+            result.append(point_data)
+        return result
+
+
 class GatewayState:
     """网关状态数据结构"""
     
+    __slots__ = ('sn', 'name', 'project_id', 'gateway_id', 'state', '_timestamp')
+    
+    timestamp = LazyTimestamp()
+    
     def __init__(self, sn: str = None, name: str = None, project_id: str = None,
-                 gateway_id: str = None, state: int = None, timestamp: datetime = None):
+                 gateway_id: str = None, state: int = None, timestamp: RawTimestamp = None):
         self.sn = sn
         self.name = name
         self.project_id = project_id
@@ -75,28 +171,25 @@ class GatewayState:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GatewayState':
         """从字典创建 GatewayState 对象"""
-        timestamp = None
-        if 'timestamp' in data and data['timestamp']:
-            if isinstance(data['timestamp'], str):
-                timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-            elif isinstance(data['timestamp'], (int, float)):
-                timestamp = datetime.fromtimestamp(data['timestamp'] / 1000)
-        
         return cls(
             sn=data.get('sn'),
             name=data.get('name'),
-            project_id=data.get('projectID'),
-            gateway_id=data.get('gatewayID'),
+            project_id=_intern(data.get('projectID')),
+            gateway_id=_intern(data.get('gatewayID')),
             state=data.get('state'),
-            timestamp=timestamp
+            timestamp=data.get('timestamp') or None
         )
 
 
 class DeviceState:
     """设备状态数据结构"""
     
+    __slots__ = ('project_id', 'gateway_id', 'device_id', 'state', '_timestamp')
+    
+    timestamp = LazyTimestamp()
+    
     def __init__(self, project_id: str = None, gateway_id: str = None, device_id: str = None,
-                 state: int = None, timestamp: datetime = None):
+                 state: int = None, timestamp: RawTimestamp = None):
         self.project_id = project_id
         self.gateway_id = gateway_id
         self.device_id = device_id
@@ -106,27 +199,25 @@ class DeviceState:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DeviceState':
         """从字典创建 DeviceState 对象"""
-        timestamp = None
-        if 'timestamp' in data and data['timestamp']:
-            if isinstance(data['timestamp'], str):
-                timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-            elif isinstance(data['timestamp'], (int, float)):
-                timestamp = datetime.fromtimestamp(data['timestamp'] / 1000)
-        
         return cls(
-            project_id=data.get('projectID'),
-            gateway_id=data.get('gatewayID'),
-            device_id=data.get('deviceID'),
+            project_id=_intern(data.get('projectID')),
+            gateway_id=_intern(data.get('gatewayID')),
+            device_id=_intern(data.get('deviceID')),
             state=data.get('state'),
-            timestamp=timestamp
+            timestamp=data.get('timestamp') or None
         )
 
 
 class ChannelState:
     """数据通道状态数据结构"""
     
+    __slots__ = ('project_id', 'gateway_id', 'channel_id', 'running', 'connected', '_timestamp',
+                 'gateway_name', 'channel_name')
+    
+    timestamp = LazyTimestamp()
+    
     def __init__(self, project_id: str = None, gateway_id: str = None, channel_id: str = None,
-                 running: bool = None, connected: bool = None, timestamp: datetime = None,
+                 running: bool = None, connected: bool = None, timestamp: RawTimestamp = None,
                  gateway_name: str = None, channel_name: str = None):
         self.project_id = project_id
         self.gateway_id = gateway_id
@@ -140,30 +231,40 @@ class ChannelState:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ChannelState':
         """从字典创建 ChannelState 对象"""
-        timestamp = None
-        if 'timestamp' in data and data['timestamp']:
-            if isinstance(data['timestamp'], str):
-                timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-            elif isinstance(data['timestamp'], (int, float)):
-                timestamp = datetime.fromtimestamp(data['timestamp'] / 1000)
-        
         return cls(
-            project_id=data.get('projectID'),
-            gateway_id=data.get('gatewayID'),
-            channel_id=data.get('channelID'),
+            project_id=_intern(data.get('projectID')),
+            gateway_id=_intern(data.get('gatewayID')),
+            channel_id=_intern(data.get('channelID')),
             running=data.get('running'),
             connected=data.get('connected'),
-            timestamp=timestamp,
+            timestamp=data.get('timestamp') or None,
             gateway_name=data.get('gatewayName'),
             channel_name=data.get('channelName')
         )
 
 
 class AlertInfo:
-    """告警信息数据结构"""
+    """
+    告警信息数据结构
+
+    created_at 等时间字段保存消息中的原始值，首次读取时转换为 UTC datetime。
+    """
+    
+    __slots__ = ('alert_id', 'status', '_created_at', '_recovered_at', '_handled_at', '_expired_at',
+                 'handler', 'order_created', 'edge', 'title', 'content', 'remark', 'rule_template_id',
+                 'trigger_id', 'mode', 'compare_mode', 'compare_value', 'duration', 'input_value',
+                 'point_id', 'dead_band', 'diff', 'project_id', 'device_id', 'alert_type_id',
+                 'alert_level_id', 'rule_name', 'alert_type_name', 'alert_type_code', 'alert_level_code',
+                 'alert_level_color', 'alert_level_name', 'device_name', 'point_name', 'device_type_id',
+                 'device_group_id', 'device_attr')
     
-    def __init__(self, alert_id: str = None, status: str = None, created_at: datetime = None,
-                 recovered_at: datetime = None, handled_at: datetime = None, expired_at: datetime = None,
+    created_at = LazyTimestamp()
+    recovered_at = LazyTimestamp()
+    handled_at = LazyTimestamp()
+    expired_at = LazyTimestamp()
+    
+    def __init__(self, alert_id: str = None, status: str = None, created_at: RawTimestamp = None,
+                 recovered_at: RawTimestamp = None, handled_at: RawTimestamp = None, expired_at: RawTimestamp = None,
                  handler: str = None, order_created: bool = None, edge: bool = None, title: str = None,
                  content: str = None, remark: str = None, rule_template_id: str = None, trigger_id: str = None,
                  mode: str = None, compare_mode: str = None, compare_value: str = None, duration: int = None,
@@ -214,42 +315,33 @@ class AlertInfo:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AlertInfo':
         """从字典创建 AlertInfo 对象"""
-        def parse_datetime(value):
-            if not value:
-                return None
-            if isinstance(value, str):
-                return datetime.fromisoformat(value.replace('Z', '+00:00'))
-            elif isinstance(value, (int, float)):
-                return datetime.fromtimestamp(value / 1000)
-            return None
-        
         return cls(
             alert_id=data.get('id'),
             status=data.get('status'),
-            created_at=parse_datetime(data.get('createdAt')),
-            recovered_at=parse_datetime(data.get('recoveredAt')),
-            handled_at=parse_datetime(data.get('handledAt')),
-            expired_at=parse_datetime(data.get('expiredAt')),
+            created_at=data.get('createdAt') or None,
+            recovered_at=data.get('recoveredAt') or None,
+            handled_at=data.get('handledAt') or None,
+            expired_at=data.get('expiredAt') or None,
             handler=data.get('handler'),
             order_created=data.get('orderCreated'),
             edge=data.get('edge'),
             title=data.get('title'),
             content=data.get('content'),
             remark=data.get('remark'),
-            rule_template_id=data.get('ruleTemplateID'),
-            trigger_id=data.get('triggerID'),
+            rule_template_id=_intern(data.get('ruleTemplateID')),
+            trigger_id=_intern(data.get('triggerID')),
             mode=data.get('mode'),
             compare_mode=data.get('compareMode'),
             compare_value=data.get('compareValue'),
             duration=data.get('duration'),
             input_value=data.get('inputValue'),
-            point_id=data.get('pointID'),
+            point_id=_intern(data.get('pointID')),
             dead_band=data.get('deadBand'),
             diff=data.get('diff'),
-            project_id=data.get('projectID'),
-            device_id=data.get('deviceID'),
-            alert_type_id=data.get('alertTypeID'),
-            alert_level_id=data.get('alertLevelID'),
+            project_id=_intern(data.get('projectID')),
+            device_id=_intern(data.get('deviceID')),
+            alert_type_id=_intern(data.get('alertTypeID')),
+            alert_level_id=_intern(data.get('alertLevelID')),
             rule_name=data.get('ruleName'),
             alert_type_name=data.get('alertTypeName'),
             alert_type_code=data.get('alertTypeCode'),
@@ -258,154 +350,239 @@ class AlertInfo:
             alert_level_name=data.get('alertLevelName'),
             device_name=data.get('deviceName'),
             point_name=data.get('pointName'),
-            device_type_id=data.get('deviceTypeID'),
-            device_group_id=data.get('deviceGroupID'),
+            device_type_id=_intern(data.get('deviceTypeID')),
+            device_group_id=_intern(data.get('deviceGroupID')),
             device_attr=data.get('deviceAttr', {})
         ) 
 
 
 class NatsBus:
-    """NATS 消息总线"""
+    """
+    NATS 消息总线
+
+    默认每个主题单独订阅，只接收订阅的消息。shared 为 True 时同一项目、同一类主题的
+    订阅共享一个 NATS 通配订阅，由 Dispatcher 按主题分发到各个回调，大量订阅单个测点时
+    不会在服务端创建大量订阅；但会接收整个项目的消息，并且所有回调在同一个 NATS 订阅中
+    依次执行，一个回调处理慢会拖慢其它回调。
+
+    stats 读取各订阅的吞吐、解析与回调耗时、待处理队列和丢弃数。自行创建 NATS 连接时，
+    需要在 nats.connect 的 error_cb 中调用 on_error 才能统计 slow consumer 丢弃的消息。
+    """
     
-    def __init__(self, conn: NATSClient):
+    def __init__(self, conn: NATSClient, shared: bool = False, codec: Union[str, JsonCodec, None] = None):
         self.conn = conn
+        self.shared = shared
         self.logger = logging.getLogger(__name__)
+        self.dispatcher = Dispatcher(conn, self.logger, codec)
+        self._buffers: "weakref.WeakSet[BatchBuffer]" = weakref.WeakSet()
+        self._reporter: Optional[asyncio.Task] = None
     
     async def close(self):
         """关闭连接"""
+        self.stop_stats_reporter()
         if self.conn:
             await self.conn.close()
+
+    async def on_error(self, error: Exception) -> None:
+        """NATS 客户端错误回调，统计 slow consumer 丢弃的消息"""
+        if isinstance(error, SlowConsumerError):
+            self.dispatcher.record_dropped(error.sub)
+
+    def stats(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        读取订阅统计
+
+        速率和平均耗时为距离上次调用 stats 的值，首次调用为订阅以来的值。
+
+        Returns:
+            {"subscriptions": 每个 NATS 订阅的统计，字段见 Dispatcher.stats,
+             "batches": 每个批量订阅缓冲区的 topic、buffered、max_buffer、delivered、dropped}
+        """
+        batches = [
+            {
+                "topic": buffer.handle.topic if buffer.handle is not None else None,
+                "buffered": len(buffer),
+                "max_buffer": buffer.max_buffer,
+                "delivered": buffer.delivered,
+                "dropped": buffer.dropped,
+            }
+            for buffer in list(self._buffers)
+        ]
+        return {"subscriptions": self.dispatcher.stats(), "batches": batches}
+
+    def start_stats_reporter(
+        self,
+        interval: float = 60.0,
+        callback: Optional[Callable[[Dict[str, List[Dict[str, Any]]]], Any]] = None,
+        pending_warning: float = 0.8
+    ) -> asyncio.Task:
+        """
+        定期输出订阅统计
+
+        callback 为空时写入日志：每个订阅一条 info；待处理队列超过上限的 pending_warning
+        比例，或本周期内有消息被丢弃时输出 warning。
+
+        Args:
+            interval: 输出间隔（秒）
+            callback: 接收 stats 结果的回调函数，可以是协程函数
+            pending_warning: 待处理队列告警比例
+
+        Returns:
+            asyncio.Task: 输出任务，close 时自动停止
+        """
+        self.stop_stats_reporter()
+        self._reporter = asyncio.ensure_future(self._report_stats(interval, callback, pending_warning))
+        return self._reporter
+
+    def stop_stats_reporter(self) -> None:
+        """停止定期输出"""
+        if self._reporter is not None:
+            self._reporter.cancel()
+            self._reporter = None
+
+    async def _report_stats(self, interval: float, callback: Optional[Callable[[Any], Any]],
+                            pending_warning: float) -> None:
+        dropped: Dict[str, int] = {}
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.stats()
+            if callback is not None:
+                try:
+                    result = callback(stats)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    self.logger.error(f"订阅统计回调出错: {e}")
+                continue
+            for item in stats["subscriptions"]:
+                self._log_stats(item, item["dropped"] - dropped.get(item["subject"], 0), pending_warning)
+                dropped[item["subject"]] = item["dropped"]
+            for item in stats["batches"]:
+                key = f"batch:{item['topic']}"
+                if item["dropped"] > dropped.get(key, 0):
+                    self.logger.warning(f"批量订阅 {item['topic']} 缓冲区已满，丢弃 {item['dropped'] - dropped.get(key, 0)} 条消息")
+                dropped[key] = item["dropped"]
+
+    def _log_stats(self, item: Dict[str, Any], dropped: int, pending_warning: float) -> None:
+        def us(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value:.1f}"
+
+        self.logger.info(
+            f"订阅 {item['subject']}: {item['msgs_per_sec']:.1f} 条/秒, {item['bytes_per_sec']:.0f} 字节/秒, "
+            f"解析 {us(item['parse_us'])} µs, 回调 {us(item['callback_us'])} µs, "
+            f"待处理 {item['pending_msgs']} 条/{item['pending_bytes']} 字节, "
+            f"解析失败 {item['parse_failures']}, 丢弃 {item['dropped']}"
+        )
+        lagging = any(
+            isinstance(item[pending], int) and isinstance(item[limit], int) and item[limit] > 0
+            and item[pending] >= item[limit] * pending_warning
+            for pending, limit in (("pending_msgs", "pending_msgs_limit"), ("pending_bytes", "pending_bytes_limit"))
+        )
+        if lagging:
+            self.logger.warning(f"订阅 {item['subject']} 待处理队列接近上限，消费速度跟不上")
+        if dropped > 0:
+            self.logger.warning(f"订阅 {item['subject']} 本周期丢弃 {dropped} 条消息（slow consumer）")
+    
+    async def _subscribe(self, shared_subject: str, topic: str, decode: Callable[[Dict[str, Any]], Any],
+                         callback: Callable[[Any], None], error_message: str) -> SubscriptionHandle:
+        subject = shared_subject if self.shared else topic
+        return await self.dispatcher.register(subject, topic, decode, callback, error_message)
     
     async def subscribe_point_data(self, project_id: str, device_id: str, point_id: str,
-                                 callback: Callable[[PointData], None]) -> Subscription:
+                                 callback: Callable[[PointData], None]) -> SubscriptionHandle:
         """订阅设备测点数据"""
         topic = self._realtime_point_topic(project_id, device_id, point_id)
-        
-        async def message_handler(msg):
-            try:
-                data = json.loads(msg.data.decode())
-                point_data = PointData.from_dict(data)
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(point_data)
-                else:
-                    callback(point_data)
-            except Exception as e:
-                self.logger.error(f"解析实时测点数据错误: {e}")
-        
-        return await self.conn.subscribe(topic, cb=message_handler)
+        return await self._subscribe(self._project_point_topic(project_id), topic,
+                                     PointData.from_dict, callback, "解析实时测点数据错误")
     
     async def subscribe_device_type_data(self, project_id: str, device_type_id: str, point_id: str,
-                                       callback: Callable[[PointData], None]) -> Subscription:
+                                       callback: Callable[[PointData], None]) -> SubscriptionHandle:
         """订阅同设备模型下的测点数据"""
         topic = self._realtime_point_topic_v2(project_id, device_type_id, "*", point_id)
-        
-        async def message_handler(msg):
-            try:
-                data = json.loads(msg.data.decode())
-                point_data = PointData.from_dict(data)
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(point_data)
-                else:
-                    callback(point_data)
-            except Exception as e:
-                self.logger.error(f"解析实时测点数据错误: {e}")
-        
-        return await self.conn.subscribe(topic, cb=message_handler)
+        return await self._subscribe(self._project_point_topic(project_id), topic,
+                                     PointData.from_dict, callback, "解析实时测点数据错误")
+    
+    async def subscribe_project_point_data(self, project_id: str,
+                                         callback: Callable[[PointData], None]) -> SubscriptionHandle:
+        """订阅项目下全部设备的测点数据"""
+        topic = self._project_point_topic(project_id)
+        return await self._subscribe(topic, topic, PointData.from_dict, callback, "解析实时测点数据错误")
+    
+    async def subscribe_point_data_batch(self, project_id: str, callback: Callable[[List[PointData]], None],
+                                         device_id: str = "*", point_id: str = "*", device_type_id: str = "*",
+                                         max_batch: int = 500, max_delay: float = 0.1,
+                                         max_buffer: int = 10000, overflow: str = "drop_oldest",
+                                         columnar: bool = False) -> BatchBuffer:
+        """
+        批量订阅测点数据
+
+        攒够 max_batch 条或距本批第一条数据超过 max_delay 秒时，以列表形式一次交给回调。
+        columnar 为 True 时消息不转换为 PointData，每批直接写入 PointDataArray。
+
+        Args:
+            project_id: 项目ID
+            callback: 批量回调函数，参数为 PointData 列表或 PointDataArray
+            device_id: 设备ID，默认全部设备
+            point_id: 测点ID，默认全部测点
+            device_type_id: 设备模型ID，默认全部模型
+            max_batch: 每批最大数据条数
+            max_delay: 每批最长等待时间（秒）
+            max_buffer: 缓冲区最大数据条数
+            overflow: 缓冲区满时的处理方式：drop_oldest,drop_newest,block
+            columnar: 是否以 PointDataArray 形式交给回调
+
+        Returns:
+            BatchBuffer: 批量缓冲区，调用 unsubscribe 取消订阅并投递剩余数据
+        """
+        buffer = BatchBuffer(callback, max_batch, max_delay, max_buffer, overflow, self.logger,
+                             PointDataArray.from_dicts if columnar else None)
+        topic = self._realtime_point_topic_v2(project_id, device_type_id, device_id, point_id)
+        decode = _raw_message if columnar else PointData.from_dict
+        buffer.handle = await self._subscribe(self._project_point_topic(project_id), topic,
+                                              decode, buffer.sink, "解析实时测点数据错误")
+        buffer.start()
+        self._buffers.add(buffer)
+        return buffer
     
     async def subscribe_device_state(self, project_id: str, device_id: str,
-                                   callback: Callable[[DeviceState], None]) -> Subscription:
+                                   callback: Callable[[DeviceState], None]) -> SubscriptionHandle:
         """订阅设备状态数据"""
         topic = self._device_state_topic(project_id, device_id)
-        
-        async def message_handler(msg):
-            try:
-                data = json.loads(msg.data.decode())
-                device_state = DeviceState.from_dict(data)
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(device_state)
-                else:
-                    callback(device_state)
-            except Exception as e:
-                self.logger.error(f"解析设备状态数据错误: {e}")
-        
-        return await self.conn.subscribe(topic, cb=message_handler)
+        return await self._subscribe(self._device_state_topic(project_id, "*"), topic,
+                                     DeviceState.from_dict, callback, "解析设备状态数据错误")
     
     async def subscribe_gateway_state(self, project_id: str,
-                                    callback: Callable[[GatewayState], None]) -> Subscription:
+                                    callback: Callable[[GatewayState], None]) -> SubscriptionHandle:
         """订阅网关状态数据"""
         topic = self._gateway_state_topic(project_id, "*")
-        
-        async def message_handler(msg):
-            try:
-                data = json.loads(msg.data.decode())
-                gateway_state = GatewayState.from_dict(data)
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(gateway_state)
-                else:
-                    callback(gateway_state)
-            except Exception as e:
-                self.logger.error(f"解析网关状态数据错误: {e}")
-        
-        return await self.conn.subscribe(topic, cb=message_handler)
+        return await self._subscribe(topic, topic, GatewayState.from_dict, callback, "解析网关状态数据错误")
     
     async def subscribe_channel_state(self, project_id: str,
-                                    callback: Callable[[ChannelState], None]) -> Subscription:
+                                    callback: Callable[[ChannelState], None]) -> SubscriptionHandle:
         """订阅数据通道状态数据"""
         topic = self._channel_state_topic(project_id, "*")
-        
-        async def message_handler(msg):
-            try:
-                data = json.loads(msg.data.decode())
-                channel_state = ChannelState.from_dict(data)
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(channel_state)
-                else:
-                    callback(channel_state)
-            except Exception as e:
-                self.logger.error(f"解析数据通道状态数据错误: {e}")
-        
-        return await self.conn.subscribe(topic, cb=message_handler)
+        return await self._subscribe(topic, topic, ChannelState.from_dict, callback, "解析数据通道状态数据错误")
     
     async def subscribe_alert_info(self, project_id: str,
-                                 callback: Callable[[AlertInfo], None]) -> Subscription:
+                                 callback: Callable[[AlertInfo], None]) -> SubscriptionHandle:
         """订阅全部告警消息"""
         topic = self._alert_topic(project_id)
-        
-        async def message_handler(msg):
-            try:
-                data = json.loads(msg.data.decode())
-                alert_info = AlertInfo.from_dict(data)
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(alert_info)
-                else:
-                    callback(alert_info)
-            except Exception as e:
-                self.logger.error(f"解析告警信息数据错误: {e}")
-        
-        return await self.conn.subscribe(topic, cb=message_handler)
+        return await self._subscribe(topic, topic, AlertInfo.from_dict, callback, "解析告警信息数据错误")
     
     async def subscribe_device_alert_info(self, project_id: str, device_id: str,
-                                        callback: Callable[[AlertInfo], None]) -> Subscription:
+                                        callback: Callable[[AlertInfo], None]) -> SubscriptionHandle:
         """订阅设备告警信息"""
         topic = self._device_alert_topic(project_id, device_id)
-        
-        async def message_handler(msg):
-            try:
-                data = json.loads(msg.data.decode())
-                alert_info = AlertInfo.from_dict(data)
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(alert_info)
-                else:
-                    callback(alert_info)
-            except Exception as e:
-                self.logger.error(f"解析告警信息数据错误: {e}")
-        
-        return await self.conn.subscribe(topic, cb=message_handler)
+        return await self._subscribe(self._alert_topic(project_id), topic,
+                                     AlertInfo.from_dict, callback, "解析告警信息数据错误")
     
     # Topic 生成方法
     def _realtime_point_topic_v2(self, project_id: str, device_type_id: str, device_id: str, point_id: str) -> str:
         return f"iot.platform.device.datas.{project_id}.{device_type_id}.{device_id}.{point_id}"
     
+    def _project_point_topic(self, project_id: str) -> str:
+        return f"iot.platform.device.datas.{project_id}.>"
+    
     def _realtime_point_topic(self, project_id: str, device_id: str, point_id: str) -> str:
         return self._realtime_point_topic_v2(project_id, "*", device_id, point_id)
     
@@ -427,12 +604,36 @@ class NatsBus:
         return f"iot.platform.alert.{project_id}.{device_id}"
 
 
-async def create_nats_bus(config: NatsConfig, **options) -> NatsBus:
-    """创建 NATS 总线实例"""
+async def create_nats_bus(config: NatsConfig, shared: bool = False,
+                          codec: Union[str, JsonCodec, None] = None, **options) -> NatsBus:
+    """
+    创建 NATS 总线实例
+
+    Args:
+        config: NATS 配置
+        shared: 是否让同类主题的订阅共享一个 NATS 通配订阅，默认每个主题单独订阅
+        codec: JSON 编解码器实例或名称：auto,orjson,msgspec,json，默认自动选择
+        **options: 传递给 nats.connect 的参数，其中的 error_cb 在统计 slow consumer 之后调用
+    """
     opts = {}
     
     # 更新配置
     opts.update(options)
+
+    # 统计 slow consumer 丢弃的消息，再交给调用方的错误回调
+    buses: List[NatsBus] = []
+    user_error_cb = opts.get('error_cb')
+    logger = logging.getLogger(__name__)
+
+    async def error_cb(e):
+        for bus in buses:
+            await bus.on_error(e)
+        if user_error_cb is not None:
+            await user_error_cb(e)
+        else:
+            logger.error(f"NATS 错误: {e}")
+
+    opts['error_cb'] = error_cb
     
     # 设置认证信息
     if config.token:
@@ -444,6 +645,8 @@ async def create_nats_bus(config: NatsConfig, **options) -> NatsBus:
     
     try:
         nc = await nats.connect(config.addr, **opts)
-        return NatsBus(nc)
+        bus = NatsBus(nc, shared, codec)
+        buses.append(bus)
+        return bus
     except Exception as e:
         raise Exception(f"创建 NATS 连接错误: {e}") 
\ No newline at end of file
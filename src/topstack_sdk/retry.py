@@ -0,0 +1,320 @@
+"""
+请求重试策略
+
+平台重启或过载时，调用方各自的重试循环会同时打向服务端，拖慢恢复。这里提供客户端内置的重试策略：
+
+- 只重试幂等请求：GET 与只读的查询接口，setValue 等写接口默认不重试
+- 退避时间使用 decorrelated jitter，服务端返回 Retry-After 时不早于其指定的时间
+- 全局重试预算限制重试占请求总数的比例，避免故障期间放大流量
+- 按接口熔断：连续失败达到阈值后在冷却时间内直接失败，冷却结束后放行探测请求
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Mapping, Optional, Union
+
+# 可重试的 HTTP 状态码，另外连接失败、超时等传输错误（状态码 0）也会重试
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# 幂等的 HTTP 方法
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# 使用 POST 的只读查询接口，可以安全重试
+IDEMPOTENT_ENDPOINTS = (
+    "/iot/open_api/v1/data/findLast",
+    "/iot/open_api/v1/data/findLastBatch",
+    "/iot/open_api/v1/data/query",
+    "/iot/open_api/v1/data/query_device",
+    "/iot/open_api/v1/device/query",
+    "/iot/open_api/v1/device_point/query",
+    "/ems/open_api/v1/meter/query",
+    "/ems/open_api/v1/meter/detail",
+    "/ems/open_api/v1/sector/query",
+    "/ems/open_api/v1/sector/detail",
+    "/ems/open_api/v1/subentry/query",
+    "/ems/open_api/v1/subentry/detail",
+)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    解析 Retry-After 头部
+
+    Args:
+        value: 秒数或 HTTP 日期
+        now: 当前时间，用于计算 HTTP 日期的剩余秒数
+
+    Returns:
+        需要等待的秒数，无法解析时返回 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return max(0.0, (at - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class RetryBudget:
+    """
+    全局重试预算
+
+    每个请求存入 ratio 个令牌，每次重试取出 1 个，因此持续故障时重试数不超过请求数的
+    ratio 倍；另外每秒补充 min_per_second 个，低流量时也能重试。令牌数不超过 capacity。
+    同步与异步客户端可以共用。
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        capacity: float = 20.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            ratio: 每个请求存入的令牌数
+            min_per_second: 每秒补充的令牌数
+            capacity: 令牌上限
+            clock: 单调时钟
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """当前可用的令牌数"""
+        return self._tokens
+
+    def deposit(self) -> None:
+        """记录一个新请求"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        申请一次重试
+
+        Returns:
+            预算充足时返回 True 并扣除令牌
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.min_per_second)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class _Circuit:
+    """单个接口的熔断状态"""
+
+    __slots__ = ("failures", "opened_at")
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+
+class CircuitBreaker:
+    """
+    按接口熔断
+
+    同一接口连续失败 failure_threshold 次后熔断，reset_timeout 秒内的请求直接失败；
+    冷却结束后放行一个探测请求，成功则恢复，失败则重新熔断。只有传输错误和 5xx 计为失败。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            failure_threshold: 触发熔断的连续失败次数
+            reset_timeout: 熔断持续时间（秒）
+            clock: 单调时钟
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, key: str) -> str:
+        """接口当前的熔断状态"""
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return self.CLOSED
+        if self._clock() - circuit.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self, key: str) -> Optional[float]:
+        """
+        检查是否放行请求
+
+        冷却结束后放行的请求作为探测请求，同时重新计时，探测期间其它请求仍直接失败。
+
+        Returns:
+            放行时返回 None，否则返回距离下次探测的秒数
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.opened_at is None:
+            return None
+        with self._lock:
+            now = self._clock()
+            remaining = self.reset_timeout - (now - circuit.opened_at)
+            if remaining > 0:
+                return remaining
+            circuit.opened_at = now
+            return None
+
+    def record(self, key: str, success: bool) -> None:
+        """记录一次请求结果"""
+        if success:
+            if key in self._circuits:
+                with self._lock:
+                    self._circuits.pop(key, None)
+            return
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit()
+            circuit.failures += 1
+            if circuit.failures >= self.failure_threshold:
+                circuit.opened_at = self._clock()
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """恢复指定接口，key 为空时恢复全部接口"""
+        with self._lock:
+            if key is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(key, None)
+
+
+class RetryCall:
+    """单次调用的重试状态，由 RetryPolicy.start 创建"""
+
+    __slots__ = ("policy", "key", "retryable", "attempt", "delay")
+
+    def __init__(self, policy: "RetryPolicy", key: str, retryable: bool):
+        self.policy = policy
+        self.key = key
+        self.retryable = retryable
+        self.attempt = 1
+        self.delay = policy.base_delay
+
+    def blocked(self) -> Optional[float]:
+        """
+        检查熔断状态
+
+        Returns:
+            接口熔断时返回距离下次探测的秒数，否则返回 None
+        """
+        breaker = self.policy.breaker
+        return breaker.allow(self.key) if breaker is not None else None
+
+    def next_delay(self, status_code: int, headers: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        """
+        记录本次尝试的结果并计算重试等待时间
+
+        Args:
+            status_code: HTTP 状态码，传输错误为 0
+            headers: 响应头部
+
+        Returns:
+            需要重试时返回等待秒数，否则返回 None
+        """
+        policy = self.policy
+        if policy.breaker is not None:
+            policy.breaker.record(self.key, status_code != 0 and status_code < 500)
+        if status_code != 0 and status_code not in policy.statuses:
+            return None
+        if not self.retryable or self.attempt >= policy.max_attempts:
+            return None
+
+        retry_after = parse_retry_after(headers.get("Retry-After")) if headers is not None else None
+        if retry_after is not None and retry_after > policy.max_retry_after:
+            return None
+        if policy.budget is not None and not policy.budget.withdraw():
+            return None
+
+        # decorrelated jitter：在 [base, 上次等待 * 3] 之间随机，上限 max_delay
+        self.delay = min(policy.max_delay, policy.uniform(policy.base_delay, self.delay * 3))
+        self.attempt += 1
+        return max(self.delay, retry_after or 0.0)
+
+
+class RetryPolicy:
+    """
+    请求重试策略
+
+    同一个策略可以在多个客户端之间共享，此时重试预算与熔断状态也共享。
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 5.0,
+        statuses: Iterable[int] = RETRY_STATUSES,
+        idempotent_endpoints: Iterable[str] = IDEMPOTENT_ENDPOINTS,
+        max_retry_after: float = 30.0,
+        budget: Union[RetryBudget, bool] = True,
+        breaker: Union[CircuitBreaker, bool] = True
+    ):
+        """
+        Args:
+            max_attempts: 最大尝试次数（含首次请求）
+            base_delay: 最小退避时间（秒）
+            max_delay: 最大退避时间（秒）
+            statuses: 可重试的 HTTP 状态码
+            idempotent_endpoints: 可以安全重试的 POST/PUT/DELETE 接口，GET 请求总是可重试
+            max_retry_after: Retry-After 超过该秒数时不再重试，直接返回错误
+            budget: 重试预算，True 使用默认预算，False 不限制
+            breaker: 熔断器，True 使用默认熔断器，False 不熔断
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts 必须大于 0")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+        self.idempotent_endpoints = frozenset(idempotent_endpoints)
+        self.max_retry_after = max_retry_after
+        self.budget = RetryBudget() if budget is True else (budget or None)
+        self.breaker = CircuitBreaker() if breaker is True else (breaker or None)
+        self.uniform: Callable[[float, float], float] = random.uniform
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        """请求是否可以安全重试"""
+        return method.upper() in IDEMPOTENT_METHODS or endpoint in self.idempotent_endpoints
+
+    def start(self, method: str, endpoint: str) -> RetryCall:
+        """开始一次调用"""
+        if self.budget is not None:
+            self.budget.deposit()
+        return RetryCall(self, f"{method.upper()} {endpoint}", self.is_idempotent(method, endpoint))
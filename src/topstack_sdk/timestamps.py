@@ -0,0 +1,167 @@
+"""
+时间戳解码
+
+平台消息中的时间为毫秒时间戳或 ISO 8601 字符串。这里提供统一的解码函数：数值一律按
+毫秒时间戳处理，字符串优先走 datetime.fromisoformat（C 实现），无时区的时间按 UTC
+处理，返回的 datetime 均为 UTC 时区。
+
+消息对象通过 LazyTimestamp 保存原始值，读取属性时才构建 datetime。
+"""
+
+import re
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Optional, Union
+
+from pydantic import BeforeValidator
+
+if sys.version_info >= (3, 9):
+    from typing import Annotated
+else:
+    from typing_extensions import Annotated
+
+RawTimestamp = Union[int, float, str, datetime, None]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_UTC = timezone.utc
+_FRACTION_RE = re.compile(r'(\.\d{6})\d+')
+
+
+def parse_iso(value: str) -> datetime:
+    """
+    解析 ISO 8601 时间字符串
+
+    支持 Z 后缀、任意位数的小数秒、空格分隔的日期时间，无时区时按 UTC 处理。
+
+    Raises:
+        ValueError: 无法解析时抛出
+    """
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        # Python 3.11 之前不支持 Z 后缀和超过 6 位的小数秒
+        normalized = _FRACTION_RE.sub(r'\1', value.replace('Z', '+00:00').replace('z', '+00:00'))
+        try:
+            dt = datetime.fromisoformat(normalized)
+        except ValueError:
+            # 标准库无法解析的格式很少见，dateutil 在这里才导入
+            from dateutil.parser import isoparse
+            dt = isoparse(value)
+    tzinfo = dt.tzinfo
+    if tzinfo is _UTC:
+        return dt
+    if tzinfo is None:
+        return dt.replace(tzinfo=_UTC)
+    return dt.astimezone(_UTC)
+
+
+def _fraction_ns(value: str) -> int:
+    """ISO 字符串中超出微秒精度的纳秒部分"""
+    dot = value.find('.')
+    if dot < 0:
+        return 0
+    end = dot + 1
+    while end < len(value) and value[end].isdigit():
+        end += 1
+    digits = value[dot + 7:end]
+    return int(digits[:3].ljust(3, '0')) if digits else 0
+
+
+def to_datetime(value: RawTimestamp) -> Optional[datetime]:
+    """
+    将原始时间值转换为 UTC datetime
+
+    Args:
+        value: 毫秒时间戳、ISO 字符串或 datetime（无时区时按 UTC 处理）
+
+    Returns:
+        UTC datetime，value 为空时返回 None
+    """
+    # 响应中最常见的是 ISO 字符串，先判断
+    if type(value) is str:
+        return parse_iso(value) if value else None
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo is not None else value.replace(tzinfo=_UTC)
+    if isinstance(value, (int, float)):
+        return _EPOCH + timedelta(milliseconds=value)
+    if isinstance(value, str):
+        return parse_iso(value)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=_UTC)
+    raise ValueError(f"无法解析的时间: {value!r}")
+
+
+def epoch_ms(value: RawTimestamp) -> Optional[int]:
+    """
+    将原始时间值转换为毫秒时间戳
+
+    数值直接返回，不构建 datetime。
+
+    Returns:
+        毫秒时间戳，value 为空时返回 None
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    delta = to_datetime(value) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+def epoch_ns(value: RawTimestamp) -> Optional[int]:
+    """
+    将原始时间值转换为纳秒时间戳
+
+    ISO 字符串中超过微秒的小数位会保留。
+
+    Returns:
+        纳秒时间戳，value 为空时返回 None
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value * 1_000_000)
+    delta = to_datetime(value) - _EPOCH
+    ns = ((delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1000
+    if isinstance(value, str):
+        ns += _fraction_ns(value)
+    return ns
+
+
+class LazyTimestamp:
+    """
+    延迟转换的时间属性
+
+    实例的 ``_<属性名>`` 槽位保存原始值（毫秒时间戳、ISO 字符串或 datetime），
+    首次读取属性时转换为 UTC datetime 并缓存。
+    """
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.slot = '_' + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        raw = getattr(obj, self.slot)
+        if raw is None or type(raw) is datetime:
+            return raw
+        value = to_datetime(raw)
+        setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value: RawTimestamp) -> None:
+        setattr(obj, self.slot, value)
+
+
+def _validate_datetime(value: Any) -> Any:
+    if value is None or isinstance(value, (int, float, str, datetime)):
+        return to_datetime(value)
+    return value
+
+
+# pydantic 时间字段：数值按毫秒时间戳解析，结果统一为 UTC datetime
+UtcDatetime = Annotated[datetime, BeforeValidator(_validate_datetime)]
@@ -0,0 +1,149 @@
+"""
+TopStack SDK 异步客户端测试
+"""
+
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from topstack_sdk import AsyncTopStackClient, AsyncIotApi
+from topstack_sdk.client import TopStackError
+
+
+def make_client(handler):
+    """创建使用模拟传输层的异步客户端"""
+    client = AsyncTopStackClient(
+        base_url="http://localhost:8000",
+        app_id="test-app",
+        app_secret="test-secret"
+    )
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestAsyncTopStackClient:
+    """异步客户端测试类"""
+
+    def test_token_fetched_once_for_concurrent_requests(self):
+        """测试并发请求只获取一次访问令牌"""
+        calls = {"auth": 0, "data": 0}
+
+        def handler(request):
+            if request.url.path == "/open_api/v1/auth/access_token":
+                calls["auth"] += 1
+                return httpx.Response(200, json={"access_token": "tok", "expire": 3600})
+            calls["data"] += 1
+            assert request.headers["Authorization"] == "Bearer tok"
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"data": {
+                "deviceID": body["deviceID"],
+                "pointID": body["pointID"],
+                "value": 1,
+                "quality": 0,
+                "timestamp": "2024-01-01T00:00:00Z"
+            }})
+
+        async def run():
+            async with make_client(handler) as client:
+                api = AsyncIotApi(client)
+                return await asyncio.gather(*[
+                    api.find_last("dev1", f"p{i}") for i in range(20)
+                ])
+
+        results = asyncio.run(run())
+
+        assert calls == {"auth": 1, "data": 20}
+        assert [r.point_id for r in results] == [f"p{i}" for i in range(20)]
+
+    def test_error_response(self):
+        """测试错误响应转换为 TopStackError"""
+        def handler(request):
+            if request.url.path == "/open_api/v1/auth/access_token":
+                return httpx.Response(200, json={"access_token": "tok", "expire": 3600})
+            return httpx.Response(404, json={"code": "404", "msg": "Resource not found"})
+
+        async def run():
+            async with make_client(handler) as client:
+                await client.get("/test/endpoint")
+
+        with pytest.raises(TopStackError) as exc_info:
+            asyncio.run(run())
+
+        assert exc_info.value.status_code == 404
+        assert "Resource not found" in str(exc_info.value)
+    def test_set_values(self):
+        """测试异步批量下发按分片返回每个测点的结果"""
+        payloads = []
+
+        def handler(request):
+            if request.url.path == "/open_api/v1/auth/access_token":
+                return httpx.Response(200, json={"access_token": "tok", "expire": 3600})
+            body = json.loads(request.content)
+            payloads.append(body)
+            if "dev1" in body:
+                return httpx.Response(500, json={"code": "500", "msg": "Gateway offline"})
+            return httpx.Response(200, json={"data": {"success": True}})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await AsyncIotApi(client).set_values([
+                    {"device_id": f"dev{i}", "point_id": "p1", "value": i} for i in range(3)
+                ], chunk_size=1)
+
+        results = asyncio.run(run())
+
+        assert len(payloads) == 3
+        assert [r.success for r in results] == [True, False, True]
+        assert "Gateway offline" in results[1].error
+
+    def test_retry_transport_error(self):
+        """测试传输错误按重试策略重发"""
+        from topstack_sdk import RetryPolicy
+
+        calls = {"data": 0}
+
+        def handler(request):
+            if request.url.path == "/open_api/v1/auth/access_token":
+                return httpx.Response(200, json={"access_token": "tok", "expire": 3600})
+            calls["data"] += 1
+            if calls["data"] == 1:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, json={"data": {"ok": True}})
+
+        async def run():
+            async with make_client(handler) as client:
+                client.retry = RetryPolicy(base_delay=0, max_delay=0)
+                return await client.get("/test/endpoint")
+
+        response = asyncio.run(run())
+
+        assert calls["data"] == 2
+        assert response.data == {"ok": True}
+
+    def test_instrumentation(self):
+        """测试请求与访问令牌计入指标"""
+        from topstack_sdk import MetricsRegistry
+
+        def handler(request):
+            if request.url.path == "/open_api/v1/auth/access_token":
+                return httpx.Response(200, json={"access_token": "tok", "expire": 3600})
+            return httpx.Response(404, json={"code": "NotFound"})
+
+        async def run():
+            async with make_client(handler) as client:
+                client.instrumentation = registry
+                with pytest.raises(TopStackError):
+                    await client.get("/test/endpoint")
+
+        registry = MetricsRegistry()
+        asyncio.run(run())
+
+        snapshot = registry.snapshot()
+        (item,) = snapshot["endpoints"]
+        assert item["statuses"] == {404: 1}
+        assert item["errors"] == {"TopStackError": 1}
+        assert item["phases"]["token"] > 0
+        assert snapshot["token_refreshes"] == 1
@@ -0,0 +1,121 @@
+"""
+TopStack SDK 访问令牌管理测试
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.auth import TokenManager
+from topstack_sdk.client import TopStackError
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenManager:
+    """令牌管理器测试类"""
+
+    def test_concurrent_refresh_is_single_flight(self):
+        """测试并发获取令牌只发送一次认证请求"""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return "tok", 3600
+
+        manager = TokenManager(fetch)
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            tokens = list(pool.map(lambda _: manager.get_token(), range(32)))
+
+        assert len(calls) == 1
+        assert set(tokens) == {"tok"}
+
+    def test_refresh_ahead_in_background(self):
+        """测试进入提前刷新窗口后在后台刷新，调用方继续使用旧令牌"""
+        clock = FakeClock()
+        tokens = iter(["tok1", "tok2"])
+        release = threading.Event()
+        done = threading.Event()
+
+        def fetch():
+            token = next(tokens)
+            if token == "tok2":
+                release.wait(1)
+                done.set()
+            return token, 3600
+
+        manager = TokenManager(fetch, expire_margin=300, refresh_ahead=60, clock=clock)
+        assert manager.get_token() == "tok1"
+
+        # 进入提前刷新窗口，但令牌尚未过期
+        clock.now += 3300 - 30
+        assert manager.get_token() == "tok1"
+        assert manager.get_token() == "tok1"
+
+        release.set()
+        assert done.wait(1)
+        for _ in range(100):
+            if manager.token == "tok2":
+                break
+            time.sleep(0.01)
+        assert manager.get_token() == "tok2"
+
+    def test_failed_refresh_is_shared(self):
+        """测试认证失败时等待中的线程收到同一个异常"""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            raise TopStackError("获取访问令牌失败: HTTP 500", 500, None)
+
+        manager = TokenManager(fetch)
+
+        def get():
+            try:
+                manager.get_token()
+            except TopStackError as e:
+                return e.status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: get(), range(8)))
+
+        assert results == [500] * 8
+        assert len(calls) == 1
+
+
+class TestClientToken:
+    """客户端令牌使用测试类"""
+
+    def test_token_attached_per_request(self):
+        """测试认证头部随请求携带，不修改共享会话"""
+        client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        auth_response = Mock(ok=True, status_code=200, content=b'{"access_token": "tok", "expire": 3600}')
+        data_response = Mock(ok=True, status_code=200, content=b'{"data": 1}', text='{"data": 1}')
+        client.session.post = Mock(return_value=auth_response)
+        client.session.request = Mock(return_value=data_response)
+
+        response = client.get("/test/endpoint")
+
+        assert response.data == 1
+        assert client.access_token == "tok"
+        assert "Authorization" not in client.session.headers
+        _, kwargs = client.session.request.call_args
+        assert kwargs["headers"] == {"Authorization": "Bearer tok"}
\ No newline at end of file
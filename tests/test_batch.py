@@ -0,0 +1,257 @@
+"""
+TopStack SDK 批量分片请求测试
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from topstack_sdk import AsyncTopStackClient, TopStackClient
+from topstack_sdk.batch import BatchError, chunked
+from topstack_sdk.client import Response, TopStackError
+from topstack_sdk.iot import AsyncIotApi, IotApi
+
+
+def make_points(count):
+    return [{"device_id": f"dev{i // 10}", "point_id": f"p{i}"} for i in range(count)]
+
+
+def echo_find_last(endpoint, data, response_model=None):
+    """按请求内容返回实时值"""
+    return Response(data=[
+        response_model(**{
+            "deviceID": item["deviceID"],
+            "pointID": item["pointID"],
+            "value": 1,
+            "timestamp": "2024-01-01T00:00:00Z"
+        })
+        for item in data
+    ])
+
+
+class TestFindLastBatch:
+    """批量实时值查询测试类"""
+
+    def setup_method(self):
+        self.client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        self.iot_api = IotApi(self.client)
+
+    def test_chunked(self):
+        """测试按固定大小切分"""
+        assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+        with pytest.raises(ValueError):
+            chunked([1], 0)
+
+    @patch.object(TopStackClient, 'post')
+    def test_results_merged_in_input_order(self, mock_post):
+        """测试分片并发请求后按输入顺序合并"""
+        threads = set()
+
+        def post(endpoint, data, response_model=None):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return echo_find_last(endpoint, data, response_model)
+
+        mock_post.side_effect = post
+        points = make_points(450)
+
+        results = self.iot_api.find_last_batch(points, chunk_size=100, max_workers=4)
+
+        assert mock_post.call_count == 5
+        assert [r.point_id for r in results] == [p["point_id"] for p in points]
+        assert len(threads) > 1
+
+    @patch.object(TopStackClient, 'post')
+    def test_partial_failure(self, mock_post):
+        """测试部分分片失败时报告失败分片并保留成功结果"""
+        def post(endpoint, data, response_model=None):
+            if data[0]["pointID"] == "p100":
+                raise TopStackError("HTTP 504: Gateway Timeout", 504, None)
+            return echo_find_last(endpoint, data, response_model)
+
+        mock_post.side_effect = post
+
+        with pytest.raises(BatchError) as exc_info:
+            self.iot_api.find_last_batch(make_points(250), chunk_size=100)
+
+        error = exc_info.value
+        assert error.status_code == 504
+        assert len(error.results) == 150
+        assert len(error.failures) == 1
+        failure = error.failures[0]
+        assert failure.index == 1
+        assert failure.offset == 100
+        assert len(failure.items) == 100
+
+    @patch.object(TopStackClient, 'post')
+    def test_partial_failure_positions(self, mock_post):
+        """测试部分分片失败时 chunk_results 按分片对齐，可按 offset 找回输入位置"""
+        def post(endpoint, data, response_model=None):
+            if data[0]["pointID"] in ("p0", "p200"):
+                raise TopStackError("HTTP 504: Gateway Timeout", 504, None)
+            return echo_find_last(endpoint, data, response_model)
+
+        mock_post.side_effect = post
+        points = make_points(250)
+
+        with pytest.raises(BatchError) as exc_info:
+            self.iot_api.find_last_batch(points, chunk_size=100)
+
+        error = exc_info.value
+        assert [r.point_id for r in error.results] == [p["point_id"] for p in points[100:200]]
+        assert [chunk is None for chunk in error.chunk_results] == [True, False, True]
+        assert [(f.index, f.offset) for f in error.failures] == [(0, 0), (2, 200)]
+        for position, result in enumerate(error.chunk_results[1], 100):
+            assert result.point_id == points[position]["point_id"]
+
+    @patch.object(TopStackClient, 'post')
+    def test_single_chunk_error_unchanged(self, mock_post):
+        """测试单个分片失败时抛出原始异常"""
+        mock_post.side_effect = TopStackError("HTTP 500", 500, None)
+
+        with pytest.raises(TopStackError) as exc_info:
+            self.iot_api.find_last_batch(make_points(10))
+
+        assert not isinstance(exc_info.value, BatchError)
+
+def http_response(body, status_code=200):
+    """模拟 requests 的 HTTP 响应"""
+    content = json.dumps(body).encode()
+    return Mock(
+        ok=200 <= status_code < 300, status_code=status_code, reason="",
+        content=content, text=content.decode(), headers={}
+    )
+
+
+class TestSetValues:
+    """批量下发测试类，经过真实的 HTTP 响应解析，响应体顶层为 {"success": bool}"""
+
+    def setup_method(self):
+        self.client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        self.client._get_access_token = Mock(return_value="tok")
+        self.client.session.request = Mock(side_effect=self.request)
+        self.payloads = []
+        self.reply = lambda payload: http_response({"success": True})
+        self.iot_api = IotApi(self.client)
+
+    def request(self, method, url, data=None, **kwargs):
+        assert url.endswith("/iot/open_api/v1/data/batchSetValue")
+        payload = json.loads(data)
+        self.payloads.append(payload)
+        return self.reply(payload)
+
+    def test_grouped_by_gateway_and_chunked(self):
+        """测试按网关分组、按大小分片，结果按输入顺序返回"""
+        values = [
+            {"device_id": f"dev{i}", "point_id": "p1", "value": i, "gateway_id": f"gw{i % 2}"}
+            for i in range(5)
+        ]
+
+        results = self.iot_api.set_values(values, chunk_size=2)
+
+        assert len(self.payloads) == 3
+        assert {"dev0": {"p1": 0}, "dev2": {"p1": 2}} in self.payloads
+        assert {"dev4": {"p1": 4}} in self.payloads
+        assert [r.device_id for r in results] == [v["device_id"] for v in values]
+        assert all(r.success for r in results)
+
+    def test_mixed_gateways_never_share_request(self):
+        """测试不同网关、直连通道和未指定网关的设备不会出现在同一请求中"""
+        values = [
+            {"device_id": "dev1", "point_id": "p1", "value": 1, "gateway_id": "gw1"},
+            {"device_id": "dev2", "point_id": "p1", "value": 2, "channel_id": "ch1"},
+            {"device_id": "dev3", "point_id": "p1", "value": 3},
+            {"device_id": "dev4", "point_id": "p1", "value": 4},
+            {"device_id": "dev3", "point_id": "p2", "value": 5},
+            {"device_id": "dev5", "point_id": "p1", "value": 6, "gateway_id": "gw1"},
+        ]
+
+        results = self.iot_api.set_values(values)
+
+        assert sorted(self.payloads, key=lambda p: sorted(p)) == [
+            {"dev1": {"p1": 1}, "dev5": {"p1": 6}},
+            {"dev2": {"p1": 2}},
+            {"dev3": {"p1": 3, "p2": 5}},
+            {"dev4": {"p1": 4}},
+        ]
+        assert all(r.success for r in results)
+
+    def test_partial_failure(self):
+        """测试失败分片只影响所含测点，不抛出异常；顶层 success=false 视为失败"""
+        def reply(payload):
+            if "dev1" in payload:
+                return http_response({"msg": "Gateway Timeout"}, 504)
+            return http_response({"success": "dev2" not in payload})
+
+        self.reply = reply
+        values = [{"device_id": f"dev{i}", "point_id": "p1", "value": i} for i in range(3)]
+
+        results = self.iot_api.set_values(values, chunk_size=1)
+
+        assert [r.success for r in results] == [True, False, False]
+        assert "504" in results[1].error
+        assert "success=false" in results[2].error
+
+    def test_coalesce_keeps_last_write(self):
+        """测试合并同一测点的多次写入，只下发最后一次的值"""
+        values = [
+            {"device_id": "dev1", "point_id": "p1", "value": 1},
+            {"device_id": "dev1", "point_id": "p2", "value": 2},
+            {"device_id": "dev1", "point_id": "p1", "value": 3},
+        ]
+
+        results = self.iot_api.set_values(values)
+
+        assert self.payloads == [{"dev1": {"p1": 3, "p2": 2}}]
+        assert [r.coalesced for r in results] == [True, False, False]
+        assert all(r.success for r in results)
+
+    def test_without_coalesce_writes_in_order(self):
+        """测试不合并时同一测点的写入按顺序分轮下发"""
+        values = [
+            {"device_id": "dev1", "point_id": "p1", "value": 1},
+            {"device_id": "dev1", "point_id": "p1", "value": 3},
+        ]
+
+        self.iot_api.set_values(values, coalesce=False)
+
+        assert self.payloads == [{"dev1": {"p1": 1}}, {"dev1": {"p1": 3}}]
+
+
+def test_async_set_values_rejected():
+    """测试异步批量下发：响应顶层 success=false 的分片记为失败"""
+    httpx = pytest.importorskip("httpx")
+
+    def handler(request):
+        if request.url.path == "/open_api/v1/auth/access_token":
+            return httpx.Response(200, json={"access_token": "tok", "expire": 3600})
+        payload = json.loads(request.content)
+        return httpx.Response(200, json={"success": "dev1" not in payload})
+
+    async def run():
+        client = AsyncTopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            values = [{"device_id": f"dev{i}", "point_id": "p1", "value": i} for i in range(3)]
+            return await AsyncIotApi(client).set_values(values, chunk_size=1)
+
+    results = asyncio.run(run())
+
+    assert [r.success for r in results] == [True, False, True]
+    assert "success=false" in results[1].error
@@ -0,0 +1,71 @@
+"""
+TopStack SDK 性能基准冒烟测试
+"""
+
+import json
+
+import pytest
+
+from benchmarks import bench_decode, bench_http, bench_import, bench_nats
+from benchmarks.harness import compare, percentile, write_results
+
+
+def test_percentile():
+    """测试分位数线性插值"""
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert percentile([1.0], 0.99) == 1.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_http_suite():
+    """测试 REST 基准对模拟服务运行各场景"""
+    results = bench_http.run([10], iterations=2, max_workers=2)
+
+    assert [r["name"] for r in results] == ["find_last", "find_last_batch", "query_history", "device_iter"]
+    assert all(r["iterations"] >= 2 and r["p99_ms"] >= r["p50_ms"] > 0 for r in results)
+
+
+def test_nats_suite(tmp_path):
+    """测试 NATS 基准的每条消息都送达回调，并写入与比较结果文件"""
+    results = bench_nats.run([0], messages=50, timeout=5)
+
+    assert len(results) == len(bench_nats.SCENARIOS)
+    assert all(r["received"] == 50 and r["dropped"] == 0 for r in results)
+
+    path = tmp_path / "results.json"
+    write_results(str(path), results, {"messages": 50})
+    document = json.loads(path.read_text(encoding="utf-8"))
+    assert document["environment"]["python"]
+    with open(tmp_path / "compare.txt", "w", encoding="utf-8") as output:
+        assert compare(str(path), results, output=output) == []
+
+
+def test_decode_check():
+    """测试内存指标超过阈值视为退化，耗时只在指定阈值时检查"""
+    baseline = {"results": {"case": {"allocs_per_object": 2.0, "bytes_per_object": 100.0, "ns_per_object": 100.0}}}
+
+    assert bench_decode.check({"case": {"allocs_per_object": 2.1, "ns_per_object": 500.0}}, baseline) == []
+    failures = bench_decode.check({"case": {"bytes_per_object": 130.0, "ns_per_object": 500.0}}, baseline, 0.3)
+    assert [f.split(":")[0] for f in failures] == ["case bytes_per_object", "case ns_per_object"]
+
+
+def test_decode_memory_baseline():
+    """测试解码路径的内存分配不超过基线"""
+    baseline = bench_decode.load_baseline()
+    environment = bench_decode.environment()
+    # 分配数取决于 Python 和 pydantic 的版本，只与相同版本生成的基线比较
+    if baseline is None or any(baseline["environment"].get(key) != environment[key] for key in ("python", "pydantic")):
+        pytest.skip("没有当前 Python 和 pydantic 版本的解码基线")
+
+    results = bench_decode.run(with_time=False)
+
+    assert set(results) == set(baseline["results"])
+    assert bench_decode.check(results, baseline) == []
+
+
+def test_import_suite():
+    """测试导入耗时基准在新进程中运行，只使用 REST 接口时不加载 nats"""
+    results = bench_import.run(runs=1, only=["import", "first_find_last"])
+
+    assert [r["name"] for r in results] == ["import", "first_find_last"]
+    assert all(r["min_ms"] > 0 and not r["nats_loaded"] for r in results)
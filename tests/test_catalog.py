@@ -0,0 +1,106 @@
+"""
+TopStack SDK 设备目录测试
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import Response
+from topstack_sdk.iot import DeviceApi, DeviceCatalog
+from topstack_sdk.iot.device.models import DeviceItem, PointItem, QueryResponse
+
+
+def make_device(i, **fields):
+    data = {
+        "id": f"dev{i}", "code": f"dev{i}", "name": f"泵{i:02d}", "connectMode": "gateway", "state": 0,
+        "gatewayID": f"gw{i % 2}", "typeID": f"type{i % 3}", "groupID": "g1" if i < 6 else "g2",
+        "createdAt": "2024-01-01T00:00:00Z"
+    }
+    data.update(fields)
+    return DeviceItem(**data)
+
+
+def make_point(point_id):
+    return PointItem(pointID=point_id, name=point_id, type="double", accessMode="r", orderNumber=0)
+
+
+@pytest.fixture
+def catalog():
+    devices = [make_device(i) for i in range(12)]
+    devices.append(make_device(12, name="风机01", dataChannelID="ch1"))
+    type_points = {"type0": [make_point("Current"), make_point("Voltage")]}
+    return DeviceCatalog(devices, type_points, {"dev1": [make_point("Speed")]})
+
+
+class TestDeviceCatalog:
+    """设备目录测试类"""
+
+    def test_find_intersects_indexes(self, catalog):
+        """测试多个条件同时满足，结果按加载顺序返回"""
+        found = catalog.find(gateway_id="gw0", type_id="type0", group_id="g1")
+
+        assert [d.id for d in found] == ["dev0"]
+        assert [d.id for d in catalog.find(type_id="type0")] == ["dev0", "dev3", "dev6", "dev9", "dev12"]
+        assert catalog.find(gateway_id="missing") == []
+        assert len(catalog.find()) == 13
+
+    def test_find_by_channel_and_name_prefix(self, catalog):
+        """测试按通道和名称前缀查询"""
+        assert [d.id for d in catalog.find(channel_id="ch1")] == ["dev12"]
+        assert [d.id for d in catalog.find(name_prefix="泵1")] == ["dev10", "dev11"]
+        assert [d.id for d in catalog.find(name_prefix="泵", gateway_id="gw1", group_id="g2")] == [
+            "dev7", "dev9", "dev11"
+        ]
+
+    def test_points(self, catalog):
+        """测试设备测点优先，否则使用设备模型的测点定义"""
+        assert [p.point_id for p in catalog.points("dev1")] == ["Speed"]
+        assert catalog.point("dev3", "Voltage").name == "Voltage"
+        assert catalog.point("dev3", "Speed") is None
+        assert catalog.points("dev2") == [] and catalog.points("missing") == []
+
+    @pytest.mark.parametrize("format", ["json", "msgpack"])
+    def test_snapshot_roundtrip(self, catalog, tmp_path, format):
+        """测试快照保存后加载得到相同的目录"""
+        if format == "msgpack":
+            pytest.importorskip("msgpack")
+        path = str(tmp_path / "catalog.bin")
+
+        catalog.save(path, format=format)
+        loaded = DeviceCatalog.open(path)
+
+        assert loaded.created_at == catalog.created_at
+        assert [d.model_dump() for d in loaded] == [d.model_dump() for d in catalog]
+        assert loaded.get("dev0").created_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert [d.id for d in loaded.find(channel_id="ch1")] == ["dev12"]
+        assert loaded.point("dev3", "Current").access_mode == "r"
+
+    def test_invalid_snapshot(self, tmp_path):
+        """测试非快照文件抛出 ValueError"""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"{}")
+
+        with pytest.raises(ValueError):
+            DeviceCatalog.open(str(path))
+
+    @patch.object(TopStackClient, 'get')
+    def test_load(self, mock_get):
+        """测试加载全部设备和各设备模型的测点定义"""
+        def get(endpoint, params=None, response_model=None):
+            if endpoint == "/iot/open_api/v1/device/query":
+                return Response(data=QueryResponse(total=3, items=[make_device(i) for i in range(3)]))
+            assert endpoint == "/iot/open_api/v1/device_type_point"
+            return Response(data=[make_point(params["deviceTypeID"])])
+
+        mock_get.side_effect = get
+        client = TopStackClient(base_url="http://localhost:8000", app_id="test-app", app_secret="test-secret")
+
+        catalog = DeviceCatalog.load(DeviceApi(client), gateway_id="gw0")
+
+        assert len(catalog) == 3
+        assert sorted(catalog.type_points) == ["type0", "type1", "type2"]
+        assert catalog.point("dev2", "type2") is not None
+        assert mock_get.call_args_list[0].args[1]["gatewayID"] == "gw0"
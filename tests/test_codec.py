@@ -0,0 +1,97 @@
+"""
+TopStack SDK JSON 编解码测试
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import TopStackError
+from topstack_sdk.codec import JsonCodec, get_codec
+
+
+def available_codecs():
+    codecs = []
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+class TestCodecs:
+    """各编解码器一致性测试类"""
+
+    def test_loads_buffers(self, codec):
+        """测试直接解析 bytes、memoryview 和 str"""
+        payload = b'{"deviceID":"dev1","value":1.5,"name":"\xe6\xb8\xa9\xe5\xba\xa6"}'
+        expected = {"deviceID": "dev1", "value": 1.5, "name": "温度"}
+
+        assert codec.loads(payload) == expected
+        assert codec.loads(memoryview(payload)) == expected
+        assert codec.loads(payload.decode()) == expected
+
+    def test_dumps_datetime(self, codec):
+        """测试序列化时间字段，结果为 bytes"""
+        body = codec.dumps({"start": datetime(2024, 1, 1, tzinfo=timezone.utc), "points": [1]})
+
+        assert isinstance(body, bytes)
+        assert JsonCodec().loads(body) == {"start": "2024-01-01T00:00:00+00:00", "points": [1]}
+
+    def test_invalid_raises_value_error(self, codec):
+        """测试解析失败抛出 ValueError"""
+        with pytest.raises(ValueError):
+            codec.loads(b"not json")
+
+
+class TestClientCodec:
+    """客户端编解码测试类"""
+
+    def make_client(self, codec=None):
+        client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret",
+            codec=codec
+        )
+        client._get_access_token = Mock(return_value="tok")
+        return client
+
+    def test_auto_prefers_installed(self):
+        """测试自动选择已安装的最快实现"""
+        pytest.importorskip("orjson")
+
+        assert self.make_client().codec.name == "orjson"
+        assert self.make_client("json").codec.name == "json"
+
+    def test_request_encoded_with_codec(self):
+        """测试请求体与响应体使用客户端的编解码器"""
+        codec = Mock(wraps=JsonCodec())
+        client = self.make_client()
+        client.codec = codec
+        client.session.request = Mock(return_value=Mock(
+            ok=True, status_code=200, content=b'{"data": {"id": 1}}', text='{"data": {"id": 1}}'
+        ))
+
+        response = client.post("/test", {"name": "test"})
+
+        assert response.data == {"id": 1}
+        codec.dumps.assert_called_once_with({"name": "test"})
+        codec.loads.assert_called_once_with(b'{"data": {"id": 1}}')
+
+    def test_invalid_body_raises(self):
+        """测试响应体不是 JSON 时抛出 TopStackError"""
+        client = self.make_client()
+        client.session.request = Mock(return_value=Mock(
+            ok=True, status_code=200, content=b"<html>", text="<html>"
+        ))
+
+        with pytest.raises(TopStackError) as exc_info:
+            client.get("/test")
+
+        assert "响应解析失败" in str(exc_info.value)
+        assert exc_info.value.status_code == 200
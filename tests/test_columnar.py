@@ -0,0 +1,93 @@
+"""
+TopStack SDK 列式历史数据测试
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import Response
+from topstack_sdk.iot import IotApi, HistoryFrame
+
+RAW_RESULTS = [
+    {
+        "deviceID": "dev1",
+        "pointID": "p1",
+        "values": [
+            {"value": 1.5, "time": "2024-01-01T00:00:00Z"},
+            {"value": None, "time": "2024-01-01T00:00:01.250Z"},
+            {"value": True, "time": "2024-01-01T00:00:02Z"},
+        ]
+    },
+    {
+        "deviceID": "dev1",
+        "pointID": "p2",
+        "values": [
+            {"last": "3", "max": 4, "time": "2024-01-01T08:00:00+08:00"},
+            {"last": "off", "max": 5, "time": "2024-01-01 00:00:01"},
+        ]
+    }
+]
+
+T0 = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+
+
+class TestHistoryFrame:
+    """列式历史数据测试类"""
+
+    def test_decode_columns(self):
+        """测试解码为 int64 纳秒时间戳与 float64 数值"""
+        frame = HistoryFrame.from_results(RAW_RESULTS)
+
+        p1 = frame[("dev1", "p1")]
+        assert p1.time.dtype == np.int64
+        assert p1.time.tolist() == [T0, T0 + 1_250_000_000, T0 + 2_000_000_000]
+        assert p1.value.dtype == np.float64
+        assert p1.value[0] == 1.5 and np.isnan(p1.value[1]) and p1.value[2] == 1.0
+
+        p2 = frame[("dev1", "p2")]
+        assert p2.time.tolist() == [T0, T0 + 1_000_000_000]
+        assert p2.columns["max"].tolist() == [4.0, 5.0]
+        assert p2.columns["last"][0] == 3.0 and np.isnan(p2.columns["last"][1])
+
+    def test_to_pandas(self):
+        """测试转换为 pandas DataFrame"""
+        pytest.importorskip("pandas")
+        df = HistoryFrame.from_results(RAW_RESULTS).to_pandas()
+
+        assert len(df) == 5
+        assert list(df.columns[:3]) == ["device_id", "point_id", "time"]
+        assert str(df["time"].dt.tz) == "UTC"
+        assert df["value"].isna().sum() == 3
+
+    def test_to_arrow(self):
+        """测试转换为 Arrow 表"""
+        pa = pytest.importorskip("pyarrow")
+        table = HistoryFrame.from_results(RAW_RESULTS).to_arrow()
+
+        assert table.num_rows == 5
+        assert table.schema.field("time").type == pa.timestamp("ns", tz="UTC")
+
+    @patch.object(TopStackClient, 'post')
+    def test_query_history_columns_skips_models(self, mock_post):
+        """测试列式查询不传入响应模型"""
+        mock_post.return_value = Response(data={"results": RAW_RESULTS})
+        client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+
+        frame = IotApi(client).query_history_columns(
+            [{"device_id": "dev1", "point_id": "p1"}],
+            datetime(2024, 1, 1), datetime(2024, 1, 2)
+        )
+
+        args = mock_post.call_args[0]
+        assert args[0] == "/iot/open_api/v1/data/query"
+        assert len(args) == 2
+        assert len(frame) == 2
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+TopStack SDK 响应数据解码测试
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import ResponseDecodeError
+from topstack_sdk.decode import construct, type_adapter, validate
+from topstack_sdk.iot import DeviceApi, IotApi
+from topstack_sdk.iot.models import FindLastResponse, HistoryResponse
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+LAST = [
+    {"deviceID": "dev1", "pointID": "p1", "value": 1, "timestamp": "2024-01-01T00:00:00Z"},
+    {"deviceID": "dev1", "pointID": "p2", "value": 2, "quality": 1, "timestamp": 1704067200000},
+]
+
+HISTORY = {"results": [{
+    "deviceID": "dev1",
+    "pointID": "p1",
+    "values": [{"value": 1, "time": "2024-01-01T00:00:00Z"}, {"max": 3, "time": 1704067200000}],
+}]}
+
+
+class TestDecode:
+    """解码函数测试类"""
+
+    def test_validate_list(self):
+        """测试列表数据整体校验，TypeAdapter 按类型缓存"""
+        results = validate(LAST, FindLastResponse)
+
+        assert [r.point_id for r in results] == ["p1", "p2"]
+        assert all(r.timestamp == T0 for r in results)
+        assert type_adapter(FindLastResponse, True) is type_adapter(FindLastResponse, True)
+
+    def test_construct_nested(self):
+        """测试可信模式递归构建嵌套模型并转换时间字段"""
+        result = construct(HISTORY, HistoryResponse)
+
+        series = result.results[0]
+        assert series.device_id == "dev1"
+        assert [v.time for v in series.values] == [T0, T0]
+        assert series.values[1].max == 3 and series.values[1].value is None
+
+    def test_construct_matches_validate(self):
+        """测试可信模式与校验模式结果一致"""
+        assert construct(LAST, FindLastResponse) == validate(LAST, FindLastResponse)
+        assert construct(HISTORY, HistoryResponse) == validate(HISTORY, HistoryResponse)
+
+
+class TestClientDecode:
+    """客户端解码测试类"""
+
+    def make_client(self, body, **kwargs):
+        client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret",
+            **kwargs
+        )
+        client._get_access_token = Mock(return_value="tok")
+        content = client.codec.dumps(body)
+        client.session.request = Mock(return_value=Mock(
+            ok=True, status_code=200, content=content, text=content.decode()
+        ))
+        return client
+
+    def test_invalid_item_raises(self):
+        """测试数据不符合模型时抛出 ResponseDecodeError，而不是返回原始字典"""
+        bad = [LAST[0], {"deviceID": "dev1", "value": 1}]
+        client = self.make_client({"data": bad})
+
+        with pytest.raises(ResponseDecodeError) as exc_info:
+            IotApi(client).find_last_batch([{"device_id": "dev1", "point_id": "p1"}])
+
+        message = str(exc_info.value)
+        assert "FindLastResponse" in message and "1.pointID" in message
+        assert exc_info.value.response.data == bad
+
+    def test_device_query_spec_example(self):
+        """测试接口文档中 device/query 的示例响应（没有 code 和 connectMode）可以解析"""
+        body = {
+            "data": {
+                "total": 114,
+                "items": [{
+                    "id": "01",
+                    "name": "温湿度传感器",
+                    "description": "",
+                    "gatewayID": "TLG20210903001",
+                    "gatewayName": "Toplink-33",
+                    "typeID": "deviceType0",
+                    "typeName": "引擎测试设备类型0",
+                    "template": False,
+                    "address": "",
+                    "userGroupID": "c79qj3le97elq1h0801g",
+                    "userGroupName": "测试组1",
+                    "dataChannelID": "",
+                    "dataChannelName": "",
+                    "state": 0,
+                    "stateChangeTime": "2022-01-10T14:49:43.843765+08:00",
+                    "createdAt": "2021-09-27T09:26:07.774105+08:00",
+                    "updatedAt": "2022-01-10T14:49:44.03248+08:00",
+                    "hasProps": True,
+                    "editable": True
+                }]
+            },
+            "code": "",
+            "msg": ""
+        }
+        client = self.make_client(body)
+
+        result = DeviceApi(client).query(page_size=1)
+
+        device = result.items[0]
+        assert result.total == 114
+        assert device.id == "01" and device.code is None and device.connect_mode is None
+        assert device.state_change_time == datetime(2022, 1, 10, 6, 49, 43, 843765, tzinfo=timezone.utc)
+
+
+def test_construct_rows():
+    """测试按列构建与逐个构建结果相同"""
+    from topstack_sdk.decode import construct_rows
+    from topstack_sdk.iot.models import HistoryValue
+
+    names = list(HistoryValue.model_fields)
+    items = [{"time": "2024-01-01T00:00:00Z", "value": 1.5}, {"time": 1704067200000, "value": None}]
+    rows = [[item.get(name) for name in names] for item in items]
+
+    values = construct_rows(HistoryValue, names, rows)
+
+    assert [v.model_dump() for v in values] == [HistoryValue(**item).model_dump() for item in items]
+    assert values[0].model_fields_set == set(names)
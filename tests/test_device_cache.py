@@ -0,0 +1,125 @@
+"""
+TopStack SDK 设备元数据缓存测试
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import Response
+from topstack_sdk.iot import DeviceApi, DeviceMetadataCache
+from topstack_sdk.iot.device.cache import MISSING
+from topstack_sdk.iot.device.models import PointQueryResponse, QueryResponse
+from topstack_sdk.nats import DeviceState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def device(device_id):
+    return {"id": device_id, "code": device_id, "name": device_id, "connectMode": "gateway", "state": 0}
+
+
+def fake_get(endpoint, params=None, response_model=None):
+    """按请求返回设备、测点或属性"""
+    if endpoint == "/iot/open_api/v1/device/query":
+        return Response(data=QueryResponse(total=2, items=[device("dev1"), device("dev2")]))
+    if endpoint == "/iot/open_api/v1/device_point/query":
+        return Response(data=PointQueryResponse(total=0, items=[]))
+    return Response(data=[{"id": "p1", "type": "string", "name": "位置"}])
+
+
+class TestDeviceMetadataCache:
+    """设备元数据缓存测试类"""
+
+    def setup_method(self):
+        self.client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        self.clock = FakeClock()
+        self.cache = DeviceMetadataCache(ttls={"query": 10}, clock=self.clock)
+        self.api = DeviceApi(self.client, cache=self.cache)
+
+    @patch.object(TopStackClient, 'get')
+    def test_hit_until_expired(self, mock_get):
+        """测试过期前命中缓存，过期后重新请求"""
+        mock_get.side_effect = fake_get
+
+        first = self.api.query(gateway_id="gw1", page_size=100)
+        second = self.api.query(page_size=100, gateway_id="gw1", search=None)
+        self.clock.now = 10
+        self.api.query(gateway_id="gw1", page_size=100)
+
+        assert second is first
+        assert mock_get.call_count == 2
+        assert (self.cache.hits, self.cache.misses) == (1, 2)
+
+    @patch.object(TopStackClient, 'get')
+    def test_different_params_not_shared(self, mock_get):
+        """测试不同查询参数使用不同的缓存条目"""
+        mock_get.side_effect = fake_get
+
+        self.api.query(gateway_id="gw1")
+        self.api.query(gateway_id="gw2")
+
+        assert mock_get.call_count == 2
+
+    def test_lru_eviction(self):
+        """测试超出条目数时淘汰最久未使用的条目"""
+        cache = DeviceMetadataCache(max_entries=2)
+        keys = [cache.make_key("query_props", {"deviceID": f"dev{i}"}) for i in range(3)]
+        cache.put(keys[0], "a", ["dev0"])
+        cache.put(keys[1], "b", ["dev1"])
+        cache.get(keys[0])
+        cache.put(keys[2], "c", ["dev2"])
+
+        assert len(cache) == 2
+        assert cache.get(keys[1]) is MISSING
+        assert cache.get(keys[0]) == "a"
+
+    @patch.object(TopStackClient, 'get')
+    def test_device_state_invalidates(self, mock_get):
+        """测试设备状态变化时失效涉及该设备的条目和按状态过滤的查询"""
+        mock_get.side_effect = fake_get
+        self.api.query(gateway_id="gw1")
+        self.api.query(state="true")
+        self.api.query_props("dev3")
+        self.api.query_points(device_id="dev3")
+
+        self.cache.on_device_state(DeviceState(device_id="dev1", state=1))
+
+        assert len(self.cache) == 2
+        self.cache.invalidate("dev3", method="query_props")
+        assert len(self.cache) == 1
+        self.api.query_points(device_id="dev3")
+        assert mock_get.call_count == 4
+
+    def test_subscribe(self):
+        """测试订阅设备状态消息"""
+        bus = Mock()
+        handle = Mock()
+
+        async def subscribe(project_id, device_id, callback):
+            return handle
+
+        async def unsubscribe():
+            pass
+
+        bus.subscribe_device_state.side_effect = subscribe
+        handle.unsubscribe.side_effect = unsubscribe
+
+        async def run():
+            await self.cache.subscribe(bus, "proj1")
+            await self.cache.close()
+
+        asyncio.run(run())
+
+        bus.subscribe_device_state.assert_called_once_with("proj1", "*", self.cache.on_device_state)
+        handle.unsubscribe.assert_called_once()
@@ -0,0 +1,141 @@
+"""
+TopStack SDK 设备分页遍历测试
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import Response, TopStackError
+from topstack_sdk.iot import AsyncDeviceApi, DeviceApi
+from topstack_sdk.iot.device.models import PointQueryResponse, QueryResponse
+
+TOTAL = 23
+
+
+def device_page(params):
+    """按页码返回设备，页码越小响应越慢，使后面的页先完成"""
+    page_num, page_size = params["pageNum"], params["pageSize"]
+    start = (page_num - 1) * page_size
+    items = [
+        {"id": f"dev{i}", "code": f"dev{i}", "name": f"dev{i}", "connectMode": "gateway", "state": 0}
+        for i in range(start, min(start + page_size, TOTAL))
+    ]
+    return QueryResponse(total=TOTAL, items=items)
+
+
+class TestIterDevices:
+    """设备分页遍历测试类"""
+
+    def setup_method(self):
+        self.client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        self.api = DeviceApi(self.client)
+
+    @patch.object(TopStackClient, 'get')
+    def test_all_pages_fetched_concurrently(self, mock_get):
+        """测试读取总数后并发请求其余页"""
+        threads = set()
+
+        def get(endpoint, params=None, response_model=None):
+            threads.add(threading.get_ident())
+            time.sleep(0.01 * (6 - params["pageNum"]))
+            return Response(data=device_page(params))
+
+        mock_get.side_effect = get
+
+        devices = list(self.api.iter_devices(gateway_id="gw1", page_size=5, max_workers=3))
+
+        assert sorted(d.id for d in devices) == sorted(f"dev{i}" for i in range(TOTAL))
+        assert mock_get.call_count == 5
+        assert all(call.args[1]["gatewayID"] == "gw1" for call in mock_get.call_args_list)
+        assert len(threads) > 1
+        assert [d.id for d in devices] != [f"dev{i}" for i in range(TOTAL)]
+
+    @patch.object(TopStackClient, 'get')
+    def test_ordered(self, mock_get):
+        """测试 ordered=True 时按页码顺序返回"""
+        def get(endpoint, params=None, response_model=None):
+            time.sleep(0.01 * (6 - params["pageNum"]))
+            return Response(data=device_page(params))
+
+        mock_get.side_effect = get
+
+        devices = list(self.api.iter_devices(page_size=5, max_workers=4, ordered=True))
+
+        assert [d.id for d in devices] == [f"dev{i}" for i in range(TOTAL)]
+
+    @patch.object(TopStackClient, 'get')
+    def test_server_caps_page_size(self, mock_get):
+        """测试服务端限制每页数量时按实际条数计算页数，不漏页"""
+        mock_get.side_effect = lambda endpoint, params=None, response_model=None: Response(
+            data=device_page({**params, "pageSize": min(params["pageSize"], 4)})
+        )
+
+        devices = list(self.api.iter_devices(page_size=10, max_workers=2, ordered=True))
+
+        assert [d.id for d in devices] == [f"dev{i}" for i in range(TOTAL)]
+        assert mock_get.call_count == 6
+
+    @patch.object(TopStackClient, 'get')
+    def test_single_page(self, mock_get):
+        """测试总数不超过一页时只请求一次"""
+        mock_get.return_value = Response(data=PointQueryResponse(total=0, items=[]))
+
+        assert list(self.api.iter_points(device_id="dev1")) == []
+        mock_get.assert_called_once()
+
+    @patch.object(TopStackClient, 'get')
+    def test_error_propagates(self, mock_get):
+        """测试某页失败时抛出异常"""
+        def get(endpoint, params=None, response_model=None):
+            if params["pageNum"] == 3:
+                raise TopStackError("HTTP 500", 500, None)
+            return Response(data=device_page(params))
+
+        mock_get.side_effect = get
+
+        with pytest.raises(TopStackError):
+            list(self.api.iter_devices(page_size=5, ordered=True))
+
+
+def test_async_iter_devices():
+    """测试异步遍历并发请求且并发数不超过上限"""
+    active = peak = 0
+
+    async def get(endpoint, params=None, response_model=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return Response(data=device_page(params))
+
+    async def run():
+        api = AsyncDeviceApi(SimpleNamespace(get=get))
+        return [d.id async for d in api.iter_devices(page_size=2, max_concurrency=3, ordered=True)]
+
+    ids = asyncio.run(run())
+
+    assert ids == [f"dev{i}" for i in range(TOTAL)]
+    assert peak == 3
+
+
+def test_async_server_caps_page_size():
+    """测试异步遍历在服务端限制每页数量时不漏页"""
+    async def get(endpoint, params=None, response_model=None):
+        return Response(data=device_page({**params, "pageSize": min(params["pageSize"], 4)}))
+
+    async def run():
+        api = AsyncDeviceApi(SimpleNamespace(get=get))
+        return [d.id async for d in api.iter_devices(page_size=10, max_concurrency=2, ordered=True)]
+
+    assert asyncio.run(run()) == [f"dev{i}" for i in range(TOTAL)]
@@ -0,0 +1,333 @@
+"""
+TopStack SDK NATS 消息分发测试
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from topstack_sdk.dispatch import BatchBuffer, SubjectTrie
+from topstack_sdk.nats import NatsBus
+from nats.errors import SlowConsumerError
+
+
+class FakeConn:
+    """记录订阅的 NATS 连接，publish 时按订阅主题投递"""
+
+    def __init__(self):
+        self.subscriptions = {}
+
+    async def subscribe(self, subject, cb=None):
+        subscription = AsyncMock()
+        self.subscriptions[subject] = (cb, subscription)
+        return subscription
+
+    async def publish(self, subject, payload):
+        trie = SubjectTrie()
+        for pattern, (cb, _) in self.subscriptions.items():
+            trie.insert(pattern.split('.'), (cb, True))
+        for cb, _ in trie.match(subject.split('.')):
+            await cb(SimpleNamespace(subject=subject, data=json.dumps(payload).encode()))
+
+
+def point_subject(device_id, point_id, project_id="proj1", device_type_id="type1"):
+    return f"iot.platform.device.datas.{project_id}.{device_type_id}.{device_id}.{point_id}"
+
+
+class TestSubjectTrie:
+    """主题前缀树测试类"""
+
+    def test_wildcards(self):
+        """测试 * 匹配一个分段，> 匹配末尾一个或多个分段"""
+        trie = SubjectTrie()
+        trie.insert("a.*.c".split('.'), "star")
+        trie.insert("a.>".split('.'), "tail")
+        trie.insert("a.b.c".split('.'), "exact")
+
+        assert sorted(trie.match("a.b.c".split('.'))) == ["exact", "star", "tail"]
+        assert trie.match("a.x.c".split('.')) == ["tail", "star"]
+        assert trie.match("a.b".split('.')) == ["tail"]
+        assert trie.match("a".split('.')) == []
+
+    def test_remove_prunes(self):
+        """测试删除回调后清理空节点"""
+        trie = SubjectTrie()
+        trie.insert("a.b.c".split('.'), "h")
+
+        assert trie.remove("a.b.c".split('.'), "h")
+        assert not trie.remove("a.b.c".split('.'), "h")
+        assert len(trie) == 0 and trie._root.children == {}
+
+
+class TestNatsBusDispatch:
+    """NatsBus 共享订阅测试类"""
+
+    def test_point_subscriptions_share_one_subject(self):
+        """测试大量测点订阅共享一个 NATS 订阅，并按主题分发"""
+        conn = FakeConn()
+        received = {}
+
+        async def run():
+            bus = NatsBus(conn, shared=True)
+            for i in range(100):
+                await bus.subscribe_point_data(
+                    "proj1", "dev1", f"p{i}",
+                    lambda data, i=i: received.setdefault(i, []).append(data.value)
+                )
+            await conn.publish(point_subject("dev1", "p7"), {"deviceID": "dev1", "pointID": "p7", "value": 1})
+            await conn.publish(point_subject("dev2", "p7"), {"deviceID": "dev2", "pointID": "p7", "value": 2})
+
+        asyncio.run(run())
+
+        assert list(conn.subscriptions) == ["iot.platform.device.datas.proj1.>"]
+        assert received == {7: [1]}
+
+    def test_coroutine_and_unsubscribe(self):
+        """测试协程回调，全部句柄取消后取消 NATS 订阅"""
+        conn = FakeConn()
+        received = []
+
+        async def on_state(state):
+            received.append(state.state)
+
+        async def run():
+            bus = NatsBus(conn, shared=True)
+            first = await bus.subscribe_device_state("proj1", "dev1", on_state)
+            second = await bus.subscribe_device_state("proj1", "dev2", on_state)
+            await conn.publish("iot.platform.device.state.proj1.dev1", {"deviceID": "dev1", "state": 1})
+
+            await first.unsubscribe()
+            await conn.publish("iot.platform.device.state.proj1.dev1", {"deviceID": "dev1", "state": 0})
+            _, subscription = conn.subscriptions["iot.platform.device.state.proj1.*"]
+            subscription.unsubscribe.assert_not_awaited()
+
+            await second.unsubscribe()
+            subscription.unsubscribe.assert_awaited_once()
+            assert bus.dispatcher.subscription_count == 0
+
+        asyncio.run(run())
+
+        assert received == [1]
+
+    def test_unshared_subscribes_exact_topic(self):
+        """测试默认按主题单独订阅"""
+        conn = FakeConn()
+
+        async def run():
+            bus = NatsBus(conn)
+            await bus.subscribe_device_alert_info("proj1", "dev1", lambda alert: None)
+            await bus.subscribe_alert_info("proj1", lambda alert: None)
+
+        asyncio.run(run())
+
+        assert sorted(conn.subscriptions) == ["iot.platform.alert.proj1.>", "iot.platform.alert.proj1.dev1"]
+
+    def test_decode_error_logged(self, caplog):
+        """测试消息解析失败时记录日志且不调用回调"""
+        conn = FakeConn()
+        received = []
+
+        async def run():
+            bus = NatsBus(conn)
+            await bus.subscribe_gateway_state("proj1", received.append)
+            cb, _ = conn.subscriptions["iot.platform.gateway.state.proj1.*"]
+            await cb(SimpleNamespace(subject="iot.platform.gateway.state.proj1.gw1", data=b"not json"))
+
+        asyncio.run(run())
+
+        assert received == []
+        assert "解析网关状态数据错误" in caplog.text
+
+    def test_decode_error_skips_only_its_handlers(self, caplog):
+        """测试一个转换函数失败时，使用其它转换函数的回调仍然收到消息"""
+        conn = FakeConn()
+        received = []
+
+        def broken(data):
+            raise ValueError("bad payload")
+
+        async def run():
+            bus = NatsBus(conn)
+            dispatcher = bus.dispatcher
+            await dispatcher.register("a.>", "a.b", broken, lambda m: received.append(("broken", m)), "解析失败")
+            await dispatcher.register("a.>", "a.b", dict, lambda m: received.append(("first", m)), "解析失败")
+            await dispatcher.register("a.>", "a.b", broken, lambda m: received.append(("broken", m)), "解析失败")
+            await dispatcher.register("a.>", "a.*", dict, lambda m: received.append(("second", m)), "解析失败")
+            await conn.publish("a.b", {"x": 1})
+            return dispatcher.stats()[0]
+
+        stats = asyncio.run(run())
+
+        assert sorted(received) == [("first", {"x": 1}), ("second", {"x": 1})]
+        assert caplog.text.count("解析失败: bad payload") == 1
+        assert stats["parse_failures"] == 1 and stats["callback_errors"] == 0
+
+    def test_decode_once_per_decoder(self):
+        """测试转换函数不相邻时，同一消息对每种转换函数也只转换一次"""
+        conn = FakeConn()
+        calls = []
+        received = []
+
+        def first(data):
+            calls.append("first")
+            return data
+
+        def second(data):
+            calls.append("second")
+            return data
+
+        async def run():
+            dispatcher = NatsBus(conn).dispatcher
+            for decode in (first, second, first):
+                await dispatcher.register("a.>", "a.b", decode, received.append, "解析失败")
+            await conn.publish("a.b", {"x": 1})
+
+        asyncio.run(run())
+
+        assert sorted(calls) == ["first", "second"]
+        assert len(received) == 3
+
+
+class TestSubscriptionStats:
+    """订阅统计测试类"""
+
+    def test_stats(self):
+        """测试统计消息数、字节数、解析失败、回调错误、待处理队列与丢弃数"""
+        conn = FakeConn()
+
+        def callback(state):
+            if state.sn == "bad":
+                raise ValueError("boom")
+
+        async def run():
+            bus = NatsBus(conn)
+            await bus.subscribe_gateway_state("proj1", callback)
+            cb, subscription = conn.subscriptions["iot.platform.gateway.state.proj1.*"]
+            subscription.pending_msgs = 8
+            subscription.pending_bytes = 100
+            subscription._pending_msgs_limit = 10
+            subscription._pending_bytes_limit = 1000
+            for data in (b'{"sn": "gw1"}', b'{"sn": "bad"}', b"not json"):
+                await cb(SimpleNamespace(subject="iot.platform.gateway.state.proj1.gw1", data=data))
+            await bus.on_error(SlowConsumerError("s", None, 1, subscription))
+            await bus.on_error(SlowConsumerError("s", None, 1, object()))
+            first = bus.stats()
+            second = bus.stats()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        (item,) = first["subscriptions"]
+        assert item["subject"] == "iot.platform.gateway.state.proj1.*"
+        assert item["handlers"] == 1
+        assert item["messages"] == 3
+        assert item["bytes"] == len(b'{"sn": "gw1"}') * 2 + len(b"not json")
+        assert item["parse_failures"] == 1
+        assert item["callback_errors"] == 1
+        assert item["dropped"] == 1
+        assert item["msgs_per_sec"] > 0
+        assert item["parse_us"] > 0 and item["callback_us"] > 0
+        assert (item["pending_msgs"], item["pending_msgs_limit"]) == (8, 10)
+        # 第二次读取只包含两次读取之间的消息
+        (item,) = second["subscriptions"]
+        assert item["messages"] == 3 and item["parse_us"] is None
+
+    def test_reporter_logs_lagging(self, caplog):
+        """测试定期输出统计，待处理队列接近上限时告警"""
+        conn = FakeConn()
+        reports = []
+
+        async def run():
+            bus = NatsBus(conn)
+            await bus.subscribe_gateway_state("proj1", lambda state: None)
+            _, subscription = conn.subscriptions["iot.platform.gateway.state.proj1.*"]
+            subscription.pending_msgs = 9
+            subscription.pending_bytes = 0
+            subscription._pending_msgs_limit = 10
+            subscription._pending_bytes_limit = 1000
+            await bus.subscribe_point_data_batch("proj1", lambda batch: None, max_batch=1, max_buffer=1)
+
+            with caplog.at_level("INFO", logger="topstack_sdk.nats"):
+                bus.start_stats_reporter(interval=0.01)
+                await asyncio.sleep(0.05)
+            bus.start_stats_reporter(interval=0.01, callback=reports.append)
+            await asyncio.sleep(0.05)
+            bus.stop_stats_reporter()
+            assert bus._reporter is None
+
+        asyncio.run(run())
+
+        assert "订阅 iot.platform.gateway.state.proj1.*" in caplog.text
+        assert "待处理队列接近上限" in caplog.text
+        assert reports and reports[0]["batches"][0]["max_buffer"] == 1
+
+
+class TestBatchDelivery:
+    """批量投递测试类"""
+
+    def payload(self, i):
+        return {"deviceID": "dev1", "pointID": "p1", "value": i}
+
+    def test_size_and_delay_flush(self):
+        """测试攒够 max_batch 条立即投递，不足时超过 max_delay 投递"""
+        conn = FakeConn()
+        batches = []
+
+        async def run():
+            bus = NatsBus(conn)
+            buffer = await bus.subscribe_point_data_batch(
+                "proj1", lambda batch: batches.append([d.value for d in batch]),
+                device_id="dev1", max_batch=3, max_delay=0.05
+            )
+            for i in range(5):
+                await conn.publish(point_subject("dev1", "p1"), self.payload(i))
+            await asyncio.sleep(0)
+            assert batches == [[0, 1, 2]]
+
+            await asyncio.sleep(0.1)
+            assert batches == [[0, 1, 2], [3, 4]]
+            await buffer.unsubscribe()
+
+        asyncio.run(run())
+
+    def test_drop_oldest(self):
+        """测试缓冲区满时丢弃最早的数据，取消订阅时投递剩余数据"""
+        conn = FakeConn()
+        batches = []
+
+        async def run():
+            bus = NatsBus(conn, shared=True)
+            buffer = await bus.subscribe_point_data_batch(
+                "proj1", batches.append, max_batch=2, max_delay=10, max_buffer=2
+            )
+            for i in range(5):
+                buffer.put_nowait(i)
+            await buffer.unsubscribe()
+            return buffer
+
+        buffer = asyncio.run(run())
+
+        assert batches == [[3, 4]]
+        assert buffer.dropped == 3
+        assert conn.subscriptions["iot.platform.device.datas.proj1.>"][1].unsubscribe.await_count == 1
+
+    def test_block_waits_for_consumer(self):
+        """测试 block 模式下缓冲区满时等待回调取走数据"""
+        batches = []
+
+        async def consume(batch):
+            batches.append(batch)
+
+        async def run():
+            buffer = BatchBuffer(consume, max_batch=2, max_delay=0.01, max_buffer=2, overflow="block")
+            buffer.start()
+            for i in range(6):
+                await buffer.sink(i)
+            await buffer.unsubscribe()
+            return buffer
+
+        buffer = asyncio.run(run())
+
+        assert [i for batch in batches for i in batch] == list(range(6))
+        assert buffer.dropped == 0
@@ -0,0 +1,244 @@
+"""
+TopStack SDK 历史数据查询测试
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import Response
+from topstack_sdk.iot import IotApi, AsyncIotApi
+from topstack_sdk.iot.models import HistoryResponse
+from topstack_sdk.iot.windows import split_range
+from topstack_sdk.iot.history_cache import HistoryCache
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = START + timedelta(days=1)
+
+# 模拟服务端：每个测点的历史数据条数
+SERIES = {("dev1", "p1"): 12000, ("dev1", "p2"): 3000}
+
+
+class FakeHistoryServer:
+    """按 offset/limit 返回历史数据的模拟服务端"""
+
+    def __init__(self, series=SERIES, origin=START):
+        self.series = series
+        self.origin = origin
+        self.requests = []
+
+    def post(self, endpoint, data, response_model=None):
+        self.requests.append(data)
+        results = []
+        # 每秒一个数据点，时间范围两端均包含
+        first = max(int((data["start"] - self.origin).total_seconds()), 0)
+        last = int((data["end"] - self.origin).total_seconds())
+        for point in data["points"]:
+            count = self.series.get((point["deviceID"], point["pointID"]), 0)
+            seconds = range(first, min(last + 1, count))
+            if data["order"] == "desc":
+                seconds = seconds[::-1]
+            page = seconds[data["offset"]:data["offset"] + data["limit"]]
+            results.append({
+                "deviceID": point["deviceID"],
+                "pointID": point["pointID"],
+                "values": [
+                    {"value": i, "time": (self.origin + timedelta(seconds=i)).isoformat()}
+                    for i in page
+                ]
+            })
+        return Response(data=response_model(results=results))
+
+
+def make_points():
+    return [{"device_id": d, "point_id": p} for d, p in SERIES]
+
+
+class TestIterHistory:
+    """历史数据分页遍历测试类"""
+
+    def setup_method(self):
+        self.client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        self.iot_api = IotApi(self.client)
+        self.server = FakeHistoryServer()
+
+    def test_pages_walk_offset(self):
+        """测试自动递增 offset，已取完的测点不再请求"""
+        with patch.object(TopStackClient, 'post', side_effect=self.server.post):
+            pages = list(self.iot_api.iter_history_pages(make_points(), START, END))
+
+        assert len(pages) == 3
+        assert [r["offset"] for r in self.server.requests] == [0, 5000, 10000]
+        assert [len(r["points"]) for r in self.server.requests] == [2, 1, 1]
+        assert all(isinstance(page, HistoryResponse) for page in pages)
+
+    def test_rows_without_prefetch(self):
+        """测试逐行遍历返回全部数据"""
+        with patch.object(TopStackClient, 'post', side_effect=self.server.post):
+            rows = list(self.iot_api.iter_history(make_points(), START, END, prefetch=False))
+
+        assert len(rows) == 15000
+        p1_values = [value.value for device_id, point_id, value in rows if point_id == "p1"]
+        assert p1_values == list(range(12000))
+
+    def test_async_pages(self):
+        """测试异步分页遍历"""
+        class FakeAsyncClient:
+            async def post(inner, endpoint, data, response_model=None):
+                return self.server.post(endpoint, data, response_model)
+
+        async def run():
+            api = AsyncIotApi(FakeAsyncClient())
+            return [page async for page in api.iter_history_pages(make_points(), START, END)]
+
+        pages = asyncio.run(run())
+
+        assert len(pages) == 3
+        assert sum(len(r.values) for page in pages for r in page.results) == 15000
+
+
+class TestFetchHistory:
+    """历史数据并行查询测试类"""
+
+    def setup_method(self):
+        self.client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        self.iot_api = IotApi(self.client)
+        self.server = FakeHistoryServer()
+
+    def test_split_range_aligned(self):
+        """测试时间窗口切分点对齐到聚合间隔"""
+        windows = split_range(START, START + timedelta(seconds=100), 3, "10s")
+
+        assert windows[0][0] == START and windows[-1][1] == START + timedelta(seconds=100)
+        assert [w[1] for w in windows[:-1]] == [START + timedelta(seconds=30), START + timedelta(seconds=60)]
+        assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+
+    def test_shards_stitched_and_deduplicated(self):
+        """测试多窗口并发查询后拼接、去重并排序"""
+        end = START + timedelta(seconds=11999)
+        with patch.object(TopStackClient, 'post', side_effect=self.server.post):
+            result = self.iot_api.fetch_history(
+                make_points(), START, end, interval="1s", shards=4, point_group_size=1
+            )
+
+        values = {(r.device_id, r.point_id): [v.value for v in r.values] for r in result.results}
+        assert values[("dev1", "p1")] == list(range(12000))
+        assert values[("dev1", "p2")] == list(range(3000))
+        assert len({tuple(r["points"][0].values()) for r in self.server.requests}) == 2
+
+    def test_desc_order(self):
+        """测试按降序拼接"""
+        end = START + timedelta(seconds=99)
+        with patch.object(TopStackClient, 'post', side_effect=self.server.post):
+            result = self.iot_api.fetch_history(
+                make_points()[:1], START, end, interval="1s", order="desc", shards=3
+            )
+
+        assert [v.value for v in result.results[0].values] == list(range(99, -1, -1))
+
+
+class TestHistoryCache:
+    """历史数据本地缓存测试类"""
+
+    def setup_method(self):
+        self.client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret"
+        )
+        self.server = FakeHistoryServer()
+
+    def fetch(self, iot_api, end_seconds):
+        with patch.object(TopStackClient, 'post', side_effect=self.server.post):
+            return iot_api.fetch_history(
+                make_points(), START, START + timedelta(seconds=end_seconds),
+                interval="1s", shards=1
+            )
+
+    def test_repeated_query_served_locally(self, tmp_path):
+        """测试重复查询从缓存读取，扩大范围时只请求新增部分"""
+        cache = HistoryCache(str(tmp_path / "history.db"))
+        iot_api = IotApi(self.client, history_cache=cache)
+
+        first = self.fetch(iot_api, 999)
+        assert len(self.server.requests) == 1
+
+        self.server.requests.clear()
+        second = self.fetch(iot_api, 999)
+        assert self.server.requests == []
+        assert [[v.value for v in r.values] for r in second.results] == \
+            [[v.value for v in r.values] for r in first.results]
+
+        third = self.fetch(iot_api, 1999)
+        assert len(self.server.requests) == 1
+        assert self.server.requests[0]["start"] == START + timedelta(seconds=1000)
+        assert [v.value for v in third.results[0].values] == list(range(2000))
+
+        # 重新打开数据库文件后仍然有效
+        cache.close()
+        self.server.requests.clear()
+        self.fetch(IotApi(self.client, history_cache=HistoryCache(str(tmp_path / "history.db"))), 1999)
+        assert self.server.requests == []
+
+    def test_recent_data_not_covered(self):
+        """测试距当前时间过近的数据不标记为已覆盖"""
+        cache = HistoryCache(settle_seconds=60)
+        now = datetime.now(timezone.utc)
+
+        cache.store(make_points(), now - timedelta(minutes=10), now, [], interval="1s")
+
+        gaps = cache.missing_ranges("dev1", "p1", now - timedelta(minutes=10), now, interval="1s")
+        assert len(gaps) == 1
+        assert gaps[0][0] >= now - timedelta(seconds=61)
+
+    def test_recent_data_returned(self):
+        """测试查询范围到当前时间时，缓存与不使用缓存的结果相同"""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.server = FakeHistoryServer({("dev1", "p1"): 601, ("dev1", "p2"): 601}, origin=now - timedelta(minutes=10))
+        cached_api = IotApi(self.client, history_cache=HistoryCache(settle_seconds=60))
+
+        with patch.object(TopStackClient, 'post', side_effect=self.server.post):
+            cached = cached_api.fetch_history(make_points(), now - timedelta(minutes=10), now, interval="1s")
+            uncached = IotApi(self.client).fetch_history(make_points(), now - timedelta(minutes=10), now, interval="1s")
+            again = cached_api.fetch_history(make_points(), now - timedelta(minutes=10), now, interval="1s")
+
+        values = [[(v.time, v.value) for v in r.values] for r in uncached.results]
+        assert [len(v) for v in values] == [601, 601]
+        assert [[(v.time, v.value) for v in r.values] for r in cached.results] == values
+        assert [[(v.time, v.value) for v in r.values] for r in again.results] == values
+        # 第二次查询只重新请求未稳定的部分
+        assert self.server.requests[-1]["start"] >= now - timedelta(seconds=61)
+
+    def test_naive_datetime_as_utc(self, monkeypatch):
+        """测试无时区的时间按 UTC 处理，与本地时区无关"""
+        monkeypatch.setenv("TZ", "Asia/Shanghai")
+        time.tzset()
+        try:
+            cache = HistoryCache()
+            cache.store(make_points(), START, START + timedelta(seconds=10), [], interval="1s")
+
+            naive = START.replace(tzinfo=None)
+            assert cache.missing_ranges("dev1", "p1", naive, naive + timedelta(seconds=10), interval="1s") == []
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+    def test_invalidate(self):
+        """测试按设备删除缓存"""
+        cache = HistoryCache()
+        cache.store(make_points(), START, START + timedelta(seconds=10), [], interval="1s")
+
+        cache.invalidate("dev1", "p1")
+
+        assert cache.missing_ranges("dev1", "p1", START, START + timedelta(seconds=10), interval="1s")
+        assert not cache.missing_ranges("dev1", "p2", START, START + timedelta(seconds=10), interval="1s")
\ No newline at end of file
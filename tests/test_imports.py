@@ -0,0 +1,61 @@
+"""
+包的延迟导入测试
+"""
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import topstack_sdk
+import topstack_sdk.iot
+
+
+def _loaded_modules(code: str) -> set:
+    """在新的解释器进程中执行代码，返回已加载的模块名"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(topstack_sdk.__file__))
+    output = subprocess.run(
+        [sys.executable, "-c", code + "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return set(json.loads(output))
+
+
+def test_import_package_loads_nothing():
+    """测试导入包时不导入子模块和第三方依赖"""
+    modules = _loaded_modules("import topstack_sdk")
+
+    assert not {"topstack_sdk.client", "topstack_sdk.nats", "nats", "requests", "pydantic"} & modules
+
+
+def test_rest_api_does_not_load_nats():
+    """测试只使用 IotApi 时不导入 NATS 客户端和设备管理模块"""
+    modules = _loaded_modules("from topstack_sdk import IotApi, TopStackClient")
+
+    assert "topstack_sdk.iot.iot" in modules
+    assert not {"topstack_sdk.nats", "nats", "topstack_sdk.iot.device"} & modules
+
+
+@pytest.mark.parametrize("package", [topstack_sdk, topstack_sdk.iot])
+def test_lazy_attributes(package):
+    """测试 __all__ 中的名称都能访问，并与定义它的模块中的对象相同"""
+    for name in package.__all__:
+        value = getattr(package, name)
+        module = importlib.import_module(package._LAZY[name], package.__name__)
+        assert getattr(module, name) is value
+        assert name in dir(package)
+
+
+def test_submodule_attributes():
+    """测试子模块可以作为包的属性访问，未知名称抛出 AttributeError"""
+    assert topstack_sdk.nats.NatsBus is topstack_sdk.NatsBus
+    assert topstack_sdk.iot.models.HistoryResponse is topstack_sdk.iot.HistoryResponse
+
+    with pytest.raises(AttributeError):
+        topstack_sdk.missing
+    with pytest.raises(AttributeError):
+        topstack_sdk.iot.missing
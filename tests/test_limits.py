@@ -0,0 +1,167 @@
+"""
+TopStack SDK 客户端限流测试
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from topstack_sdk import AdaptiveLimiter, RateLimiter, TopStackClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter:
+    """令牌桶测试类"""
+
+    def test_burst_then_paced(self):
+        """测试突发额度用完后按速率排队"""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=10, burst=2, clock=clock)
+
+        assert [limiter.reserve() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+
+        clock.now = 1.0
+        assert limiter.reserve() == 0
+
+    def test_invalid_rate(self):
+        """测试速率必须为正数"""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+
+
+class TestAdaptiveLimiter:
+    """自适应并发限制测试类"""
+
+    def test_additive_increase(self):
+        """测试并发占满时每轮增加一个名额"""
+        limiter = AdaptiveLimiter(initial=4, max_limit=8)
+        for _ in range(4):
+            limiter.acquire()
+
+        for _ in range(5):
+            limiter.release(0.01, 200)
+            limiter.acquire()
+        assert limiter.limit == 5
+
+        for _ in range(40):
+            limiter.release(0.01, 200)
+            limiter.acquire()
+        assert limiter.limit == 8
+
+    def test_no_increase_when_idle(self):
+        """测试并发未占满时不增加上限"""
+        limiter = AdaptiveLimiter(initial=10)
+
+        for _ in range(50):
+            limiter.acquire()
+            limiter.release(0.01, 200)
+
+        assert limiter.limit == 10
+
+    def test_multiplicative_decrease_once_per_round(self):
+        """测试过载时上限减半，同一轮的多个失败只减少一次"""
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial=20, clock=clock)
+
+        for _ in range(5):
+            limiter.acquire()
+        for _ in range(5):
+            limiter.release(0.5, 503)
+        assert limiter.limit == 10
+
+        clock.now = 1.0
+        limiter.acquire()
+        limiter.release(0.5, 0)
+        assert limiter.limit == 5
+
+    def test_latency_tolerance(self):
+        """测试延迟明显升高时视为过载"""
+        limiter = AdaptiveLimiter(initial=8, latency_tolerance=2.0)
+
+        limiter.acquire()
+        limiter.release(0.1, 200)
+        limiter.acquire()
+        limiter.release(0.5, 200)
+
+        assert limiter.limit == 4
+
+    def test_blocks_at_limit(self):
+        """测试达到上限后阻塞，释放后唤醒"""
+        limiter = AdaptiveLimiter(initial=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def worker():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not acquired.wait(0.05)
+
+        limiter.release(0.01, None)
+        thread.join(1)
+        assert acquired.is_set() and limiter.in_flight == 1
+
+    def test_async_waiters(self):
+        """测试异步等待者按顺序获得名额，取消的等待者不占用名额"""
+        limiter = AdaptiveLimiter(initial=2, max_limit=2)
+        peak = 0
+
+        async def task():
+            nonlocal peak
+            await limiter.acquire_async()
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.001)
+            limiter.release(0.001, 200)
+
+        async def run():
+            await limiter.acquire_async()
+            await limiter.acquire_async()
+            cancelled = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            limiter.release(0.001, None)
+            limiter.release(0.001, None)
+            await asyncio.gather(*[task() for _ in range(10)])
+
+        asyncio.run(run())
+
+        assert peak == 2 and limiter.in_flight == 0
+
+
+class TestClientLimits:
+    """客户端限流测试类"""
+
+    def test_limiters_wrap_requests(self):
+        """测试请求经过限流器，过载响应使并发上限下降"""
+        concurrency = AdaptiveLimiter(initial=8)
+        rate = RateLimiter(rate=1000)
+        client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret",
+            rate_limiter=rate,
+            concurrency_limiter=concurrency
+        )
+        client._get_access_token = Mock(return_value="tok")
+        client.session.request = Mock(return_value=Mock(
+            ok=False, status_code=429, reason="Too Many Requests",
+            content=b"{}", text="{}", headers={}
+        ))
+
+        with pytest.raises(Exception):
+            client.get("/test")
+
+        assert concurrency.limit == 4
+        assert concurrency.in_flight == 0
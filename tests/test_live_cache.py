@@ -0,0 +1,127 @@
+"""
+TopStack SDK 实时值本地缓存测试
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from topstack_sdk import LiveValueCache, AsyncLiveValueCache
+from topstack_sdk.iot.models import FindLastResponse
+from topstack_sdk.nats import NatsBus, PointData
+
+TS = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeConn:
+    """记录订阅的 NATS 连接"""
+
+    def __init__(self):
+        self.subscriptions = {}
+
+    async def subscribe(self, topic, cb=None):
+        self.subscriptions[topic] = cb
+        return AsyncMock()
+
+
+def rest_value(device_id, point_id, value=0):
+    return FindLastResponse(deviceID=device_id, pointID=point_id, value=value, timestamp=TS)
+
+
+def echo_batch(points, **kwargs):
+    return [rest_value(p["device_id"], p["point_id"]) for p in points]
+
+
+class TestLiveValueCache:
+    """实时值本地缓存测试类"""
+
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.iot_api = Mock()
+        self.iot_api.find_last.side_effect = rest_value
+        self.iot_api.find_last_batch.side_effect = echo_batch
+        self.cache = LiveValueCache(self.iot_api, max_age=10, clock=self.clock)
+
+    def test_hit_skips_rest(self):
+        """测试命中缓存时不请求 REST 接口"""
+        self.cache.update(PointData(device_id="dev1", point_id="p1", value=42, timestamp=TS))
+
+        result = self.cache.find_last("dev1", "p1")
+
+        assert result.value == 42 and result.timestamp == TS
+        self.iot_api.find_last.assert_not_called()
+
+    def test_stale_entry_falls_back(self):
+        """测试过期数据回退到 REST 接口，并写回缓存"""
+        self.cache.update(PointData(device_id="dev1", point_id="p1", value=42, timestamp=TS))
+        self.clock.now = 11
+
+        assert self.cache.find_last("dev1", "p1").value == 0
+        assert self.cache.find_last("dev1", "p1").value == 0
+        assert self.iot_api.find_last.call_count == 1
+
+    def test_batch_only_fetches_misses(self):
+        """测试批量查询只请求未命中的测点，结果按输入顺序排列"""
+        self.cache.update(PointData(device_id="dev1", point_id="p2", value=2, timestamp=TS))
+        points = [{"device_id": "dev1", "point_id": p} for p in ("p1", "p2", "p3")]
+
+        results = self.cache.find_last_batch(points, chunk_size=50)
+
+        assert [r.point_id for r in results] == ["p1", "p2", "p3"]
+        assert [r.value for r in results] == [0, 2, 0]
+        self.iot_api.find_last_batch.assert_called_once_with(
+            [points[0], points[2]], chunk_size=50
+        )
+        assert (self.cache.hits, self.cache.misses) == (1, 2)
+
+    def test_subscribe_project_wildcard(self):
+        """测试订阅项目通配主题并写入缓存"""
+        conn = FakeConn()
+
+        async def run():
+            await self.cache.subscribe(NatsBus(conn), "proj1")
+            handler = conn.subscriptions["iot.platform.device.datas.proj1.>"]
+            payload = {"deviceID": "dev1", "pointID": "p1", "value": 7, "timestamp": "2024-01-01T00:00:00Z"}
+            await handler(SimpleNamespace(
+                subject="iot.platform.device.datas.proj1.type1.dev1.p1",
+                data=json.dumps(payload).encode()
+            ))
+            await self.cache.close()
+
+        asyncio.run(run())
+
+        assert self.cache.find_last("dev1", "p1").value == 7
+        self.iot_api.find_last.assert_not_called()
+
+    def test_invalidate_device(self):
+        """测试按设备删除缓存"""
+        for device_id, point_id in (("dev1", "p1"), ("dev1", "p2"), ("dev2", "p1")):
+            self.cache.update(PointData(device_id=device_id, point_id=point_id, value=1, timestamp=TS))
+
+        self.cache.invalidate("dev1")
+
+        assert len(self.cache) == 1
+        assert self.cache.get("dev2", "p1") is not None
+
+    def test_async_batch(self):
+        """测试异步缓存回退到 AsyncIotApi"""
+        iot_api = Mock()
+        iot_api.find_last_batch = AsyncMock(side_effect=echo_batch)
+        cache = AsyncLiveValueCache(iot_api, max_age=None)
+        cache.update(PointData(device_id="dev1", point_id="p1", value=5, timestamp=TS))
+        points = [{"device_id": "dev1", "point_id": "p1"}, {"device_id": "dev1", "point_id": "p2"}]
+
+        results = asyncio.run(cache.find_last_batch(points))
+
+        assert [r.value for r in results] == [5, 0]
+        iot_api.find_last_batch.assert_awaited_once_with([points[1]])
@@ -0,0 +1,178 @@
+"""
+TopStack SDK 请求指标测试
+"""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from topstack_sdk import MetricsRegistry, TopStackClient
+from topstack_sdk.client import ResponseDecodeError, TopStackError
+from topstack_sdk.iot.models import FindLastResponse
+from topstack_sdk.metrics import Histogram, RequestSample, endpoint_label
+from topstack_sdk.retry import RetryPolicy
+
+
+def http_response(status_code, body=b'{"data": {"ok": true}}', headers=None):
+    return Mock(
+        ok=200 <= status_code < 300, status_code=status_code, reason="",
+        content=body, text=body.decode(), headers=headers or {},
+        elapsed=timedelta(milliseconds=5)
+    )
+
+
+def make_sample(method="GET", endpoint="/test", status=200, duration=0.02, error=None, attempts=1):
+    sample = RequestSample(method, endpoint)
+    sample.status = status
+    sample.duration = duration
+    sample.error = error
+    sample.attempts = attempts
+    sample.decode = 0.001
+    sample.bytes_out = 10
+    sample.bytes_in = 100
+    return sample
+
+
+class TestMetricsRegistry:
+    """指标汇总测试类"""
+
+    def test_histogram_quantile(self):
+        """测试分位数在分桶内插值"""
+        hist = Histogram((0.1, 0.2, 0.4))
+        assert hist.quantile(0.5) is None
+        for value in (0.05, 0.05, 0.15, 0.3):
+            hist.observe(value)
+
+        assert hist.quantile(0.5) == pytest.approx(0.1)
+        assert hist.quantile(0.75) == pytest.approx(0.2)
+        assert 0.2 < hist.quantile(0.99) <= 0.4
+        hist.observe(10)
+        assert hist.quantile(1.0) == 0.4
+
+    def test_endpoint_template(self):
+        """测试路径中的ID汇总为模板"""
+        assert endpoint_label("/iot/open_api/v1/device/dev1/props") == "/iot/open_api/v1/device/{id}/props"
+        assert endpoint_label("/iot/open_api/v1/data/findLast") == "/iot/open_api/v1/data/findLast"
+
+    def test_snapshot(self):
+        """测试按接口汇总状态码、错误、重试与字节数"""
+        registry = MetricsRegistry()
+        registry.on_request(make_sample())
+        registry.on_request(make_sample(status=503, error="TopStackError", attempts=3))
+        registry.on_request(make_sample(method="POST", endpoint="/iot/open_api/v1/device/a/props"))
+        registry.on_request(make_sample(method="POST", endpoint="/iot/open_api/v1/device/b/props"))
+        registry.on_token_refresh(0.05, True)
+        registry.on_token_refresh(0.05, False)
+
+        snapshot = registry.snapshot()
+        get, post = snapshot["endpoints"]
+        assert (get["method"], get["endpoint"], get["count"]) == ("GET", "/test", 2)
+        assert get["statuses"] == {200: 1, 503: 1}
+        assert get["errors"] == {"TopStackError": 1}
+        assert get["retries"] == 2
+        assert get["bytes_in"] == 200
+        assert get["phases"]["decode"] == pytest.approx(0.002)
+        assert (post["endpoint"], post["count"]) == ("/iot/open_api/v1/device/{id}/props", 2)
+        assert snapshot["token_refreshes"] == 2
+        assert snapshot["token_refresh_failures"] == 1
+
+        registry.reset()
+        assert registry.snapshot()["endpoints"] == []
+
+    def test_max_endpoints(self):
+        """测试接口数超过上限后汇总到 other"""
+        registry = MetricsRegistry(max_endpoints=2)
+        for i in range(4):
+            registry.on_request(make_sample(endpoint=f"/e{i}"))
+
+        counts = {item["endpoint"]: item["count"] for item in registry.snapshot()["endpoints"]}
+        assert counts == {"/e0": 1, "/e1": 1, "other": 2}
+
+    def test_prometheus(self):
+        """测试导出 Prometheus 文本格式"""
+        registry = MetricsRegistry(buckets=(0.01, 0.1))
+        registry.on_request(make_sample(duration=0.05))
+        registry.on_request(make_sample(status=500, error="TopStackError", duration=0.5))
+
+        text = registry.to_prometheus()
+        assert '# TYPE topstack_request_duration_seconds histogram' in text
+        assert 'topstack_requests_total{method="GET",endpoint="/test",status="500"} 1' in text
+        assert 'topstack_request_errors_total{method="GET",endpoint="/test",error="TopStackError"} 1' in text
+        assert 'topstack_request_duration_seconds_bucket{method="GET",endpoint="/test",le="0.1"} 1' in text
+        assert 'topstack_request_duration_seconds_bucket{method="GET",endpoint="/test",le="+Inf"} 2' in text
+        assert 'topstack_request_duration_seconds_count{method="GET",endpoint="/test"} 2' in text
+        assert 'topstack_token_refreshes_total{result="success"} 0' in text
+        assert text.endswith("\n")
+
+
+class TestClientInstrumentation:
+    """客户端指标采集测试类"""
+
+    def make_client(self, **kwargs):
+        registry = MetricsRegistry()
+        client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret",
+            instrumentation=registry,
+            **kwargs
+        )
+        client.token_manager.get_token = Mock(return_value="tok")
+        client.session.request = Mock()
+        return client, registry
+
+    @patch("topstack_sdk.client.time.sleep")
+    def test_request_sample(self, sleep):
+        """测试请求记录阶段耗时、重试与字节数"""
+        client, registry = self.make_client(retry=RetryPolicy(breaker=False))
+        client.session.request.side_effect = [http_response(503, b"{}"), http_response(200)]
+
+        client.post("/iot/open_api/v1/data/findLast", {"deviceID": "dev1"})
+
+        (item,) = registry.snapshot()["endpoints"]
+        assert item["statuses"] == {200: 1}
+        assert item["retries"] == 1
+        assert item["bytes_out"] == len(client._encode_body({"deviceID": "dev1"}))
+        assert item["bytes_in"] == len(b'{"data": {"ok": true}}')
+        assert item["phases"]["backoff"] == sleep.call_args.args[0]
+        assert item["phases"]["http"] >= 0
+
+    def test_errors_recorded(self):
+        """测试 HTTP 错误与模型校验失败按异常类型计数"""
+        client, registry = self.make_client()
+        client.session.request.return_value = http_response(500, b"{}")
+        with pytest.raises(TopStackError):
+            client.get("/test")
+
+        client.session.request.return_value = http_response(200, b'{"data": {"deviceID": []}}')
+        with pytest.raises(ResponseDecodeError):
+            client.post("/iot/open_api/v1/data/findLast", {}, FindLastResponse)
+
+        errors = {item["endpoint"]: item["errors"] for item in registry.snapshot()["endpoints"]}
+        assert errors["/test"] == {"TopStackError": 1}
+        assert errors["/iot/open_api/v1/data/findLast"] == {"ResponseDecodeError": 1}
+
+    def test_token_refresh(self):
+        """测试访问令牌请求计入指标"""
+        client, registry = self.make_client()
+        client.session.post = Mock(return_value=http_response(200, b'{"access_token": "t", "expire": 3600}'))
+
+        assert client._fetch_access_token() == ("t", 3600)
+        client.session.post.return_value = http_response(401, b"{}")
+        with pytest.raises(TopStackError):
+            client._fetch_access_token()
+
+        snapshot = registry.snapshot()
+        assert snapshot["token_refreshes"] == 2
+        assert snapshot["token_refresh_failures"] == 1
+
+    def test_disabled(self):
+        """测试未配置时不创建采样"""
+        client = TopStackClient(base_url="http://localhost:8000", app_id="a", app_secret="s")
+        client.token_manager.get_token = Mock(return_value="tok")
+        client.session.request = Mock(return_value=http_response(200))
+
+        with patch("topstack_sdk.client.RequestSample") as sample:
+            assert client.get("/test").data == {"ok": True}
+        sample.assert_not_called()
@@ -0,0 +1,80 @@
+"""
+TopStack SDK NATS 消息类型测试
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from topstack_sdk.nats import AlertInfo, NatsBus, PointData, PointDataArray
+
+from .test_dispatch import FakeConn, point_subject
+
+MESSAGES = [
+    {"deviceID": "dev1", "pointID": "p1", "value": 1.5, "quality": 0, "timestamp": 1704067200000},
+    {"deviceID": "dev1", "pointID": "p2", "value": "on", "status": -1, "timestamp": "2024-01-01T00:00:01Z"},
+]
+
+
+class TestMessageTypes:
+    """消息类型测试类"""
+
+    def test_slots_without_dict(self):
+        """测试消息对象不再携带 __dict__，属性名不变"""
+        point = PointData.from_dict(MESSAGES[0])
+        alert = AlertInfo.from_dict({"id": "a1", "deviceID": "dev1", "deviceAttr": {"k": "v"}})
+
+        assert not hasattr(point, "__dict__") and not hasattr(alert, "__dict__")
+        assert point.value == 1.5 and alert.device_attr == {"k": "v"}
+        with pytest.raises(AttributeError):
+            point.extra = 1
+
+    def test_ids_interned(self):
+        """测试不同消息中的相同 ID 共享同一个字符串对象"""
+        first = PointData.from_dict({"deviceID": "".join(["dev", "42"])})
+        second = PointData.from_dict({"deviceID": "".join(["dev", "4", "2"])})
+
+        assert first.device_id is second.device_id
+
+
+class TestPointDataArray:
+    """列式测点数据测试类"""
+
+    def test_from_dicts(self):
+        """测试从消息字典构建列式数据，并按下标还原为 PointData"""
+        points = PointDataArray.from_dicts(MESSAGES)
+
+        assert len(points) == 2
+        assert points.timestamps.tolist() == [1704067200000, 1704067201000]
+        assert points.status.tolist() == [0, -1]
+        assert points.values == [1.5, "on"]
+        second = points[1]
+        assert second.point_id == "p2"
+        assert second.timestamp == datetime(2024, 1, 1, 0, 0, 1, tzinfo=timezone.utc)
+
+    def test_from_points_round_trip(self):
+        """测试从 PointData 列表构建"""
+        ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        points = PointDataArray.from_points([PointData(device_id="dev1", point_id="p1", value=3, timestamp=ts)])
+
+        assert [(p.device_id, p.value, p.timestamp) for p in points] == [("dev1", 3, ts)]
+
+    def test_columnar_batch_subscription(self):
+        """测试批量订阅以 PointDataArray 形式投递"""
+        conn = FakeConn()
+        batches = []
+
+        async def run():
+            bus = NatsBus(conn)
+            buffer = await bus.subscribe_point_data_batch(
+                "proj1", batches.append, max_batch=2, max_delay=10, columnar=True
+            )
+            for message in MESSAGES:
+                await conn.publish(point_subject(message["deviceID"], message["pointID"]), message)
+            await buffer.unsubscribe()
+
+        asyncio.run(run())
+
+        assert len(batches) == 1 and isinstance(batches[0], PointDataArray)
+        assert batches[0].point_ids == ["p1", "p2"]
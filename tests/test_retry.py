@@ -0,0 +1,180 @@
+"""
+TopStack SDK 请求重试测试
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from topstack_sdk import TopStackClient
+from topstack_sdk.client import CircuitOpenError, TopStackError
+from topstack_sdk.retry import CircuitBreaker, RetryBudget, RetryPolicy, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def http_response(status_code, body=b'{"data": {"ok": true}}', headers=None):
+    return Mock(
+        ok=200 <= status_code < 300, status_code=status_code, reason="",
+        content=body, text=body.decode(), headers=headers or {}
+    )
+
+
+class TestRetryPolicy:
+    """重试策略测试类"""
+
+    def test_idempotency(self):
+        """测试只有 GET 和只读查询接口可重试"""
+        policy = RetryPolicy()
+
+        assert policy.is_idempotent("GET", "/alert/open_api/v1/alert_type")
+        assert policy.is_idempotent("POST", "/iot/open_api/v1/data/findLastBatch")
+        assert not policy.is_idempotent("POST", "/iot/open_api/v1/data/setValue")
+
+    def test_decorrelated_jitter_capped(self):
+        """测试退避时间在 [base, 上次 * 3] 之间且不超过上限"""
+        policy = RetryPolicy(max_attempts=10, base_delay=0.1, max_delay=1.0, budget=False, breaker=False)
+        policy.uniform = lambda low, high: high
+        call = policy.start("GET", "/test")
+
+        delays = [call.next_delay(503) for _ in range(4)]
+
+        assert delays == pytest.approx([0.3, 0.9, 1.0, 1.0])
+
+    def test_retry_after(self):
+        """测试 Retry-After 优先于退避时间，超过上限时不再重试"""
+        policy = RetryPolicy(max_retry_after=10, budget=False, breaker=False)
+
+        assert policy.start("GET", "/test").next_delay(429, {"Retry-After": "3"}) == 3
+        assert policy.start("GET", "/test").next_delay(429, {"Retry-After": "60"}) is None
+
+    def test_parse_retry_after_date(self):
+        """测试解析 HTTP 日期格式的 Retry-After"""
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        assert parse_retry_after("Mon, 01 Jan 2024 00:00:05 GMT", now) == 5
+        assert parse_retry_after("soon") is None
+
+    def test_not_retried(self):
+        """测试写接口、4xx 和次数用尽时不重试"""
+        policy = RetryPolicy(max_attempts=2, budget=False, breaker=False)
+
+        assert policy.start("POST", "/iot/open_api/v1/data/setValue").next_delay(503) is None
+        assert policy.start("GET", "/test").next_delay(404) is None
+        call = policy.start("GET", "/test")
+        assert call.next_delay(0) is not None
+        assert call.next_delay(0) is None
+
+    def test_budget(self):
+        """测试重试预算耗尽后不再重试，随请求数补充"""
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.5, min_per_second=0, capacity=1, clock=clock)
+        policy = RetryPolicy(budget=budget, breaker=False)
+
+        assert policy.start("GET", "/a").next_delay(503) is not None
+        assert policy.start("GET", "/b").next_delay(503) is None
+        policy.start("GET", "/c")
+        assert budget.tokens == pytest.approx(1.0)
+
+
+class TestCircuitBreaker:
+    """熔断器测试类"""
+
+    def test_open_half_open_close(self):
+        """测试连续失败后熔断，冷却后放行一个探测请求"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+        breaker.record("GET /a", False)
+        assert breaker.allow("GET /a") is None
+        breaker.record("GET /a", False)
+        assert breaker.state("GET /a") == CircuitBreaker.OPEN
+        assert breaker.allow("GET /a") == 10
+        assert breaker.allow("GET /b") is None
+
+        clock.now = 10
+        assert breaker.state("GET /a") == CircuitBreaker.HALF_OPEN
+        assert breaker.allow("GET /a") is None
+        assert breaker.allow("GET /a") == 10
+
+        breaker.record("GET /a", True)
+        assert breaker.state("GET /a") == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        """测试探测请求失败后重新熔断"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record("GET /a", False)
+        clock.now = 10
+        breaker.allow("GET /a")
+
+        clock.now = 12
+        breaker.record("GET /a", False)
+
+        assert breaker.allow("GET /a") == 10
+
+
+class TestClientRetry:
+    """客户端重试测试类"""
+
+    def make_client(self, policy):
+        client = TopStackClient(
+            base_url="http://localhost:8000",
+            app_id="test-app",
+            app_secret="test-secret",
+            retry=policy
+        )
+        client._get_access_token = Mock(return_value="tok")
+        client.session.request = Mock()
+        return client
+
+    @patch("topstack_sdk.client.time.sleep")
+    def test_retries_until_success(self, sleep):
+        """测试可重试的失败在退避后重发，成功后返回"""
+        client = self.make_client(RetryPolicy(breaker=False))
+        client.session.request.side_effect = [
+            http_response(503, b"{}"),
+            http_response(429, b"{}", {"Retry-After": "2"}),
+            http_response(200),
+        ]
+
+        response = client.post("/iot/open_api/v1/data/findLast", {"deviceID": "dev1"})
+
+        assert response.data == {"ok": True}
+        assert client.session.request.call_count == 3
+        assert sleep.call_count == 2 and sleep.call_args_list[1].args[0] >= 2
+
+    @patch("topstack_sdk.client.time.sleep")
+    def test_set_value_not_retried(self, sleep):
+        """测试写接口默认不重试"""
+        client = self.make_client(RetryPolicy())
+        client.session.request.return_value = http_response(503, b"{}")
+
+        with pytest.raises(TopStackError) as exc_info:
+            client.post("/iot/open_api/v1/data/setValue", {"deviceID": "dev1"})
+
+        assert exc_info.value.status_code == 503
+        assert client.session.request.call_count == 1
+        sleep.assert_not_called()
+
+    @patch("topstack_sdk.client.time.sleep")
+    def test_circuit_fails_fast(self, sleep):
+        """测试熔断后请求不再发出"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        client = self.make_client(RetryPolicy(max_attempts=2, breaker=breaker))
+        client.session.request.return_value = http_response(502, b"{}")
+
+        with pytest.raises(TopStackError):
+            client.get("/test")
+        with pytest.raises(CircuitOpenError) as exc_info:
+            client.get("/test")
+
+        assert client.session.request.call_count == 2
+        assert exc_info.value.key == "GET /test"
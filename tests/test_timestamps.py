@@ -0,0 +1,79 @@
+"""
+TopStack SDK 时间戳解码测试
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from topstack_sdk.iot.models import FindLastResponse, HistoryValue
+from topstack_sdk.nats import AlertInfo, PointData
+from topstack_sdk.timestamps import epoch_ms, epoch_ns, parse_iso, to_datetime
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+MS = 1704067200000
+
+
+class TestDecode:
+    """时间戳解码测试类"""
+
+    @pytest.mark.parametrize("value", [
+        MS,
+        float(MS),
+        "2024-01-01T00:00:00Z",
+        "2024-01-01T08:00:00+08:00",
+        "2024-01-01 00:00:00",
+        "2024-01-01T00:00:00.000000000Z",
+        T0,
+        datetime(2024, 1, 1),
+    ])
+    def test_formats_to_utc(self, value):
+        """测试各种格式均解析为 UTC datetime"""
+        dt = to_datetime(value)
+
+        assert dt == T0 and dt.tzinfo is timezone.utc
+        assert epoch_ms(value) == MS
+
+    def test_nanosecond_fraction(self):
+        """测试纳秒精度保留在 epoch_ns 中"""
+        value = "2024-01-01T00:00:01.123456789Z"
+
+        assert epoch_ns(value) == (MS + 1123) * 1_000_000 + 456789
+        assert parse_iso(value) == T0 + timedelta(seconds=1, microseconds=123456)
+
+    def test_empty(self):
+        """测试空值返回 None"""
+        assert to_datetime(None) is None and epoch_ms("") is None
+
+    def test_invalid(self):
+        """测试无法解析时抛出 ValueError"""
+        with pytest.raises(ValueError):
+            to_datetime("yesterday")
+
+
+class TestLazyTimestamp:
+    """延迟转换测试类"""
+
+    def test_point_data_keeps_epoch(self):
+        """测试毫秒时间戳在读取前保持原始值，读取后为 UTC datetime"""
+        point = PointData.from_dict({"deviceID": "dev1", "timestamp": MS})
+
+        assert point._timestamp == MS
+        assert point.timestamp_ms == MS
+        assert point.timestamp == T0
+        assert point.timestamp is point.timestamp
+
+    def test_alert_times(self):
+        """测试告警的多个时间字段"""
+        alert = AlertInfo.from_dict({"createdAt": "2024-01-01T00:00:00Z", "recoveredAt": MS})
+
+        assert alert.created_at == alert.recovered_at == T0
+        assert alert.handled_at is None
+
+    def test_models_share_decoder(self):
+        """测试数据模型使用同一解码规则：数值按毫秒处理，无时区按 UTC 处理"""
+        last = FindLastResponse(deviceID="dev1", pointID="p1", timestamp=MS)
+        value = HistoryValue(time="2024-01-01 00:00:00")
+
+        assert last.timestamp == T0 and last.timestamp.tzinfo is timezone.utc
+        assert value.time == T0